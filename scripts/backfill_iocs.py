@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Index the IOCs of analyses saved before the IOC index existed.
+
+One-off maintenance job for a legacy triage database: analyses saved since
+the index existed are indexed at save time, so the UI no longer does this
+on page load. Works in short batches and records its progress, so it can be
+interrupted and re-run; reports:
+1. Analyses awaiting the backfill before and after the run
+2. Analyses scanned and the time taken
+
+Usage:
+    python scripts/backfill_iocs.py [--db data/triage.db] [--batch-size 1000]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.triage.database import TriageDatabase  # noqa: E402
+
+
+def main():
+    """Run the backfill and print a report."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--db", type=Path, help="Database (default: data/triage.db)")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    if args.db is not None and not args.db.exists():
+        print(f"❌ Database not found at {args.db}")
+        return 1
+
+    db = TriageDatabase(args.db)
+    pending = db.count_ioc_backfill_pending()
+    print(f"Database: {db.db_path}")
+    print(f"Analyses awaiting IOC backfill: {pending:,}")
+    if not pending:
+        print("✅ IOC index is up to date")
+        return 0
+
+    start = time.perf_counter()
+    scanned = db.backfill_iocs(batch_size=args.batch_size)
+    elapsed = time.perf_counter() - start
+    print(f"Scanned {scanned:,} analyses in {elapsed:.1f}s")
+
+    remaining = db.count_ioc_backfill_pending()
+    if remaining:
+        print(f"❌ {remaining:,} analyses still pending")
+        return 1
+    print("✅ IOC index is up to date")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
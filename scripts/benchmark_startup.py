@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Benchmark script to measure startup (import) time of each entry point.
+
+Every measurement runs in a fresh interpreter so nothing is already cached
+in sys.modules. For each entry point this reports:
+1. Wall-clock time (median of several runs)
+2. The slowest imports, from `python -X importtime`
+3. Which heavy optional dependencies were imported eagerly
+
+Heavy dependencies (torch, sentence-transformers, llama_cpp, scipy, ...)
+should only load when a code path actually needs them.
+
+Usage:
+    python scripts/benchmark_startup.py [--runs N] [--top K]
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Modules that must not be imported just to start an entry point
+HEAVY_MODULES = [
+    "torch",
+    "sentence_transformers",
+    "transformers",
+    "llama_cpp",
+    "scipy",
+    "sklearn",
+    "rich.progress",
+    "joblib",
+    "requests",
+    "duckdb",
+    "pyarrow",
+]
+
+# Name -> Python statement executed in a fresh interpreter
+ENTRY_POINTS = {
+    "nlp-triage --help": (
+        "import sys; sys.argv = ['nlp-triage', '--help']\n"
+        "from src.triage import cli\n"
+        "try:\n"
+        "    cli.main()\n"
+        "except SystemExit:\n"
+        "    pass"
+    ),
+    "import triage.cli": "import src.triage.cli",
+    "import triage.database": "import src.triage.database",
+    "import triage.embeddings": "import src.triage.embeddings",
+    "import triage.analytics": "import src.triage.analytics",
+    "import ui_premium": "import ui_premium",
+}
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def run_python(code: str, *flags: str) -> subprocess.CompletedProcess:
+    """Run code in a fresh interpreter from the project root."""
+    env = dict(os.environ, STREAMLIT_LOG_LEVEL="error")
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+
+
+def measure_wall_time(code: str, runs: int) -> list:
+    """Wall-clock seconds of `runs` fresh interpreter runs."""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = run_python(code)
+        times.append(time.perf_counter() - start)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return times
+
+
+def _importtime(code: str) -> list:
+    """(cumulative ms, nesting depth, module) for every import code triggers."""
+    result = run_python(code, "-X", "importtime")
+    imports = []
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            depth = (len(match.group(3)) - 1) // 2
+            imports.append((int(match.group(2)) / 1000, depth, match.group(4)))
+    return imports
+
+
+def slowest_imports(code: str, top: int, startup: set) -> list:
+    """
+    Slowest modules imported directly by the entry point, in ms.
+
+    Modules the bare interpreter already imports at startup (site,
+    encodings, .pth hooks) are left out.
+    """
+    imports = [
+        (ms, module)
+        for ms, depth, module in _importtime(code)
+        if depth <= 1 and module not in startup
+    ]
+    return sorted(imports, reverse=True)[:top]
+
+
+def eager_heavy_modules(code: str) -> list:
+    """HEAVY_MODULES present in sys.modules after running code."""
+    probe = (
+        f"{code}\nimport sys\n"
+        f"print('HEAVY:' + ','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    result = run_python(probe)
+    for line in result.stdout.splitlines():
+        if line.startswith("HEAVY:"):
+            return [m for m in line[len("HEAVY:") :].split(",") if m]
+    return []
+
+
+def main():
+    """Run all benchmarks and print a report."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5, help="Runs per entry point")
+    parser.add_argument("--top", type=int, default=5, help="Slowest imports shown")
+    args = parser.parse_args()
+
+    print("\n" + "=" * 60)
+    print("STARTUP IMPORT-TIME BENCHMARK")
+    print("=" * 60)
+    print(f"Python: {sys.version.split()[0]}")
+    print(f"Date: {time.strftime('%Y-%m-%d %H:%M:%S')}")
+
+    baseline = statistics.median(measure_wall_time("pass", args.runs))
+    startup = {module for _, _, module in _importtime("pass")}
+    print(f"Bare interpreter: {baseline * 1000:.0f} ms")
+
+    summary = []
+    for name, code in ENTRY_POINTS.items():
+        print("\n" + "-" * 60)
+        print(name)
+        print("-" * 60)
+        try:
+            times = measure_wall_time(code, args.runs)
+        except RuntimeError as e:
+            print(f"  Skipped: {e}")
+            summary.append((name, None))
+            continue
+
+        median = statistics.median(times)
+        summary.append((name, median))
+        print(
+            f"  Wall time: {median * 1000:.0f} ms median "
+            f"({min(times) * 1000:.0f}-{max(times) * 1000:.0f} ms), "
+            f"{(median - baseline) * 1000:.0f} ms over bare interpreter"
+        )
+        print("  Slowest imports:")
+        for ms, module in slowest_imports(code, args.top, startup):
+            print(f"    {ms:8.1f} ms  {module}")
+        heavy = eager_heavy_modules(code)
+        print(f"  Heavy modules loaded: {', '.join(heavy) if heavy else 'none'}")
+
+    print("\n" + "=" * 60)
+    print("SUMMARY")
+    print("=" * 60)
+    for name, median in summary:
+        shown = f"{median * 1000:.0f} ms" if median is not None else "skipped"
+        print(f"  {name:<28} {shown}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
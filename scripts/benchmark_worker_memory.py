@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-worker memory of forked inference workers.
+
+For each artifact mode, a fresh parent process loads the models, optionally
+runs the preload_for_workers (gc.freeze) workflow, then forks N workers
+that each score a batch of incidents and stay alive while memory is
+measured. This reports per-worker USS (memory private to the worker) and
+total PSS (shared pages split between the processes sharing them), so a
+flat USS as workers are added means the models are shared, not copied.
+
+Modes:
+- joblib: joblib pickles read into heap memory (the default)
+- joblib-mmap: TRIAGE_MODEL_MMAP=1, pickle arrays memory-mapped (expect
+  little gain: the vocabulary dict and the split scorer's coefficient
+  blocks are still heap copies)
+- runtime-mmap: NumPy-only runtime artifact, memory-mapped
+Each is measured with and without preload_for_workers (gc.freeze).
+
+Linux only (fork start method, PSS accounting).
+
+Usage:
+    python scripts/benchmark_worker_memory.py [--workers 1 2 4]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+MODES = ("joblib", "joblib-mmap", "runtime-mmap")
+SAMPLE_INCIDENTS = [
+    "user reported a suspicious email with a fake login page",
+    "edr detected ransomware encrypting files on a finance workstation",
+    "large upload to a personal cloud storage account after hours",
+] * 50
+
+
+def memory_mb(pid: int) -> dict:
+    """USS (private pages) and PSS of a process, from /proc/<pid>/smaps_rollup."""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            name, _, value = line.partition(":")
+            if value.strip().endswith("kB"):
+                fields[name] = int(value.split()[0]) / 1024
+    return {
+        "uss": fields["Private_Clean"] + fields["Private_Dirty"],
+        "pss": fields["Pss"],
+    }
+
+
+def child(mode: str, workers: int, freeze: bool, runtime_dir: str) -> dict:
+    """Run in a fresh interpreter: load, fork workers, measure memory."""
+    import multiprocessing as mp
+
+    import numpy as np
+
+    from src.triage import model
+
+    if mode == "runtime-mmap":
+        model._get_models_dir = lambda: Path(runtime_dir).parent
+    if freeze:
+        model.preload_for_workers(runtime=mode.startswith("runtime"))
+
+    def score():
+        from src.triage.scoring import split_scorer
+
+        if mode.startswith("runtime"):
+            vectorizer = clf = model.load_runtime_model()
+        else:
+            vectorizer, clf = model.load_vectorizer_and_model()
+        X = vectorizer.transform(SAMPLE_INCIDENTS)
+        embeddings = np.zeros((len(SAMPLE_INCIDENTS), 384))
+        split_scorer(clf, X.shape[1]).predict_proba(X, embeddings)
+
+    if not freeze:
+        score()  # parent has the models loaded either way
+
+    context = mp.get_context("fork")
+    ready = context.Barrier(workers + 1)
+    done = context.Event()
+
+    def worker():
+        score()
+        ready.wait()
+        done.wait()
+
+    processes = [context.Process(target=worker) for _ in range(workers)]
+    for process in processes:
+        process.start()
+    ready.wait()
+
+    infos = [memory_mb(process.pid) for process in processes]
+    parent = memory_mb(os.getpid())
+    done.set()
+    for process in processes:
+        process.join()
+
+    return {
+        "uss_mb": sum(info["uss"] for info in infos) / len(infos),
+        "pss_mb": parent["pss"] + sum(info["pss"] for info in infos),
+    }
+
+
+def measure(mode: str, workers: int, freeze: bool, runtime_dir: str) -> dict:
+    """Run child() in a fresh interpreter with the mode's environment."""
+    env = dict(os.environ, TRIAGE_MODEL_MMAP="1" if mode.endswith("mmap") else "0")
+    result = subprocess.run(
+        [
+            sys.executable,
+            __file__,
+            "--child",
+            json.dumps([mode, workers, freeze, runtime_dir]),
+        ],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    """Measure every mode and worker count and print a report."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(child(*json.loads(args.child))))
+        return 0
+
+    from src.triage.model import export_runtime_model, load_vectorizer_and_model
+
+    print("\n" + "=" * 60)
+    print("PER-WORKER MEMORY BENCHMARK")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        runtime_dir = str(Path(tmp) / "runtime")
+        export_runtime_model(*load_vectorizer_and_model(), runtime_dir)
+
+        print(
+            f"\n  {'mode':<26}{'workers':>8}"
+            f"{'USS/worker MB':>15}{'total PSS MB':>14}"
+        )
+        for mode in MODES:
+            for freeze in (False, True):
+                name = f"{mode}{' + freeze' if freeze else ''}"
+                for workers in args.workers:
+                    stats = measure(mode, workers, freeze, runtime_dir)
+                    print(
+                        f"  {name:<26}{workers:>8}"
+                        f"{stats['uss_mb']:>15.1f}{stats['pss_mb']:>14.1f}"
+                    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
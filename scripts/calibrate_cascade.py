@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Calibrate the cascade-inference gate on the bundled dataset.
+
+Scores a sample with the TF-IDF-only baseline and the enhanced
+(TF-IDF + embeddings) model, then picks the lowest baseline confidence gate
+at which cascade labels still agree with the enhanced model on at least
+--target-agreement of incidents. Reports, for the chosen gate and a range
+of fixed gates:
+1. Agreement rate of cascade labels with the enhanced model
+2. Fraction of incidents escalated to the embedding + enhanced model
+3. Accuracy against the dataset's event_type labels
+
+The chosen gate is written to models/cascade.json, which `nlp-triage
+--cascade` uses by default.
+
+Usage:
+    python scripts/calibrate_cascade.py [--sample N] [--target-agreement 0.995]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.triage.embeddings import get_embedder  # noqa: E402
+from src.triage.model import (  # noqa: E402
+    CASCADE_CONFIG_FILE,
+    calibrate_cascade_gate,
+    load_baseline_model,
+    load_vectorizer_and_model,
+)
+from src.triage.preprocess import DEFAULT_DATASET, load_incident_sample  # noqa: E402
+
+REPORTED_GATES = [0.5, 0.6, 0.7, 0.8, 0.85, 0.9, 0.95, 0.99]
+
+
+def main():
+    """Calibrate the gate, print a report and save models/cascade.json."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--data", type=Path, default=DEFAULT_DATASET)
+    parser.add_argument("--sample", type=int, default=5000, help="Incidents used")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--target-agreement", type=float, default=0.995)
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Report without writing cascade.json"
+    )
+    args = parser.parse_args()
+
+    if not args.data.exists():
+        print(f"❌ Dataset not found at {args.data}")
+        return 1
+
+    from scipy.sparse import csr_matrix, hstack
+
+    texts, labels = load_incident_sample(args.data, args.sample, args.seed)
+
+    vectorizer, clf = load_vectorizer_and_model()
+    baseline = load_baseline_model()
+    X_tfidf = vectorizer.transform(texts)
+
+    start = time.perf_counter()
+    baseline_proba = baseline.predict_proba(X_tfidf)
+    baseline_ms = (time.perf_counter() - start) * 1000 / len(texts)
+
+    start = time.perf_counter()
+    embeddings = get_embedder().encode(texts, normalize=True)
+    enhanced_labels = clf.predict(hstack([X_tfidf, csr_matrix(embeddings)]))
+    enhanced_ms = (time.perf_counter() - start) * 1000 / len(texts)
+
+    classes = baseline.classes_
+    baseline_labels = classes[baseline_proba.argmax(axis=1)]
+    max_prob = baseline_proba.max(axis=1)
+
+    print("\n" + "=" * 60)
+    print("CASCADE GATE CALIBRATION")
+    print("=" * 60)
+    print(f"Dataset: {args.data} ({len(texts):,} incidents sampled)")
+    print(f"Baseline: {baseline_ms:.3f} ms/text   Enhanced: {enhanced_ms:.3f} ms/text")
+    agreement = np.mean(baseline_labels == enhanced_labels)
+    print(f"Baseline/enhanced agreement: {agreement:.2%}")
+
+    print(f"\n  {'gate':>6}{'agreement':>12}{'escalated':>12}{'accuracy':>11}")
+    for gate in REPORTED_GATES:
+        escalate = max_prob < gate
+        cascade_labels = np.where(escalate, enhanced_labels, baseline_labels)
+        print(
+            f"  {gate:>6.2f}{np.mean(cascade_labels == enhanced_labels):>12.2%}"
+            f"{np.mean(escalate):>12.2%}{np.mean(cascade_labels == labels):>11.2%}"
+        )
+    print(f"  {'enhanced only':<30}{np.mean(enhanced_labels == labels):>11.2%}")
+
+    calibration = calibrate_cascade_gate(
+        baseline_proba, enhanced_labels, classes, args.target_agreement
+    )
+    expected_ms = baseline_ms + calibration["escalation_rate"] * enhanced_ms
+    print(
+        f"\nCalibrated gate: {calibration['gate']:.4f} "
+        f"(agreement {calibration['agreement']:.2%}, "
+        f"{calibration['escalation_rate']:.1%} escalated, "
+        f"~{expected_ms:.3f} ms/text vs {enhanced_ms:.3f})"
+    )
+
+    if not args.dry_run:
+        config_path = PROJECT_ROOT / "models" / CASCADE_CONFIG_FILE
+        with open(config_path, "w") as f:
+            json.dump(calibration, f, indent=2)
+        print(f"✓ Saved to {config_path}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Export the TF-IDF vectorizer and enhanced classifier as a NumPy-only runtime.
+
+Compiles models/vectorizer.joblib + models/enhanced_logreg.joblib into a
+versioned directory of .npy arrays (sorted vocabulary, IDF weights,
+TF-IDF and embedding coefficient blocks, intercepts, classes) plus
+manifest.json, which triage.model.RuntimeModel loads without scikit-learn
+or scipy. Then verifies the runtime against the scikit-learn models and
+reports:
+1. Maximum probability difference on sample incidents
+2. Artifact size on disk vs. the joblib pickles
+3. Cold load time of each, in a fresh interpreter
+
+Use the artifact from the CLI with TRIAGE_RUNTIME_MODEL=1 (or its path).
+
+Usage:
+    python scripts/export_runtime_model.py [--output models/runtime]
+"""
+
+import argparse
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.triage.model import (  # noqa: E402
+    RuntimeModel,
+    export_runtime_model,
+    load_vectorizer_and_model,
+)
+from src.triage.preprocess import (  # noqa: E402
+    DEFAULT_DATASET,
+    clean_description,
+    load_incident_sample,
+)
+
+MODELS_DIR = PROJECT_ROOT / "models"
+
+SAMPLE_INCIDENTS = [
+    "User reported a suspicious email with a fake login page.",
+    "EDR detected ransomware encrypting files on a finance workstation.",
+    "Large upload to a personal Google Drive account after hours.",
+    "Multiple failed logins for an admin account from a foreign country.",
+    "WAF observed SQL injection payloads against the /login endpoint.",
+]
+
+
+def cold_load_seconds(code: str, runs: int = 3) -> float:
+    """Median wall time of running code in a fresh interpreter."""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, check=True)
+        times.append(time.perf_counter() - start)
+    return sorted(times)[len(times) // 2]
+
+
+def directory_size(paths) -> int:
+    """Total bytes of files."""
+    return sum(path.stat().st_size for path in paths)
+
+
+def main():
+    """Export, verify and print a report."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--output", type=Path, default=MODELS_DIR / "runtime")
+    parser.add_argument("--data", type=Path, default=DEFAULT_DATASET)
+    parser.add_argument("--sample", type=int, default=2000, help="Incidents checked")
+    parser.add_argument(
+        "--tolerance", type=float, default=1e-9, help="Max probability difference"
+    )
+    args = parser.parse_args()
+
+    from scipy.sparse import csr_matrix, hstack
+
+    vectorizer, clf = load_vectorizer_and_model()
+    export_runtime_model(vectorizer, clf, args.output)
+    runtime = RuntimeModel.load(args.output)
+
+    if args.data.exists():
+        texts, _ = load_incident_sample(args.data, args.sample)
+    else:
+        texts = [clean_description(text) for text in SAMPLE_INCIDENTS]
+    rng = np.random.default_rng(42)
+    embeddings = rng.normal(size=(len(texts), runtime.n_embedding))
+    embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+
+    expected = clf.predict_proba(
+        hstack([vectorizer.transform(texts), csr_matrix(embeddings)])
+    )
+    actual = runtime.predict_proba(runtime.transform(texts), embeddings)
+    max_diff = float(np.abs(expected - actual).max())
+
+    pickles = [MODELS_DIR / "vectorizer.joblib", MODELS_DIR / "enhanced_logreg.joblib"]
+    sklearn_load = cold_load_seconds(
+        "from src.triage.model import load_vectorizer_and_model; "
+        "load_vectorizer_and_model()"
+    )
+    runtime_load = cold_load_seconds(
+        "from src.triage.model import load_runtime_model; "
+        f"load_runtime_model({str(args.output)!r})"
+    )
+
+    print("\n" + "=" * 60)
+    print("RUNTIME MODEL EXPORT")
+    print("=" * 60)
+    print(f"Artifact: {args.output}")
+    print(
+        f"  {runtime.n_tfidf} TF-IDF + {runtime.n_embedding} embedding features, "
+        f"{len(runtime.classes_)} classes, link={runtime.link}"
+    )
+    print(f"\nVerification on {len(texts):,} incidents:")
+    print(f"  Max probability difference: {max_diff:.2e}")
+    print(f"  Same labels: {np.mean(expected.argmax(1) == actual.argmax(1)):.2%}")
+    print("\nSize and cold load:")
+    print(
+        f"  joblib pickles: {directory_size(pickles) / 1024:8.0f} KB "
+        f"{sklearn_load * 1000:8.0f} ms"
+    )
+    print(
+        f"  runtime:        {directory_size(args.output.iterdir()) / 1024:8.0f} KB "
+        f"{runtime_load * 1000:8.0f} ms"
+    )
+
+    if max_diff > args.tolerance:
+        print(f"\n❌ Probabilities differ by more than {args.tolerance:g}")
+        return 1
+    print("\n✅ Runtime model matches the scikit-learn models")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
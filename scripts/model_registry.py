@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Manage the versioned model registry (models/registry).
+
+Commands:
+- list: Published versions with their classes, feature layout and creation
+  time; the active one is marked
+- publish: Export models/vectorizer.joblib + the enhanced classifier (or,
+  with --artifact, copy a runtime artifact directory) as a new version, and
+  activate it unless --no-activate
+- activate VERSION: Point ACTIVE at a version (also how to roll back)
+- verify [VERSION]: Check a version's arrays against its manifest checksums
+
+Processes serving with TRIAGE_MODEL_REGISTRY=1 (CLI, UI) hot-swap to the
+active version on their next prediction; no restart is needed.
+
+Usage:
+    python scripts/model_registry.py list
+    python scripts/model_registry.py publish [--version NAME] [--artifact DIR]
+    python scripts/model_registry.py activate VERSION
+    python scripts/model_registry.py verify [VERSION]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.triage.model import RuntimeModel, load_vectorizer_and_model  # noqa: E402
+from src.triage.registry import ModelRegistry  # noqa: E402
+
+
+def list_versions(registry: ModelRegistry) -> int:
+    """Print every published version."""
+    versions = registry.versions()
+    if not versions:
+        print(f"No versions published in {registry.root}")
+        return 0
+    active = registry.active_version()
+    print(f"\n  {'version':<28}{'tfidf':>7}{'embed':>7}{'classes':>9}  created")
+    for version in versions:
+        manifest = registry.manifest(version)
+        marker = "*" if version == active else " "
+        print(
+            f"{marker} {version:<28}{manifest['n_tfidf']:>7}"
+            f"{manifest['n_embedding']:>7}{len(manifest['classes']):>9}"
+            f"  {manifest['created'][:19]}"
+        )
+    return 0
+
+
+def main():
+    """Run a registry command."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--root", type=Path, help="Registry directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list")
+    publish = commands.add_parser("publish")
+    publish.add_argument("--version", help="Version name (default: UTC timestamp)")
+    publish.add_argument("--artifact", type=Path, help="Runtime artifact directory")
+    publish.add_argument("--no-activate", action="store_true")
+    commands.add_parser("activate").add_argument("version")
+    commands.add_parser("verify").add_argument("version", nargs="?")
+    args = parser.parse_args()
+
+    registry = ModelRegistry(args.root)
+
+    try:
+        if args.command == "list":
+            return list_versions(registry)
+
+        if args.command == "publish":
+            activate = not args.no_activate
+            if args.artifact:
+                version = registry.publish_artifact(
+                    args.artifact, args.version, activate
+                )
+            else:
+                version = registry.publish(
+                    *load_vectorizer_and_model(), args.version, activate
+                )
+            state = "active" if activate else "inactive"
+            print(f"✅ Published {version} ({state}) to {registry.versions_dir}")
+            return 0
+
+        if args.command == "activate":
+            registry.activate(args.version)
+            print(f"✅ Active version: {args.version}")
+            return 0
+
+        version = args.version or registry.active_version()
+        if version is None:
+            print("❌ No active version to verify")
+            return 1
+        RuntimeModel.load(registry.version_path(version), verify=True)
+        print(f"✅ {version}: all arrays match their checksums")
+        return 0
+    except (FileNotFoundError, FileExistsError, ValueError) as e:
+        print(f"❌ {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Prune and compact the NumPy-only runtime model.
+
+Writes an optimized copy of a runtime artifact (see
+scripts/export_runtime_model.py): vocabulary terms whose TF-IDF coefficients
+are within --tolerance of zero for every class are pruned, the IDF and
+coefficient arrays are re-indexed to the kept terms, and they are cast to
+float32. Then reports, against the source artifact:
+1. Terms pruned at a sweep of tolerances, with the prediction change each
+   causes on the bundled dataset (label agreement, max probability change)
+2. For the chosen tolerance: artifact size, cold load time and transform time
+3. Accuracy of both against the dataset's event_type labels
+
+Pruned terms also drop out of each document's TF-IDF norm, so predictions
+can change slightly even at small tolerances. Without --tolerance the
+largest swept tolerance whose label agreement meets --min-agreement is
+used; with it, the run fails if agreement is below --min-agreement. Serve
+the result with TRIAGE_RUNTIME_MODEL=models/runtime-optimized, or add it
+to the model registry with --publish.
+
+Usage:
+    python scripts/optimize_runtime_model.py [--tolerance 0.3] [--publish]
+"""
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.triage.model import (  # noqa: E402
+    RuntimeModel,
+    export_runtime_model,
+    load_vectorizer_and_model,
+    optimize_runtime_model,
+)
+from src.triage.preprocess import (  # noqa: E402
+    DEFAULT_DATASET,
+    clean_description,
+    load_incident_sample,
+)
+
+MODELS_DIR = PROJECT_ROOT / "models"
+SWEEP_TOLERANCES = [0.05, 0.1, 0.2, 0.3, 0.5]
+
+SAMPLE_INCIDENTS = [
+    "User reported a suspicious email with a fake login page.",
+    "EDR detected ransomware encrypting files on a finance workstation.",
+    "Large upload to a personal Google Drive account after hours.",
+    "Multiple failed logins for an admin account from a foreign country.",
+    "WAF observed SQL injection payloads against the /login endpoint.",
+]
+
+
+def encode(texts: list, dim: int) -> np.ndarray:
+    """Sentence embeddings, or random unit vectors without the transformer."""
+    try:
+        from src.triage.embeddings import get_embedder
+
+        return get_embedder().encode(texts, normalize=True)
+    except RuntimeError as e:
+        print(f"⚠️  {e}; comparing with random unit embeddings")
+        embeddings = np.random.default_rng(42).normal(size=(len(texts), dim))
+        return embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+
+
+def predict(model: RuntimeModel, texts: list, embeddings: np.ndarray):
+    """(probabilities, ms per text spent in transform)."""
+    start = time.perf_counter()
+    X = model.transform(texts)
+    transform_ms = (time.perf_counter() - start) * 1000 / len(texts)
+    return model.predict_proba(X, embeddings), transform_ms
+
+
+def cold_load_seconds(path: Path, runs: int = 3) -> float:
+    """Median wall time of loading the artifact in a fresh interpreter."""
+    code = (
+        "from src.triage.model import load_runtime_model; "
+        f"load_runtime_model({str(path)!r})"
+    )
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, check=True)
+        times.append(time.perf_counter() - start)
+    return sorted(times)[len(times) // 2]
+
+
+def directory_size(path: Path) -> int:
+    """Total bytes of the files in a directory."""
+    return sum(file.stat().st_size for file in path.iterdir())
+
+
+def main():
+    """Optimize, compare against the source artifact and print a report."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--source",
+        type=Path,
+        help="Runtime artifact to optimize (default: export the joblib models)",
+    )
+    parser.add_argument(
+        "--output", type=Path, default=MODELS_DIR / "runtime-optimized"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        help="Pruning tolerance (default: the largest swept tolerance that "
+        "meets --min-agreement)",
+    )
+    parser.add_argument("--dtype", default="float32", choices=["float32", "float64"])
+    parser.add_argument("--data", type=Path, default=DEFAULT_DATASET)
+    parser.add_argument("--sample", type=int, default=5000, help="Incidents used")
+    parser.add_argument("--min-agreement", type=float, default=0.99)
+    parser.add_argument(
+        "--publish",
+        action="store_true",
+        help="Add the result to the model registry (not activated)",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source_dir = args.source
+        if source_dir is None:
+            source_dir = export_runtime_model(
+                *load_vectorizer_and_model(), Path(tmp) / "source"
+            )
+        source = RuntimeModel.load(source_dir)
+
+        if args.data.exists():
+            texts, labels = load_incident_sample(args.data, args.sample)
+        else:
+            texts = [clean_description(text) for text in SAMPLE_INCIDENTS]
+            labels = None
+        embeddings = encode(texts, source.n_embedding)
+        expected, source_ms = predict(source, texts, embeddings)
+
+        print("\n" + "=" * 60)
+        print("RUNTIME MODEL OPTIMIZATION")
+        print("=" * 60)
+        print(f"Source: {args.source or 'joblib models'} ({source.n_tfidf:,} terms)")
+        print(f"Compared on {len(texts):,} incidents")
+
+        sweep = {}
+        tolerances = set(SWEEP_TOLERANCES)
+        if args.tolerance is not None:
+            tolerances.add(args.tolerance)
+        for tolerance in sorted(tolerances):
+            try:
+                swept = RuntimeModel.load(
+                    optimize_runtime_model(
+                        source, Path(tmp) / f"sweep-{tolerance}", tolerance, args.dtype
+                    )
+                )
+            except ValueError as e:
+                sweep[tolerance] = e
+                continue
+            actual, _ = predict(swept, texts, embeddings)
+            sweep[tolerance] = (
+                source.n_tfidf - swept.n_tfidf,
+                np.mean(actual.argmax(1) == expected.argmax(1)),
+                np.abs(actual - expected).max(),
+            )
+
+        # Default to the most aggressive pruning that keeps the agreement
+        tolerance = args.tolerance
+        if tolerance is None:
+            passing = [
+                t
+                for t, result in sweep.items()
+                if isinstance(result, tuple) and result[1] >= args.min_agreement
+            ]
+            if not passing:
+                print(
+                    f"\n❌ No swept tolerance keeps {args.min_agreement:.2%} label "
+                    "agreement; pass --tolerance"
+                )
+                return 1
+            tolerance = max(passing)
+
+        print(f"\n  {'tolerance':>9}{'pruned':>9}{'agreement':>12}{'max dprob':>12}")
+        for swept_tolerance, result in sweep.items():
+            if not isinstance(result, tuple):
+                print(f"  {swept_tolerance:>9g}  {result}")
+                continue
+            pruned, agreement, max_change = result
+            marker = "*" if swept_tolerance == tolerance else " "
+            print(
+                f"{marker} {swept_tolerance:>9g}{pruned:>9,}"
+                f"{agreement:>12.2%}{max_change:>12.2e}"
+            )
+
+        try:
+            optimize_runtime_model(source, args.output, tolerance, args.dtype)
+        except ValueError as e:
+            print(f"\n❌ {e}")
+            return 1
+        optimized = RuntimeModel.load(args.output)
+        actual, optimized_ms = predict(optimized, texts, embeddings)
+        agreement = np.mean(actual.argmax(1) == expected.argmax(1))
+
+        print(f"\nOptimized artifact: {args.output}")
+        print(f"  {'':<12}{'size KB':>10}{'cold load ms':>14}{'transform ms':>14}")
+        for name, path, ms in (
+            ("source", Path(source_dir), source_ms),
+            ("optimized", args.output, optimized_ms),
+        ):
+            print(
+                f"  {name:<12}{directory_size(path) / 1024:>10.0f}"
+                f"{cold_load_seconds(path) * 1000:>14.0f}{ms * 1000:>14.1f}"
+            )
+        print("  (transform ms per 1,000 incidents)")
+        if labels is not None:
+            print("\nAccuracy (event_type):")
+            for name, proba in (("source", expected), ("optimized", actual)):
+                predicted = source.classes_[proba.argmax(axis=1)]
+                print(f"  {name:<12}{np.mean(predicted == labels):.2%}")
+
+        if agreement < args.min_agreement:
+            print(
+                f"\n❌ Label agreement {agreement:.2%} is below "
+                f"{args.min_agreement:.2%}; lower --tolerance"
+            )
+            return 1
+
+        if args.publish:
+            from src.triage.registry import ModelRegistry
+
+            version = ModelRegistry().publish_artifact(args.output, activate=False)
+            print(f"\n✓ Published as registry version {version} (not active)")
+            print(f"  Activate: python scripts/model_registry.py activate {version}")
+
+    print(f"\n✅ Optimized model agrees on {agreement:.2%} of labels")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Validate an embedding backend against the fp32 PyTorch reference.
+
+Encodes a sample of the bundled dataset with both the reference (torch)
+backend and the candidate backend, then reports:
+1. Embedding fidelity (cosine similarity to the fp32 vectors)
+2. Enhanced-classifier agreement (TF-IDF + embeddings predictions made
+   with candidate vectors vs. fp32 vectors), plus accuracy of each against
+   the dataset's event_type labels
+3. Encoding latency per incident and resident memory of each model
+
+Exits non-zero when prediction agreement is below --min-agreement.
+
+Usage:
+    python scripts/validate_embedding_backend.py --backend int8 [--sample N]
+"""
+
+import argparse
+import gc
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.triage.embeddings import EMBEDDING_BACKENDS, IncidentEmbeddings  # noqa: E402
+from src.triage.model import load_vectorizer_and_model  # noqa: E402
+from src.triage.preprocess import DEFAULT_DATASET, load_incident_sample  # noqa: E402
+
+
+def rss_mb() -> float:
+    """Resident set size of this process in MB."""
+    import psutil
+
+    return psutil.Process().memory_info().rss / 1024 / 1024
+
+
+def embed(backend: str, texts: list, num_threads: int) -> dict:
+    """Load a backend, encode texts, and measure time and memory."""
+    gc.collect()
+    before = rss_mb()
+    embedder = IncidentEmbeddings(backend=backend, num_threads=num_threads)
+    embedder.encode(texts[:8])  # load and warm up
+    model_mb = rss_mb() - before
+
+    start = time.perf_counter()
+    vectors = embedder.encode(texts, normalize=True)
+    elapsed = time.perf_counter() - start
+
+    # Single-incident latency, as in interactive triage
+    single = []
+    for text in texts[:50]:
+        t0 = time.perf_counter()
+        embedder.encode(text, normalize=True)
+        single.append(time.perf_counter() - t0)
+
+    del embedder
+    gc.collect()
+    return {
+        "vectors": np.asarray(vectors, dtype=np.float32),
+        "bulk_ms": elapsed * 1000 / len(texts),
+        "single_ms": float(np.median(single)) * 1000,
+        "model_mb": model_mb,
+    }
+
+
+def predict(vectorizer, clf, texts: list, vectors: np.ndarray) -> np.ndarray:
+    """Enhanced-classifier labels for texts with the given embeddings."""
+    from scipy.sparse import csr_matrix, hstack
+
+    X = hstack([vectorizer.transform(texts), csr_matrix(vectors)]).tocsr()
+    return clf.predict(X)
+
+
+def main():
+    """Compare the candidate backend to fp32 and print a report."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--backend",
+        required=True,
+        choices=[b for b in EMBEDDING_BACKENDS if b != "torch"],
+        help="Backend to validate",
+    )
+    parser.add_argument("--data", type=Path, default=DEFAULT_DATASET)
+    parser.add_argument("--sample", type=int, default=2000, help="Incidents used")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--threads", type=int, default=None, help="torch threads")
+    parser.add_argument(
+        "--min-agreement",
+        type=float,
+        default=0.99,
+        help="Fail below this prediction agreement with fp32",
+    )
+    args = parser.parse_args()
+
+    if not args.data.exists():
+        print(f"❌ Dataset not found at {args.data}")
+        return 1
+
+    texts, labels = load_incident_sample(args.data, args.sample, args.seed)
+    vectorizer, clf = load_vectorizer_and_model()
+
+    print("\n" + "=" * 60)
+    print(f"EMBEDDING BACKEND VALIDATION: torch (fp32) vs {args.backend}")
+    print("=" * 60)
+    print(f"Dataset: {args.data} ({len(texts):,} incidents sampled)")
+
+    reference = embed("torch", texts, args.threads)
+    candidate = embed(args.backend, texts, args.threads)
+
+    ref_vectors, cand_vectors = reference["vectors"], candidate["vectors"]
+    cosine = np.sum(ref_vectors * cand_vectors, axis=1) / (
+        np.linalg.norm(ref_vectors, axis=1) * np.linalg.norm(cand_vectors, axis=1)
+    )
+
+    ref_pred = predict(vectorizer, clf, texts, ref_vectors)
+    cand_pred = predict(vectorizer, clf, texts, cand_vectors)
+    agreement = float(np.mean(ref_pred == cand_pred))
+
+    print("\nEmbedding fidelity (cosine to fp32):")
+    print(
+        f"  mean {cosine.mean():.4f}  p1 {np.percentile(cosine, 1):.4f}  "
+        f"min {cosine.min():.4f}"
+    )
+
+    print("\nEnhanced classifier:")
+    print(
+        f"  Agreement with fp32:  {agreement:.2%} "
+        f"({int(np.sum(ref_pred != cand_pred))} changed predictions)"
+    )
+    print(f"  Accuracy (fp32):      {np.mean(ref_pred == labels):.2%}")
+    print(f"  Accuracy ({args.backend}): {np.mean(cand_pred == labels):.2%}")
+
+    print("\nPerformance:")
+    print(f"  {'':<12}{'bulk ms/text':>14}{'single ms':>12}{'model MB':>10}")
+    for name, stats in (("torch", reference), (args.backend, candidate)):
+        print(
+            f"  {name:<12}{stats['bulk_ms']:>14.2f}"
+            f"{stats['single_ms']:>12.2f}{stats['model_mb']:>10.0f}"
+        )
+    print(
+        f"  Speedup: {reference['bulk_ms'] / candidate['bulk_ms']:.2f}x bulk, "
+        f"{reference['single_ms'] / candidate['single_ms']:.2f}x single"
+    )
+
+    if agreement < args.min_agreement:
+        print(f"\n❌ Agreement below {args.min_agreement:.2%}")
+        return 1
+    print(f"\n✅ Agreement meets {args.min_agreement:.2%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,299 @@
+"""
+DuckDB analytics over the triage history.
+
+Reporting aggregates (severity index, threat-brief statistics, label
+counts) run as vectorized SQL in an embedded DuckDB instead of Python loops
+over rows pulled from SQLite. The engine reads either:
+
+- the Parquet dataset written by TriageDatabase.export_columnar, refreshed
+  incrementally from its watermark (needs only DuckDB's bundled Parquet
+  reader), or
+- triage.db attached read-only through DuckDB's sqlite extension.
+
+The rows are loaded once into an in-memory DuckDB table of pre-parsed
+columns and topped up by refresh(), so reports never touch the SQLite
+write path. duckdb is an optional dependency; only this module imports it.
+"""
+
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .database import EXPORT_COLUMN_TYPES
+
+# Base severity (0-100) of each classification, shared with the UI's
+# per-incident risk score
+LABEL_SEVERITY = {
+    "malware": 90,
+    "data_exfiltration": 95,
+    "web_attack": 75,
+    "access_abuse": 70,
+    "phishing": 65,
+    "policy_violation": 30,
+    "benign_activity": 10,
+    "uncertain": 50,
+}
+DEFAULT_SEVERITY = 50
+
+# Labels reported as critical threats in the threat-intelligence brief
+CRITICAL_LABELS = ("malware", "data_exfiltration", "web_attack")
+
+_DUCKDB_TYPES = {"int64": "BIGINT", "float64": "DOUBLE", "string": "VARCHAR"}
+
+# Narrow, pre-parsed projection of analysis_history that reports run on;
+# raw_result JSON and narrative text are decoded once, at load time, and
+# each row's risk score is computed alongside (see _risk_score_sql)
+_HISTORY_COLUMNS = """
+    SELECT
+        id,
+        timestamp,
+        final_label,
+        COALESCE(
+            json_extract_string(raw_result, '$.display_label'), final_label
+        ) AS display_label,
+        max_prob,
+        length(coalesce(incident_text, '')) AS text_length,
+        batch_id,
+        CAST(
+            json_extract(raw_result, '$.final_label_mitre_techniques') AS VARCHAR[]
+        ) AS techniques
+"""
+
+
+def _quote(value: str) -> str:
+    """SQL string literal."""
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _risk_score_sql() -> str:
+    """
+    Vectorized form of the UI's calculate_risk_score (with no IOCs).
+
+    Expects display_label, max_prob and text_length columns.
+    """
+    cases = " ".join(
+        f"WHEN {_quote(label)} THEN {severity}"
+        for label, severity in LABEL_SEVERITY.items()
+    )
+    severity = f"(CASE display_label {cases} ELSE {DEFAULT_SEVERITY} END)"
+    return f"""
+        LEAST(GREATEST(
+            {severity} * 0.6
+            + (CASE WHEN {severity} > 50 THEN max_prob * 1.2
+                    ELSE max_prob * 0.8 END) * 20
+            + LEAST(text_length / 500.0, 1.0) * 0.3 * 10,
+            0), 100)
+    """
+
+
+class AnalyticsEngine:
+    """Read-only reporting queries over analysis history in DuckDB."""
+
+    def __init__(
+        self, parquet_dir: Optional[str] = None, sqlite_path: Optional[str] = None
+    ):
+        """
+        Open an in-memory DuckDB over one history source.
+
+        Args:
+            parquet_dir: Directory written by TriageDatabase.export_columnar
+            sqlite_path: triage.db to attach read-only (requires DuckDB's
+                    sqlite extension)
+        """
+        try:
+            import duckdb
+        except ImportError as e:
+            raise ImportError(
+                "Analytics queries require duckdb: pip install duckdb"
+            ) from e
+
+        if (parquet_dir is None) == (sqlite_path is None):
+            raise ValueError("Pass exactly one of parquet_dir or sqlite_path")
+
+        self._db = None
+        self.export_dir = parquet_dir
+        self._conn = duckdb.connect()
+        # One engine can serve many threads (e.g. every Streamlit session)
+        self._refresh_lock = threading.Lock()
+
+        if sqlite_path is not None:
+            self._conn.execute("INSTALL sqlite")
+            self._conn.execute("LOAD sqlite")
+            self._conn.execute(
+                f"ATTACH {_quote(str(sqlite_path))} AS triage (TYPE sqlite, READ_ONLY)"
+            )
+        self._conn.execute(f"CREATE TABLE history AS {self._load_sql()}")
+
+    def _load_sql(self, where: str = "") -> str:
+        """SELECT producing history rows (with their risk score) from the source."""
+        return f"""
+            SELECT *, {_risk_score_sql()} AS risk_score
+            FROM ({_HISTORY_COLUMNS} FROM {self._source()} {where})
+        """
+
+    def _source(self) -> str:
+        """Relation the history table is loaded from."""
+        if self.export_dir is None:
+            return "triage.analysis_history"
+        if any(Path(self.export_dir).glob("**/*.parquet")):
+            pattern = str(Path(self.export_dir) / "**" / "*.parquet")
+            return (
+                f"read_parquet({_quote(pattern)}, hive_partitioning = true, "
+                "union_by_name = true)"
+            )
+        # Nothing exported yet: an empty relation with the export schema
+        columns = ", ".join(
+            f"NULL::{_DUCKDB_TYPES[kind]} AS {name}"
+            for name, kind in EXPORT_COLUMN_TYPES.items()
+        )
+        return f"(SELECT {columns} WHERE false)"
+
+    @classmethod
+    def for_database(cls, db, export_dir: Optional[str] = None) -> "AnalyticsEngine":
+        """
+        Build an engine over a Parquet export of a TriageDatabase.
+
+        The export is brought up to date first and can be refreshed later
+        with refresh(). Analyses are exported and loaded once, so later
+        edits to them are not reflected.
+
+        Args:
+            db: TriageDatabase to export from
+            export_dir: Dataset directory (defaults to 'analytics' next to
+                    the database)
+        """
+        if export_dir is None:
+            export_dir = str(Path(db.db_path).parent / "analytics")
+        db.export_columnar(export_dir)
+        engine = cls(parquet_dir=export_dir)
+        engine._db = db
+        return engine
+
+    def refresh(self) -> int:
+        """
+        Load analyses saved since the engine was built or last refreshed.
+
+        Engines from for_database export the new rows first. Safe to call
+        from several threads: the export and the load run under a lock, so
+        concurrent refreshes never load the same rows twice.
+
+        Returns:
+            Number of rows loaded
+        """
+        with self._refresh_lock:
+            if self._db is not None:
+                self._db.export_columnar(self.export_dir)
+            new_rows = "WHERE id > (SELECT coalesce(max(id), 0) FROM history)"
+            cursor = self._conn.cursor()
+            cursor.execute(f"INSERT INTO history {self._load_sql(new_rows)}")
+            return cursor.fetchone()[0]
+
+    def _query(self, sql: str, batch_id: Optional[str]):
+        """Run sql against history, restricted to batch_id when given."""
+        if batch_id is None:
+            return self._conn.cursor().execute(sql.format(where=""))
+        return self._conn.cursor().execute(
+            sql.format(where="WHERE batch_id = ?"), [batch_id]
+        )
+
+    def severity_index(self, batch_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Aggregated risk scores, as computed by the UI for a result list.
+
+        Args:
+            batch_id: Restrict to one saved batch
+
+        Returns:
+            Dict with overall (mean score), critical/high/medium/low counts
+            and scores (NumPy array of per-incident scores)
+        """
+        overall, critical, high, medium, low = self._query(
+            """
+            SELECT
+                coalesce(avg(risk_score), 0),
+                count(*) FILTER (WHERE risk_score >= 80),
+                count(*) FILTER (WHERE risk_score >= 60 AND risk_score < 80),
+                count(*) FILTER (WHERE risk_score >= 40 AND risk_score < 60),
+                count(*) FILTER (WHERE risk_score < 40)
+            FROM history {where}
+        """,
+            batch_id,
+        ).fetchone()
+        scores = self._query(
+            "SELECT risk_score FROM history {where}", batch_id
+        ).fetchnumpy()["risk_score"]
+
+        return {
+            "overall": overall,
+            "critical": critical,
+            "high": high,
+            "medium": medium,
+            "low": low,
+            "scores": scores,
+        }
+
+    def label_counts(self, batch_id: Optional[str] = None) -> List[Tuple[str, int]]:
+        """(display_label, count) pairs, most common first."""
+        return self._query(
+            """
+            SELECT display_label, count(*) AS n
+            FROM history {where}
+            GROUP BY display_label
+            ORDER BY n DESC, display_label
+        """,
+            batch_id,
+        ).fetchall()
+
+    def threat_brief_stats(
+        self, batch_id: Optional[str] = None, top_techniques: int = 10
+    ) -> Dict[str, Any]:
+        """
+        Statistics behind the threat-intelligence brief.
+
+        Args:
+            batch_id: Restrict to one saved batch
+            top_techniques: Number of MITRE techniques to return
+
+        Returns:
+            Dict with total, avg_confidence, high_conf_count,
+            label_counts, technique_counts (top techniques with counts),
+            distinct_techniques, technique_occurrences and critical_counts
+        """
+        total, avg_confidence, high_conf_count = self._query(
+            """
+            SELECT count(*), coalesce(avg(max_prob), 0),
+                   count(*) FILTER (WHERE max_prob > 0.8)
+            FROM history {where}
+        """,
+            batch_id,
+        ).fetchone()
+
+        technique_rows = self._query(
+            """
+            SELECT technique, count(*) AS n
+            FROM (SELECT unnest(techniques) AS technique FROM history {where})
+            GROUP BY technique
+            ORDER BY n DESC, technique
+        """,
+            batch_id,
+        ).fetchall()
+
+        label_counts = self.label_counts(batch_id)
+        return {
+            "total": total,
+            "avg_confidence": avg_confidence,
+            "high_conf_count": high_conf_count,
+            "label_counts": label_counts,
+            "technique_counts": technique_rows[:top_techniques],
+            "distinct_techniques": len(technique_rows),
+            "technique_occurrences": sum(n for _, n in technique_rows),
+            "critical_counts": {
+                label: count
+                for label, count in label_counts
+                if label in CRITICAL_LABELS
+            },
+        }
+
+    def close(self):
+        """Close the DuckDB connection."""
+        self._conn.close()
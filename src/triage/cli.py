@@ -11,12 +11,10 @@ from collections import Counter
 # Suppress tokenizers parallelism warning when using sentence-transformers
 os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
 
-import joblib
 import numpy as np
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
-from rich.status import Status
 
 console = Console()
 
@@ -39,14 +37,6 @@ def load_mitre_from_json() -> dict:
         return {}
 
 
-# -----------------------------------------------------------------------------
-# Optional: local LLM backend (e.g., Llama-2-7B-GGUF via llama-cpp-python)
-# -----------------------------------------------------------------------------
-try:
-    from llama_cpp import Llama  # type: ignore
-except Exception:  # pragma: no cover - optional dependency
-    Llama = None
-
 # -----------------------------------------------------------------------------
 # Path setup
 # -----------------------------------------------------------------------------
@@ -58,9 +48,13 @@ if str(PROJECT_ROOT) not in sys.path:
 
 from src.triage.preprocess import clean_description  # type: ignore
 from src.triage.embeddings import get_embedder  # type: ignore
+from src.triage.iocs import extract_iocs  # type: ignore
+from src.triage.model import load_baseline_model, load_cascade_gate  # type: ignore
+from src.triage.scoring import split_scorer  # type: ignore
 from src.triage.llm_client import (  # type: ignore
     HuggingFaceInferenceClient,
     RateLimiter,
+    load_llama,
     resolve_hf_credentials,
 )
 
@@ -190,27 +184,11 @@ def _extract_indicators(text: str) -> set[str]:
     Used to sanity-check LLM rationales for hallucinated entities that do not
     appear in the original incident narrative.
     """
-    if not text:
-        return set()
-
-    indicators: set[str] = set()
-    # Very lightweight regexes; we deliberately keep them simple and conservative.
-    url_pattern = r"https?://[^\s]+"
-    domain_pattern = (
-        r"\b[a-zA-Z0-9.-]+\.(com|net|org|io|gov|edu|co|biz|info|cloud|xyz)\b"
-    )
-    email_pattern = r"\b\S+@\S+\b"
-    ipv4_pattern = r"\b(?:\d{1,3}\.){3}\d{1,3}\b"
-
-    for pattern in (url_pattern, domain_pattern, email_pattern, ipv4_pattern):
-        for match in re.findall(pattern, text):
-            if isinstance(match, tuple):
-                # For grouped patterns like domain_pattern, take the full match[0]
-                indicators.add(str(match[0]).lower())
-            else:
-                indicators.add(str(match).lower())
-
-    return indicators
+    return {
+        value
+        for kind, value in extract_iocs(text)
+        if kind in ("url", "domain", "email", "ipv4")
+    }
 
 
 _llm_instance = None  # cached singleton
@@ -229,6 +207,9 @@ def get_llm():
     if _llm_instance is not None:
         return _llm_instance
 
+    # Optional local LLM backend (e.g., Llama-2-7B-GGUF via llama-cpp-python),
+    # imported on first use
+    Llama = load_llama()
     if Llama is None:
         raise RuntimeError(
             "llama-cpp-python is not installed or import failed. "
@@ -489,7 +470,7 @@ Do not repeat these instructions.
             )
 
     if data is None:
-        if Llama is None:
+        if load_llama() is None:
             _llm_debug(
                 "llama-cpp-python is not available; returning uncertain placeholder."
             )
@@ -1164,8 +1145,15 @@ def load_artifacts():
     """
     Load ML models and embedder.
     
-    Uses cached loader from model.py to prevent repeated disk I/O.
-    Models are loaded once and cached in memory for the process lifetime.
+    Uses cached loader from model.py to prevent repeated disk I/O, so
+    calls after the first are cheap.
+
+    Models come from model.load_serving_models: the joblib pickles, the
+    NumPy-only runtime model (TRIAGE_RUNTIME_MODEL), or the active version
+    of the model registry (TRIAGE_MODEL_REGISTRY). A runtime model serves
+    as both vectorizer and classifier, and scikit-learn is never imported.
+    Call this per prediction rather than once per process, so a newly
+    activated registry version is picked up without a restart.
     """
     import sys
     # Get the current model module (handles module reloading in tests)
@@ -1177,12 +1165,57 @@ def load_artifacts():
         except ImportError:
             from src.triage import model as model_module
     
-    vectorizer, clf = model_module.load_vectorizer_and_model()
+    vectorizer, clf = model_module.load_serving_models()
     embedder = get_embedder()
     classes = clf.classes_
     return vectorizer, clf, embedder, classes
 
 
+def check_cascade_baseline(baseline_clf, vectorizer, classes) -> None:
+    """
+    Check that the TF-IDF baseline can pre-score for the serving model.
+
+    Cascade mode scores the baseline on the serving vectorizer's features
+    and labels its probabilities with the serving model's classes, so both
+    must match what the baseline was trained on. A pruned runtime model
+    (see model.optimize_runtime_model) has a smaller vocabulary and can't
+    be cascaded with the joblib baseline.
+
+    Raises:
+        ValueError: If the TF-IDF widths or the class lists differ
+    """
+    n_tfidf = vectorizer.transform([""]).shape[1]
+    if baseline_clf.n_features_in_ != n_tfidf:
+        raise ValueError(
+            f"the baseline expects {baseline_clf.n_features_in_} TF-IDF features "
+            f"but the serving vectorizer produces {n_tfidf} (pruned or retrained "
+            "model?)"
+        )
+    if list(baseline_clf.classes_) != list(classes):
+        raise ValueError(
+            "the baseline and the serving model predict different classes"
+        )
+
+
+def load_cascade_artifacts(cascade: dict):
+    """
+    load_artifacts, exiting with an error if the cascade baseline doesn't fit.
+
+    Args:
+        cascade: baseline_clf/cascade_gate keyword arguments, empty when
+            --cascade is off
+    """
+    artifacts = load_artifacts()
+    if cascade:
+        vectorizer, _, _, classes = artifacts
+        try:
+            check_cascade_baseline(cascade["baseline_clf"], vectorizer, classes)
+        except ValueError as e:
+            console.print(f"[red]Cannot use --cascade: {e}.[/red]")
+            raise SystemExit(1)
+    return artifacts
+
+
 # -----------------------------------------------------------------------------
 # Uncertainty helpers
 # -----------------------------------------------------------------------------
@@ -1201,7 +1234,6 @@ def categorize_uncertainty(max_prob: float, threshold: float) -> str:
 
 
 import time
-from rich.progress import Progress, BarColumn, TextColumn
 
 
 def show_progress_bar(duration: float = 0.4, length: int = 24) -> None:
@@ -1210,6 +1242,8 @@ def show_progress_bar(duration: float = 0.4, length: int = 24) -> None:
     duration: total animation time (seconds)
     length: number of characters in the bar
     """
+    from rich.progress import Progress, BarColumn, TextColumn
+
     with Progress(
         TextColumn("[bold green]Running NLP classifier...[/bold green]"),
         BarColumn(
@@ -1228,6 +1262,38 @@ def show_progress_bar(duration: float = 0.4, length: int = 24) -> None:
             time.sleep(0.04)
 
 
+def _build_result(
+    text: str,
+    cleaned: str,
+    proba,
+    classes,
+    threshold: float,
+    max_classes: int,
+) -> dict:
+    """Result dict for one incident from its class probabilities."""
+    base_idx = int(np.argmax(proba))
+    base_label = classes[base_idx]
+    max_prob = float(proba[base_idx])
+
+    final_label = base_label if max_prob >= threshold else "uncertain"
+    uncertainty_level = categorize_uncertainty(max_prob, threshold)
+
+    probs_sorted = sorted(zip(classes, proba), key=lambda x: x[1], reverse=True)[
+        :max_classes
+    ]
+
+    return {
+        "raw_text": text,
+        "cleaned": cleaned,
+        "base_label": base_label,
+        "final_label": final_label,
+        "max_prob": max_prob,
+        "threshold": threshold,
+        "uncertainty_level": uncertainty_level,
+        "probs_sorted": probs_sorted,
+    }
+
+
 def predict_with_uncertainty(
     text: str,
     vectorizer,
@@ -1236,6 +1302,8 @@ def predict_with_uncertainty(
     classes,
     threshold: float = DEFAULT_UNCERTAINTY_THRESHOLD,
     max_classes: int = 5,
+    baseline_clf=None,
+    cascade_gate: float | None = None,
 ):
     """
     Run a single prediction with:
@@ -1245,44 +1313,90 @@ def predict_with_uncertainty(
       - feature fusion (TF-IDF + embeddings)
       - max-probability classification
       - simple uncertainty handling
-    """
-    from scipy.sparse import hstack, csr_matrix
 
+    Cascade mode (baseline_clf given): the TF-IDF-only baseline scores the
+    incident first, and only when its max probability is below cascade_gate
+    are the embedding and enhanced model computed. The result then carries
+    'escalated' (whether the enhanced model was used).
+    """
     cleaned = clean_description(text)
 
     # Get TF-IDF features
     X_tfidf = vectorizer.transform([cleaned])
 
+    if baseline_clf is not None:
+        if cascade_gate is None:
+            cascade_gate = load_cascade_gate()
+        proba = split_scorer(baseline_clf, X_tfidf.shape[1]).predict_proba(X_tfidf)[0]
+        if proba.max() >= cascade_gate:
+            result = _build_result(
+                text, cleaned, proba, classes, threshold, max_classes
+            )
+            result["escalated"] = False
+            return result
+
     # Get sentence embeddings
     embedding = embedder.encode(cleaned, normalize=True)
-    embedding_sparse = csr_matrix(embedding)
 
-    # Combine features (TF-IDF + Embeddings)
-    X_vec = hstack([X_tfidf, embedding_sparse])
+    # Score TF-IDF and embedding blocks of the linear model separately
+    # (same probabilities as predict_proba on the hstacked features)
+    proba = split_scorer(clf, X_tfidf.shape[1]).predict_proba(X_tfidf, embedding)[0]
 
-    proba = clf.predict_proba(X_vec)[0]
+    result = _build_result(text, cleaned, proba, classes, threshold, max_classes)
+    if baseline_clf is not None:
+        result["escalated"] = True
+    return result
 
-    base_idx = int(np.argmax(proba))
-    base_label = classes[base_idx]
-    max_prob = float(proba[base_idx])
 
-    final_label = base_label if max_prob >= threshold else "uncertain"
-    uncertainty_level = categorize_uncertainty(max_prob, threshold)
+def predict_batch(
+    texts: list[str],
+    vectorizer,
+    clf,
+    embedder,
+    classes,
+    threshold: float = DEFAULT_UNCERTAINTY_THRESHOLD,
+    max_classes: int = 5,
+    baseline_clf=None,
+    cascade_gate: float | None = None,
+) -> list[dict]:
+    """
+    predict_with_uncertainty over many incidents, vectorized.
 
-    probs_sorted = sorted(zip(classes, proba), key=lambda x: x[1], reverse=True)[
-        :max_classes
-    ]
+    TF-IDF features and model scores are computed for the whole batch at
+    once, and embeddings in a single encode call; in cascade mode only the
+    incidents the baseline can't settle are embedded.
+    """
+    if not texts:
+        return []
+
+    cleaned = [clean_description(text) for text in texts]
+    X_tfidf = vectorizer.transform(cleaned)
+
+    escalate = np.ones(len(texts), dtype=bool)
+    if baseline_clf is not None:
+        if cascade_gate is None:
+            cascade_gate = load_cascade_gate()
+        proba = split_scorer(baseline_clf, X_tfidf.shape[1]).predict_proba(X_tfidf)
+        escalate = proba.max(axis=1) < cascade_gate
+    else:
+        proba = np.zeros((len(texts), len(classes)))
 
-    return {
-        "raw_text": text,
-        "cleaned": cleaned,
-        "base_label": base_label,
-        "final_label": final_label,
-        "max_prob": max_prob,
-        "threshold": threshold,
-        "uncertainty_level": uncertainty_level,
-        "probs_sorted": probs_sorted,
-    }
+    if escalate.any():
+        rows = np.flatnonzero(escalate)
+        embeddings = embedder.encode([cleaned[i] for i in rows], normalize=True)
+        proba[rows] = split_scorer(clf, X_tfidf.shape[1]).predict_proba(
+            X_tfidf[rows], embeddings
+        )
+
+    results = []
+    for i, text in enumerate(texts):
+        result = _build_result(
+            text, cleaned[i], proba[i], classes, threshold, max_classes
+        )
+        if baseline_clf is not None:
+            result["escalated"] = bool(escalate[i])
+        results.append(result)
+    return results
 
 
 # -----------------------------------------------------------------------------
@@ -1550,6 +1664,8 @@ def summarize_bulk_results(results: list[dict]) -> None:
 
     avg_max_prob = sum(r["max_prob"] for r in results) / total
     llm_count = sum(1 for r in results if r.get("llm_second_opinion"))
+    cascaded = [r for r in results if "escalated" in r]
+    escalated_count = sum(1 for r in cascaded if r["escalated"])
 
     # Summary table of final labels
     table = Table(title="Bulk Triage Summary")
@@ -1587,6 +1703,13 @@ def summarize_bulk_results(results: list[dict]) -> None:
         "",
         f"MITRE technique coverage (by model base labels): {mitre_text}",
     ]
+    if cascaded:
+        rec_records.insert(
+            4,
+            f"Cascade: {escalated_count} of {len(cascaded)} records escalated to "
+            f"the embedding model ({escalated_count / len(cascaded):.1%}); "
+            f"the rest were settled by the TF-IDF baseline",
+        )
 
     # Heuristic recommendations
     if uncertain_ratio > 0.25:
@@ -1809,6 +1932,24 @@ def parse_args():
             "to provide a second opinion when the baseline model is uncertain."
         ),
     )
+    parser.add_argument(
+        "-c",
+        "--cascade",
+        action="store_true",
+        help=(
+            "Score with the TF-IDF-only baseline first and only compute sentence "
+            "embeddings and the enhanced model when it is not confident enough."
+        ),
+    )
+    parser.add_argument(
+        "--cascade-gate",
+        type=float,
+        default=None,
+        help=(
+            "Baseline max probability at or above which --cascade skips the "
+            "enhanced model (default: calibrated value from models/cascade.json)."
+        ),
+    )
     return parser.parse_args()
 
 
@@ -1835,7 +1976,19 @@ def main():
         f"(threshold={effective_threshold:.2f}, max_classes={effective_max_classes})\n"
     )
 
-    vectorizer, clf, embedder, classes = load_artifacts()
+    cascade = {}
+    if args.cascade:
+        cascade = {
+            "baseline_clf": load_baseline_model(),
+            "cascade_gate": (
+                args.cascade_gate
+                if args.cascade_gate is not None
+                else load_cascade_gate()
+            ),
+        }
+    # Load (and validate) the models up front; predictions below fetch them
+    # again so a registry version activated meanwhile is used
+    vectorizer, clf, embedder, classes = load_cascade_artifacts(cascade)
 
     # Bulk mode: process input file if provided
     if args.input_file:
@@ -1856,19 +2009,20 @@ def main():
             )
             return
 
-        results = []
+        # The whole file is scored as one batch, by one model version
+        vectorizer, clf, embedder, classes = load_cascade_artifacts(cascade)
+        results = predict_batch(
+            records,
+            vectorizer,
+            clf,
+            embedder,
+            classes,
+            effective_threshold,
+            effective_max_classes,
+            **cascade,
+        )
         total_records = len(records)
-        for idx, text in enumerate(records, start=1):
-            result = predict_with_uncertainty(
-                text,
-                vectorizer,
-                clf,
-                embedder,
-                classes,
-                effective_threshold,
-                effective_max_classes,
-            )
-
+        for idx, result in enumerate(results, start=1):
             # Optional LLM second opinion in bulk mode
             if args.llm_second_opinion:
                 try:
@@ -1886,8 +2040,6 @@ def main():
                 except Exception as exc:
                     _llm_debug(f"LLM second opinion failed in bulk mode: {exc!r}")
 
-            results.append(result)
-
         # If an output file is provided, write JSONL; otherwise pretty-print
         if args.output_file:
             out_path = Path(args.output_file)
@@ -1934,6 +2086,7 @@ def main():
             classes,
             effective_threshold,
             effective_max_classes,
+            **cascade,
         )
 
         # Optional LLM second opinion
@@ -1964,6 +2117,7 @@ def main():
         if text.lower().strip() in {"exit", "quit"}:
             break
         show_progress_bar()
+        vectorizer, clf, embedder, classes = load_cascade_artifacts(cascade)
         result = predict_with_uncertainty(
             text,
             vectorizer,
@@ -1972,6 +2126,7 @@ def main():
             classes,
             effective_threshold,
             effective_max_classes,
+            **cascade,
         )
 
         # Optional LLM second opinion in interactive mode
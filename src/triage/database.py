@@ -10,23 +10,456 @@ Provides SQLite-based persistence for:
 """
 
 import sqlite3
+import copy
+import functools
+import hashlib
 import json
+import os
+import queue
+import re
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import Future
 from pathlib import Path
-from datetime import datetime
-from typing import Optional, Dict, List, Any
+from urllib.parse import quote
+from datetime import datetime, timedelta
+from typing import Optional, Dict, List, Any, Iterator, Callable
+from collections import OrderedDict
 from contextlib import contextmanager
 
+from .iocs import extract_iocs
+
+# Confidence histogram resolution (0.05-wide buckets over [0, 1])
+CONFIDENCE_HISTOGRAM_BINS = 20
+
+# Bucket widths supported by TriageDatabase.get_time_buckets
+TIME_BUCKET_SPANS = {
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1),
+}
+
+# Arrow types for analysis_history columns written by export_columnar
+EXPORT_COLUMN_TYPES = {
+    "id": "int64",
+    "timestamp": "string",
+    "incident_text": "string",
+    "final_label": "string",
+    "max_prob": "float64",
+    "uncertainty_level": "string",
+    "analysis_mode": "string",
+    "difficulty": "string",
+    "threshold": "float64",
+    "use_llm": "int64",
+    "raw_result": "string",
+    "batch_id": "string",
+    "created_at": "string",
+}
+
+# Tables whose writes bump config_version and invalidate the config cache
+CONFIG_TABLES = ("user_settings", "user_profiles", "feature_flags")
+
+# Embedding files (see TriageDatabase.load_embeddings) are allocated with
+# room for this many times the stored vectors, and at least this many rows
+EMBEDDING_GROWTH = 1.25
+EMBEDDING_MIN_CAPACITY = 1024
+
+
+def _bucket_sql(prob_expr: str) -> str:
+    """SQL expression mapping a probability to its histogram bucket."""
+    last = CONFIDENCE_HISTOGRAM_BINS - 1
+    return (
+        f"MIN(MAX(CAST({prob_expr} * {CONFIDENCE_HISTOGRAM_BINS} AS INTEGER), 0), "
+        f"{last})"
+    )
+
+
+def _text_hash(text: str) -> str:
+    """Content address of an incident narrative in incident_texts."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _rollup_apply_sql(row: str) -> str:
+    """Trigger statements adding one analysis_records row to the rollups."""
+    return f"""
+        INSERT INTO analysis_daily_rollup
+        (day, final_label, analysis_mode, incident_count, llm_count,
+         prob_sum, prob_min, prob_max, first_seen, last_seen)
+        VALUES (
+            substr({row}.timestamp, 1, 10), {row}.final_label,
+            COALESCE({row}.analysis_mode, ''), 1,
+            COALESCE({row}.use_llm, 0) != 0, {row}.max_prob,
+            {row}.max_prob, {row}.max_prob, {row}.timestamp, {row}.timestamp
+        )
+        ON CONFLICT (day, final_label, analysis_mode) DO UPDATE SET
+            incident_count = incident_count + 1,
+            llm_count = llm_count + excluded.llm_count,
+            prob_sum = prob_sum + excluded.prob_sum,
+            prob_min = MIN(prob_min, excluded.prob_min),
+            prob_max = MAX(prob_max, excluded.prob_max),
+            first_seen = MIN(first_seen, excluded.first_seen),
+            last_seen = MAX(last_seen, excluded.last_seen);
+
+        INSERT INTO analysis_confidence_histogram (bucket, final_label, incident_count)
+        VALUES ({_bucket_sql(row + ".max_prob")}, {row}.final_label, 1)
+        ON CONFLICT (bucket, final_label) DO UPDATE SET
+            incident_count = incident_count + 1;
+    """
+
+
+def _rollup_retract_sql(row: str) -> str:
+    """
+    Trigger statements removing one analysis_records row from the rollups.
+
+    Counts and sums are decremented in place. Min/max values can't be
+    decremented, so they are re-read from the base table only when the
+    removed row was the extreme of its group; that lookup is bounded to a
+    single day via idx_history_timestamp.
+    """
+    day = f"substr({row}.timestamp, 1, 10)"
+    mode = f"COALESCE({row}.analysis_mode, '')"
+    group = (
+        f"h.timestamp >= {day} AND h.timestamp < date({day}, '+1 day') "
+        f"AND h.final_label = {row}.final_label "
+        f"AND COALESCE(h.analysis_mode, '') = {mode}"
+    )
+    match = (
+        f"day = {day} AND final_label = {row}.final_label "
+        f"AND analysis_mode = {mode}"
+    )
+    return f"""
+        UPDATE analysis_daily_rollup SET
+            incident_count = incident_count - 1,
+            llm_count = llm_count - (COALESCE({row}.use_llm, 0) != 0),
+            prob_sum = prob_sum - {row}.max_prob,
+            prob_min = CASE WHEN {row}.max_prob <= prob_min
+                THEN (SELECT MIN(h.max_prob) FROM analysis_records h WHERE {group})
+                ELSE prob_min END,
+            prob_max = CASE WHEN {row}.max_prob >= prob_max
+                THEN (SELECT MAX(h.max_prob) FROM analysis_records h WHERE {group})
+                ELSE prob_max END,
+            first_seen = CASE WHEN {row}.timestamp <= first_seen
+                THEN (SELECT MIN(h.timestamp) FROM analysis_records h WHERE {group})
+                ELSE first_seen END,
+            last_seen = CASE WHEN {row}.timestamp >= last_seen
+                THEN (SELECT MAX(h.timestamp) FROM analysis_records h WHERE {group})
+                ELSE last_seen END
+        WHERE {match};
+
+        DELETE FROM analysis_daily_rollup
+        WHERE {match} AND incident_count <= 0;
+
+        UPDATE analysis_confidence_histogram
+        SET incident_count = incident_count - 1
+        WHERE bucket = {_bucket_sql(row + ".max_prob")}
+          AND final_label = {row}.final_label;
+
+        DELETE FROM analysis_confidence_histogram
+        WHERE bucket = {_bucket_sql(row + ".max_prob")}
+          AND final_label = {row}.final_label
+          AND incident_count <= 0;
+    """
+
+
+def _cached_query(method: Callable) -> Callable:
+    """
+    Serve a read method from TriageDatabase's result cache when enabled.
+
+    Every call first reads SQLite's data_version, which changes whenever
+    any other connection (another session's instance, the write-behind
+    writer, the CLI, another process) commits; a changed version empties
+    the cache, so results are never served stale. Results are also tagged
+    with this instance's write generation when the query started, and
+    dropped if a write landed while it ran. Callers receive deep copies, so
+    mutating a result never corrupts the cached entry.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not self.result_cache_size:
+            return method(self, *args, **kwargs)
+
+        key = (method.__name__, json.dumps([args, kwargs], sort_keys=True, default=str))
+        data_version = self._data_version()
+        with self._result_cache_lock:
+            if data_version != self._result_cache_data_version:
+                self._result_cache.clear()
+                self._result_cache_used = 0
+                self._result_cache_data_version = data_version
+            entry = self._result_cache.get(key)
+            if entry is not None:
+                self._result_cache.move_to_end(key)
+                self.result_cache_hits += 1
+                return copy.deepcopy(entry[0])
+            generation = self._write_generation
+
+        result = method(self, *args, **kwargs)
+        size = len(json.dumps(result, default=str))
+        if size <= self.result_cache_bytes:
+            with self._result_cache_lock:
+                # Drop the result if a write landed while the query ran
+                if (
+                    generation == self._write_generation
+                    and data_version == self._result_cache_data_version
+                ):
+                    self._result_cache[key] = (copy.deepcopy(result), size)
+                    self._result_cache_used += size
+                    while (
+                        len(self._result_cache) > self.result_cache_size
+                        or self._result_cache_used > self.result_cache_bytes
+                    ):
+                        _, (_, evicted) = self._result_cache.popitem(last=False)
+                        self._result_cache_used -= evicted
+        return result
+
+    return wrapper
+
+
+def _raw_result_json(raw_result: Optional[Dict[str, Any]]) -> Optional[str]:
+    """
+    raw_result as JSON, without its incident_text.
+
+    The narrative is stored once in incident_texts; readers that parse
+    raw_result (get_batch_incidents) put it back from there.
+    """
+    if not raw_result:
+        return None
+    return json.dumps({k: v for k, v in raw_result.items() if k != "incident_text"})
+
+
+def _embedding_paths(directory: Path, stem: str, generation: str) -> tuple:
+    """(text ids, vectors) .npy paths of one generation of embedding files."""
+    return (
+        directory / f"{stem}_{generation}_text_ids.npy",
+        directory / f"{stem}_{generation}_vectors.npy",
+    )
+
+
+def _read_embedding_meta(path: Path, model: str) -> Optional[Dict[str, Any]]:
+    """Published metadata of a model's embedding files, or None if unusable."""
+    try:
+        meta = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+    keys = {"model", "generation", "dim", "rows", "capacity", "count", "max", "sum"}
+    if not isinstance(meta, dict) or not keys <= meta.keys():
+        return None
+    if meta["model"] != model:
+        return None
+    ids_path, matrix_path = _embedding_paths(
+        path.parent, path.name[: -len("_vectors.json")], meta["generation"]
+    )
+    if not (ids_path.exists() and matrix_path.exists()):
+        return None
+    return meta
+
+
+def _write_embedding_meta(path: Path, meta: Dict[str, Any]) -> None:
+    """Publish embedding file metadata with an atomic replace."""
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}-", dir=path.parent)
+    with os.fdopen(fd, "w") as f:
+        json.dump(meta, f)
+    os.replace(tmp, path)
+
+
+def _remove_embedding_generations(directory: Path, stem: str, keep: set) -> None:
+    """
+    Delete superseded generations of embedding files.
+
+    The previous generation is kept too, for readers that read the old
+    metadata just before it was replaced.
+    """
+    for path in directory.glob(f"{stem}_*_text_ids.npy"):
+        generation = path.name[len(stem) + 1 : -len("_text_ids.npy")]
+        if generation in keep:
+            continue
+        for stale in _embedding_paths(directory, stem, generation):
+            try:
+                stale.unlink()
+            except OSError:
+                # Still mapped on platforms that forbid that; next time
+                pass
+
+
+def _embedding_model(model: Optional[str]) -> str:
+    """model, or the id of the configured embedder's vector space."""
+    if model is not None:
+        return model
+    from .embeddings import embedding_model_id
+
+    return embedding_model_id()
+
+
+def _resolve_id(value: Any) -> Any:
+    """Unwrap a Future returned by a write-behind save into its row ID."""
+    if isinstance(value, Future):
+        return value.result()
+    return value
+
+
+class WriteBehindQueue:
+    """
+    Single background writer that groups queued writes into transactions.
+
+    Each submitted operation is a callable ``op(cursor, resolve)`` that runs
+    on the writer thread's own connection; ``resolve`` turns a Future from an
+    earlier submit into its result, so dependent writes (e.g. a note on a
+    just-saved analysis) can be queued back-to-back. Operations are applied
+    in submission order. The writer waits at most ``flush_interval`` seconds
+    after the first pending write before committing, or less once
+    ``max_batch`` operations are pending. A failing operation is rolled back
+    to its own savepoint and only its Future receives the exception.
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        db_path: str,
+        flush_interval: float = 0.05,
+        max_batch: int = 500,
+        on_commit: Optional[Callable[[], None]] = None,
+    ):
+        self.db_path = db_path
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.on_commit = on_commit
+        self._queue: "queue.Queue" = queue.Queue()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(
+            target=self._run, name="triage-db-writer", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, op: Callable[[sqlite3.Cursor, Callable], Any]) -> Future:
+        """Queue a write operation; the returned Future yields its result."""
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Write-behind queue is closed")
+            self._queue.put((op, future))
+        return future
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Block until every write submitted so far has been committed."""
+        barrier: Future = Future()
+        with self._lock:
+            if self._closed:
+                return
+            self._queue.put((None, barrier))
+        barrier.result(timeout=timeout)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Flush pending writes and stop the writer thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put((self._STOP, None))
+        self._thread.join(timeout)
+
+    def _run(self):
+        conn = sqlite3.connect(self.db_path, timeout=30.0, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            stop = False
+            while not stop:
+                batch = [self._queue.get()]
+                deadline = time.monotonic() + self.flush_interval
+                while len(batch) < self.max_batch and batch[-1][0] is not self._STOP:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(self._queue.get(timeout=remaining))
+                    except queue.Empty:
+                        break
+
+                stop = batch[-1][0] is self._STOP
+                self._write_batch(conn, [item for item in batch if item[1]])
+        finally:
+            conn.close()
+
+    def _write_batch(self, conn: sqlite3.Connection, batch: List[tuple]):
+        results: Dict[Future, Any] = {}
+        errors: Dict[Future, BaseException] = {}
+
+        def resolve(value: Any) -> Any:
+            if isinstance(value, Future):
+                if value in errors:
+                    raise errors[value]
+                if value in results:
+                    return results[value]
+            return _resolve_id(value)
+
+        cursor = conn.cursor()
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            for op, future in batch:
+                if op is None:
+                    continue
+                cursor.execute("SAVEPOINT write_behind_op")
+                try:
+                    results[future] = op(cursor, resolve)
+                    cursor.execute("RELEASE write_behind_op")
+                except Exception as exc:
+                    cursor.execute("ROLLBACK TO write_behind_op")
+                    cursor.execute("RELEASE write_behind_op")
+                    errors[future] = exc
+            cursor.execute("COMMIT")
+            if self.on_commit is not None and (results or errors):
+                self.on_commit()
+        except Exception as exc:
+            if conn.in_transaction:
+                conn.rollback()
+            for op, future in batch:
+                if op is not None:
+                    future.set_exception(exc)
+                else:
+                    future.set_result(None)
+            return
+
+        for op, future in batch:
+            if op is None:
+                future.set_result(None)
+            elif future in errors:
+                future.set_exception(errors[future])
+            else:
+                future.set_result(results[future])
+
 
 class TriageDatabase:
     """Manages SQLite database for triage application."""
 
-    def __init__(self, db_path: Optional[str] = None):
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        write_behind: bool = False,
+        flush_interval: float = 0.05,
+        max_batch: int = 500,
+        config_cache_ttl: float = 1.0,
+        result_cache_size: int = 0,
+        result_cache_bytes: int = 32 * 1024 * 1024,
+    ):
         """
         Initialize database connection.
 
         Args:
             db_path: Path to SQLite database file.
                     Defaults to 'data/triage.db'
+            write_behind: Queue analysis/tag/note writes on a background
+                    writer thread that commits them in batches
+            flush_interval: Seconds the writer waits to group writes
+            max_batch: Maximum writes committed in one transaction
+            config_cache_ttl: Seconds cached settings/flags/profile are
+                    trusted before checking whether another process
+                    changed them
+            result_cache_size: Maximum cached read results (0 disables the
+                    result cache)
+            result_cache_bytes: Approximate memory bound for cached results
         """
         if db_path is None:
             db_path = Path(__file__).parent.parent.parent / "data" / "triage.db"
@@ -37,8 +470,37 @@ class TriageDatabase:
         db_path.parent.mkdir(parents=True, exist_ok=True)
 
         self.db_path = str(db_path)
+
+        # Read-result cache; emptied whenever any connection commits a write
+        self.result_cache_size = result_cache_size
+        self.result_cache_bytes = result_cache_bytes
+        self.result_cache_hits = 0
+        self._result_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._result_cache_used = 0
+        self._result_cache_lock = threading.Lock()
+        self._write_generation = 0
+        # Long-lived connection whose PRAGMA data_version reveals commits by
+        # every other connection (opened on first cached read)
+        self._version_conn: Optional[sqlite3.Connection] = None
+        self._version_lock = threading.Lock()
+        self._result_cache_data_version: Optional[int] = None
+
         self._init_database()
 
+        self.config_cache_ttl = config_cache_ttl
+        self._config_cache: Optional[Dict[str, Any]] = None
+        self._config_checked_at = 0.0
+        self._config_generation = 0
+
+        self._writer: Optional[WriteBehindQueue] = None
+        if write_behind:
+            self._writer = WriteBehindQueue(
+                self.db_path,
+                flush_interval=flush_interval,
+                max_batch=max_batch,
+                on_commit=self._bump_write_generation,
+            )
+
     @contextmanager
     def get_connection(self):
         """Context manager for database connections."""
@@ -47,24 +509,104 @@ class TriageDatabase:
         try:
             yield conn
             conn.commit()
+            if conn.total_changes:
+                self._bump_write_generation()
         except Exception:
             conn.rollback()
             raise
         finally:
             conn.close()
 
+    def _bump_write_generation(self):
+        """Record a committed write and drop every cached read result."""
+        with self._result_cache_lock:
+            self._write_generation += 1
+            self._result_cache.clear()
+            self._result_cache_used = 0
+
+    def _data_version(self) -> int:
+        """SQLite data_version: changes when another connection commits."""
+        with self._version_lock:
+            if self._version_conn is None:
+                self._version_conn = sqlite3.connect(
+                    self.db_path, timeout=30.0, check_same_thread=False
+                )
+            return self._version_conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _write(self, op: Callable[[sqlite3.Cursor, Callable], Any]) -> Any:
+        """
+        Run a write operation, or queue it when write-behind is enabled.
+
+        Returns:
+            The operation's result, or a Future for it in write-behind mode
+        """
+        if self._writer is not None:
+            return self._writer.submit(op)
+        with self.get_connection() as conn:
+            return op(conn.cursor(), _resolve_id)
+
+    def resolve(self, value: Any, timeout: Optional[float] = None) -> Any:
+        """
+        Wait for a write's result.
+
+        Unwraps the Future a write method returns in write-behind mode,
+        blocking until its transaction commits; synchronous results are
+        returned as they are.
+
+        Raises:
+            Exception: The write's own error, if it failed
+            TimeoutError: If it isn't committed within timeout seconds
+        """
+        if isinstance(value, Future):
+            return value.result(timeout=timeout)
+        return value
+
+    def flush(self, timeout: Optional[float] = None):
+        """Block until all queued writes are committed (no-op when synchronous)."""
+        if self._writer is not None:
+            self._writer.flush(timeout)
+
+    def close(self, timeout: Optional[float] = None):
+        """Commit queued writes and stop the background writer, if any."""
+        if self._writer is not None:
+            self._writer.close(timeout)
+            self._writer = None
+        with self._version_lock:
+            if self._version_conn is not None:
+                self._version_conn.close()
+                self._version_conn = None
+
     def _init_database(self):
         """Initialize database schema."""
         with self.get_connection() as conn:
             cursor = conn.cursor()
 
-            # Analysis history table
+            # Only takes effect on a new, empty database; existing ones are
+            # converted on their first incremental_vacuum()
+            cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+
+            # Content-addressed incident narratives, stored once per
+            # distinct text and referenced by id
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS incident_texts (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    text_hash TEXT UNIQUE NOT NULL,  -- sha256 of the text
+                    text TEXT NOT NULL
+                )
+            """
+            )
+
+            legacy_tables = self._rename_legacy_text_tables(cursor)
+
+            # Analysis history records (exposed with their text through the
+            # analysis_history view)
             cursor.execute(
                 """
-                CREATE TABLE IF NOT EXISTS analysis_history (
+                CREATE TABLE IF NOT EXISTS analysis_records (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     timestamp TEXT NOT NULL,
-                    incident_text TEXT NOT NULL,
+                    text_id INTEGER NOT NULL,
                     final_label TEXT NOT NULL,
                     max_prob REAL NOT NULL,
                     uncertainty_level TEXT,
@@ -74,7 +616,8 @@ class TriageDatabase:
                     use_llm INTEGER,  -- 0 or 1
                     raw_result TEXT,  -- JSON of full result
                     batch_id TEXT,  -- UUID for batch analyses
-                    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+                    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (text_id) REFERENCES incident_texts(id)
                 )
             """
             )
@@ -97,17 +640,18 @@ class TriageDatabase:
             """
             )
 
-            # Bookmarks table
+            # Bookmark records (exposed through the bookmarks view)
             cursor.execute(
                 """
-                CREATE TABLE IF NOT EXISTS bookmarks (
+                CREATE TABLE IF NOT EXISTS bookmark_records (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     analysis_id INTEGER,
-                    incident_text TEXT NOT NULL,
+                    text_id INTEGER NOT NULL,
                     final_label TEXT,
                     note TEXT,
                     created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (analysis_id) REFERENCES analysis_history(id)
+                    FOREIGN KEY (analysis_id) REFERENCES analysis_records(id),
+                    FOREIGN KEY (text_id) REFERENCES incident_texts(id)
                 )
             """
             )
@@ -132,7 +676,7 @@ class TriageDatabase:
                     tag_id INTEGER,
                     created_at TEXT DEFAULT CURRENT_TIMESTAMP,
                     PRIMARY KEY (analysis_id, tag_id),
-                    FOREIGN KEY (analysis_id) REFERENCES analysis_history(id),
+                    FOREIGN KEY (analysis_id) REFERENCES analysis_records(id),
                     FOREIGN KEY (tag_id) REFERENCES tags(id)
                 )
             """
@@ -148,7 +692,7 @@ class TriageDatabase:
                     author TEXT,  -- For future multi-user support
                     created_at TEXT DEFAULT CURRENT_TIMESTAMP,
                     updated_at TEXT,
-                    FOREIGN KEY (analysis_id) REFERENCES analysis_history(id)
+                    FOREIGN KEY (analysis_id) REFERENCES analysis_records(id)
                 )
             """
             )
@@ -195,27 +739,663 @@ class TriageDatabase:
             """
             )
 
+            if legacy_tables:
+                self._migrate_legacy_text_tables(cursor, legacy_tables)
+            self._init_text_views(cursor)
+
             # Create indexes for performance
             cursor.execute(
                 """
                 CREATE INDEX IF NOT EXISTS idx_history_timestamp 
-                ON analysis_history(timestamp)
+                ON analysis_records(timestamp)
             """
             )
 
             cursor.execute(
                 """
                 CREATE INDEX IF NOT EXISTS idx_history_label 
-                ON analysis_history(final_label)
+                ON analysis_records(final_label)
+            """
+            )
+
+            cursor.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_history_text 
+                ON analysis_records(text_id)
             """
             )
 
             cursor.execute(
                 """
                 CREATE INDEX IF NOT EXISTS idx_bookmarks_created 
-                ON bookmarks(created_at)
+                ON bookmark_records(created_at)
+            """
+            )
+
+            cursor.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_bookmarks_text 
+                ON bookmark_records(text_id)
+            """
+            )
+
+            cursor.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_notes_analysis 
+                ON notes(analysis_id)
+            """
+            )
+
+            self._init_rollups(cursor)
+            self._init_config_version(cursor)
+            self._init_ioc_index(cursor)
+            self._init_embeddings(cursor)
+            self._init_text_search(cursor)
+
+    def _rename_legacy_text_tables(self, cursor) -> List[str]:
+        """
+        Move pre-incident_texts tables aside so they can be migrated.
+
+        Databases created before content-addressed text storage keep
+        analysis_history and bookmarks as plain tables with the narrative
+        inline; they are renamed to *_legacy here and copied over by
+        _migrate_legacy_text_tables.
+
+        Returns:
+            Names of the tables that were renamed
+        """
+        legacy = []
+        for table in ("analysis_history", "bookmarks"):
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                (table,),
+            )
+            if cursor.fetchone() is not None:
+                legacy.append(table)
+
+        if legacy:
+            # Keep other tables' REFERENCES clauses pointing at the old name,
+            # which the view of the same name takes over
+            cursor.execute("PRAGMA legacy_alter_table = ON")
+            for table in legacy:
+                cursor.execute(f"ALTER TABLE {table} RENAME TO {table}_legacy")
+            cursor.execute("PRAGMA legacy_alter_table = OFF")
+        return legacy
+
+    def _migrate_legacy_text_tables(self, cursor, legacy_tables: List[str]):
+        """Copy renamed legacy tables into the text-deduplicated layout."""
+        cursor.connection.create_function(
+            "triage_text_hash", 1, _text_hash, deterministic=True
+        )
+        for table in legacy_tables:
+            cursor.execute(
+                f"""
+                INSERT OR IGNORE INTO incident_texts (text_hash, text)
+                SELECT triage_text_hash(incident_text), incident_text
+                FROM {table}_legacy
+            """
+            )
+
+        if "analysis_history" in legacy_tables:
+            cursor.execute(
+                """
+                INSERT INTO analysis_records
+                (id, timestamp, text_id, final_label, max_prob, uncertainty_level,
+                 analysis_mode, difficulty, threshold, use_llm, raw_result,
+                 batch_id, created_at)
+                SELECT h.id, h.timestamp, t.id, h.final_label, h.max_prob,
+                       h.uncertainty_level, h.analysis_mode, h.difficulty,
+                       h.threshold, h.use_llm, h.raw_result, h.batch_id,
+                       h.created_at
+                FROM analysis_history_legacy h
+                JOIN incident_texts t
+                  ON t.text_hash = triage_text_hash(h.incident_text)
+            """
+            )
+        if "bookmarks" in legacy_tables:
+            cursor.execute(
+                """
+                INSERT INTO bookmark_records
+                (id, analysis_id, text_id, final_label, note, created_at)
+                SELECT b.id, b.analysis_id, t.id, b.final_label, b.note,
+                       b.created_at
+                FROM bookmarks_legacy b
+                JOIN incident_texts t
+                  ON t.text_hash = triage_text_hash(b.incident_text)
+            """
+            )
+
+        # Dropping the legacy history table also drops its rollup triggers;
+        # _init_rollups recreates them on analysis_records
+        for table in legacy_tables:
+            cursor.execute(f"DROP TABLE {table}_legacy")
+
+    def _init_text_views(self, cursor):
+        """
+        Create the analysis_history and bookmarks views over the records.
+
+        The views keep the original column layout, so reads, updates and
+        deletes through them behave as before. Narratives are immutable:
+        new rows are inserted through save_analysis/add_bookmark, which
+        intern the text, and updating incident_text through a view aborts.
+        """
+        cursor.execute(
+            """
+            CREATE VIEW IF NOT EXISTS analysis_history AS
+            SELECT r.id, r.timestamp, t.text AS incident_text, r.final_label,
+                   r.max_prob, r.uncertainty_level, r.analysis_mode,
+                   r.difficulty, r.threshold, r.use_llm, r.raw_result,
+                   r.batch_id, r.created_at
+            FROM analysis_records r
+            JOIN incident_texts t ON t.id = r.text_id
+        """
+        )
+        cursor.execute(
+            """
+            CREATE VIEW IF NOT EXISTS bookmarks AS
+            SELECT b.id, b.analysis_id, t.text AS incident_text, b.final_label,
+                   b.note, b.created_at
+            FROM bookmark_records b
+            JOIN incident_texts t ON t.id = b.text_id
+        """
+        )
+
+        cursor.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_analysis_history_update
+            INSTEAD OF UPDATE ON analysis_history
+            BEGIN
+                SELECT RAISE(ABORT, 'incident_text is immutable')
+                WHERE NEW.incident_text IS NOT OLD.incident_text;
+                UPDATE analysis_records SET
+                    timestamp = NEW.timestamp,
+                    final_label = NEW.final_label,
+                    max_prob = NEW.max_prob,
+                    uncertainty_level = NEW.uncertainty_level,
+                    analysis_mode = NEW.analysis_mode,
+                    difficulty = NEW.difficulty,
+                    threshold = NEW.threshold,
+                    use_llm = NEW.use_llm,
+                    raw_result = NEW.raw_result,
+                    batch_id = NEW.batch_id,
+                    created_at = NEW.created_at
+                WHERE id = OLD.id;
+            END
+        """
+        )
+        cursor.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_analysis_history_delete
+            INSTEAD OF DELETE ON analysis_history
+            BEGIN
+                DELETE FROM analysis_records WHERE id = OLD.id;
+            END
+        """
+        )
+        cursor.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_bookmarks_update
+            INSTEAD OF UPDATE ON bookmarks
+            BEGIN
+                SELECT RAISE(ABORT, 'incident_text is immutable')
+                WHERE NEW.incident_text IS NOT OLD.incident_text;
+                UPDATE bookmark_records SET
+                    analysis_id = NEW.analysis_id,
+                    final_label = NEW.final_label,
+                    note = NEW.note,
+                    created_at = NEW.created_at
+                WHERE id = OLD.id;
+            END
+        """
+        )
+        cursor.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_bookmarks_delete
+            INSTEAD OF DELETE ON bookmarks
+            BEGIN
+                DELETE FROM bookmark_records WHERE id = OLD.id;
+            END
+        """
+        )
+
+    def _intern_text(self, cursor, text: str) -> int:
+        """Return the incident_texts id for text, storing it if new."""
+        text_hash = _text_hash(text)
+        cursor.execute(
+            "INSERT OR IGNORE INTO incident_texts (text_hash, text) VALUES (?, ?)",
+            (text_hash, text),
+        )
+        cursor.execute(
+            "SELECT id FROM incident_texts WHERE text_hash = ?", (text_hash,)
+        )
+        return cursor.fetchone()[0]
+
+    def _prune_incident_texts(self, cursor, text_id: Optional[int] = None):
+        """
+        Delete narratives no longer referenced by any record.
+
+        Args:
+            cursor: Cursor of the deleting transaction
+            text_id: Only consider this narrative (two index probes instead
+                of a scan of every narrative)
+        """
+        only = "" if text_id is None else "id = ? AND"
+        cursor.execute(
+            f"""
+            DELETE FROM incident_texts
+            WHERE {only} NOT EXISTS (
+                SELECT 1 FROM analysis_records WHERE text_id = incident_texts.id
+            )
+            AND NOT EXISTS (
+                SELECT 1 FROM bookmark_records WHERE text_id = incident_texts.id
+            )
+        """,
+            () if text_id is None else (text_id,),
+        )
+
+    def _init_ioc_index(self, cursor):
+        """
+        Create the incident_iocs index table and its maintenance trigger.
+
+        IOCs are extracted once per analysis at save time; the primary key
+        serves per-analysis lookups and idx_iocs_value serves pivots on a
+        value. Rows saved before the index existed are picked up by
+        backfill_iocs, which resumes from ioc_backfill_state.
+        """
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS incident_iocs (
+                analysis_id INTEGER NOT NULL,
+                kind TEXT NOT NULL,  -- url, email, ipv4, domain, hash, registry
+                value TEXT NOT NULL,  -- lowercased
+                PRIMARY KEY (analysis_id, kind, value)
+            ) WITHOUT ROWID
+        """
+        )
+        cursor.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_iocs_value
+            ON incident_iocs(value, kind)
+        """
+        )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS ioc_backfill_state (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                last_analysis_id INTEGER NOT NULL
+            )
+        """
+        )
+        cursor.execute(
+            "INSERT OR IGNORE INTO ioc_backfill_state (id, last_analysis_id) "
+            "VALUES (1, 0)"
+        )
+        cursor.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_records_ioc_delete
+            AFTER DELETE ON analysis_records
+            BEGIN
+                DELETE FROM incident_iocs WHERE analysis_id = OLD.id;
+            END
+        """
+        )
+
+    def _index_iocs(self, cursor, analysis_id: int, text: str):
+        """
+        Store the IOCs found in text for one analysis.
+
+        Also moves the backfill watermark past analysis_id when it already
+        covers every earlier analysis, so backfill_iocs never rescans rows
+        indexed at save time, while rows of a legacy database that still
+        await the backfill are never skipped.
+        """
+        cursor.executemany(
+            """
+            INSERT OR IGNORE INTO incident_iocs (analysis_id, kind, value)
+            VALUES (?, ?, ?)
+        """,
+            [(analysis_id, kind, value) for kind, value in extract_iocs(text)],
+        )
+        cursor.execute(
+            """
+            UPDATE ioc_backfill_state SET last_analysis_id = :id
+            WHERE last_analysis_id < :id
+              AND last_analysis_id >= (
+                  SELECT COALESCE(MAX(id), 0) FROM analysis_records WHERE id < :id
+              )
+        """,
+            {"id": analysis_id},
+        )
+
+    def _init_embeddings(self, cursor):
+        """
+        Create the incident_embeddings table and its maintenance trigger.
+
+        Vectors are keyed by incident_texts id, so each distinct narrative
+        is embedded once no matter how often it is re-analysed, and they go
+        away with the text when it is pruned. Each row records the model
+        that produced it (see embeddings.embedding_model_id); rows from
+        databases created before that have a NULL model and are treated as
+        stale, so they get re-encoded like any other model mismatch.
+        """
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS incident_embeddings (
+                text_id INTEGER PRIMARY KEY,
+                dim INTEGER NOT NULL,
+                vector BLOB NOT NULL,  -- float16, little-endian
+                model TEXT,
+                FOREIGN KEY (text_id) REFERENCES incident_texts(id)
+            )
+        """
+        )
+        cursor.execute("PRAGMA table_info(incident_embeddings)")
+        if "model" not in {row[1] for row in cursor.fetchall()}:
+            cursor.execute("ALTER TABLE incident_embeddings ADD COLUMN model TEXT")
+        cursor.execute("DROP INDEX IF EXISTS idx_embeddings_dim")
+        cursor.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_embeddings_model
+            ON incident_embeddings(model, text_id)
+        """
+        )
+        cursor.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_texts_embedding_delete
+            AFTER DELETE ON incident_texts
+            BEGIN
+                DELETE FROM incident_embeddings WHERE text_id = OLD.id;
+            END
+        """
+        )
+
+    def _init_text_search(self, cursor):
+        """
+        Create the incident_texts_fts full-text index used by hybrid_search.
+
+        An external-content FTS5 table over incident_texts, so each distinct
+        narrative is tokenized once; texts are immutable, so insert and
+        delete triggers keep it in sync. SQLite builds without FTS5 leave
+        fts_available False and hybrid_search ranks by vectors only.
+        """
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'incident_texts_fts'"
+        )
+        exists = cursor.fetchone() is not None
+        try:
+            cursor.execute(
+                """
+                CREATE VIRTUAL TABLE IF NOT EXISTS incident_texts_fts
+                USING fts5(text, content='incident_texts', content_rowid='id')
+            """
+            )
+        except sqlite3.OperationalError:
+            self.fts_available = False
+            return
+        self.fts_available = True
+
+        cursor.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_texts_fts_insert
+            AFTER INSERT ON incident_texts
+            BEGIN
+                INSERT INTO incident_texts_fts (rowid, text)
+                VALUES (NEW.id, NEW.text);
+            END
+        """
+        )
+        cursor.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_texts_fts_delete
+            AFTER DELETE ON incident_texts
+            BEGIN
+                INSERT INTO incident_texts_fts (incident_texts_fts, rowid, text)
+                VALUES ('delete', OLD.id, OLD.text);
+            END
+        """
+        )
+        # Index narratives stored before the index existed
+        if not exists:
+            cursor.execute(
+                "INSERT INTO incident_texts_fts (incident_texts_fts) VALUES ('rebuild')"
+            )
+
+    def _store_embedding(self, cursor, text_id: int, vector: Any, model: str):
+        """Store a text's embedding unless it already has one from model."""
+        import numpy as np
+
+        vector = np.asarray(vector, dtype="<f2").ravel()
+        cursor.execute(
+            """
+            INSERT INTO incident_embeddings (text_id, dim, vector, model)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT (text_id) DO UPDATE
+            SET dim = excluded.dim, vector = excluded.vector, model = excluded.model
+            WHERE model IS NOT excluded.model
+        """,
+            (text_id, len(vector), vector.tobytes(), model),
+        )
+
+    def _init_config_version(self, cursor):
+        """
+        Create the config_version counter and the triggers that bump it.
+
+        Any insert, update or delete on the settings, profile or feature-flag
+        tables increments the counter, so a cached copy of those tables can be
+        validated with a single-row read, including writes made by other
+        processes.
+        """
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS config_version (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                version INTEGER NOT NULL
+            )
+        """
+        )
+        cursor.execute(
+            "INSERT OR IGNORE INTO config_version (id, version) VALUES (1, 0)"
+        )
+
+        for table in CONFIG_TABLES:
+            for event in ("INSERT", "UPDATE", "DELETE"):
+                cursor.execute(
+                    f"""
+                    CREATE TRIGGER IF NOT EXISTS
+                    trg_config_version_{table}_{event.lower()}
+                    AFTER {event} ON {table}
+                    BEGIN
+                        UPDATE config_version SET version = version + 1
+                        WHERE id = 1;
+                    END
+                """
+                )
+
+    def _init_rollups(self, cursor):
+        """
+        Create rollup tables and the triggers that keep them in sync.
+
+        Rollups hold per-day/per-label/per-mode counts and confidence
+        statistics plus a per-label confidence histogram, so dashboards and
+        search facets read a handful of summary rows instead of scanning
+        analysis_history. Triggers maintain them on every insert, update and
+        delete; existing databases are backfilled on first open.
+        """
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS analysis_daily_rollup (
+                day TEXT NOT NULL,  -- YYYY-MM-DD prefix of timestamp
+                final_label TEXT NOT NULL,
+                analysis_mode TEXT NOT NULL,  -- '' when mode is NULL
+                incident_count INTEGER NOT NULL,
+                llm_count INTEGER NOT NULL,
+                prob_sum REAL NOT NULL,
+                prob_min REAL,
+                prob_max REAL,
+                first_seen TEXT,
+                last_seen TEXT,
+                PRIMARY KEY (day, final_label, analysis_mode)
+            )
+        """
+        )
+
+        cursor.execute(
             """
+            CREATE TABLE IF NOT EXISTS analysis_confidence_histogram (
+                bucket INTEGER NOT NULL,  -- 0..CONFIDENCE_HISTOGRAM_BINS-1
+                final_label TEXT NOT NULL,
+                incident_count INTEGER NOT NULL,
+                PRIMARY KEY (bucket, final_label)
             )
+        """
+        )
+
+        cursor.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_history_rollup_insert
+            AFTER INSERT ON analysis_records
+            BEGIN
+                {_rollup_apply_sql("NEW")}
+            END
+        """
+        )
+
+        self._create_rollup_delete_trigger(cursor)
+
+        cursor.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_history_rollup_update
+            AFTER UPDATE OF timestamp, final_label, max_prob, analysis_mode, use_llm
+            ON analysis_records
+            BEGIN
+                {_rollup_retract_sql("OLD")}
+                {_rollup_apply_sql("NEW")}
+            END
+        """
+        )
+
+        # Backfill databases created before rollups existed
+        cursor.execute("SELECT 1 FROM analysis_daily_rollup LIMIT 1")
+        if cursor.fetchone() is None:
+            cursor.execute("SELECT 1 FROM analysis_records LIMIT 1")
+            if cursor.fetchone() is not None:
+                self._rebuild_rollups(cursor)
+
+    def _create_rollup_delete_trigger(self, cursor):
+        """Create the trigger retracting deleted analysis_records rows."""
+        cursor.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_history_rollup_delete
+            AFTER DELETE ON analysis_records
+            BEGIN
+                {_rollup_retract_sql("OLD")}
+            END
+        """
+        )
+
+    def _delete_records_in_range(self, cursor, start: str, end: str) -> int:
+        """
+        Delete analyses with start <= timestamp < end, rebuilding rollups once.
+
+        The per-row retract trigger re-reads each group's min/max whenever
+        the deleted row is an extreme, which a bulk delete in timestamp
+        order hits on every row. Instead, the trigger is dropped for the
+        delete (inside the caller's transaction, so it is never missing for
+        other connections), the histogram is decremented by the range's
+        counts, and the daily rows of the days touched are recomputed from
+        what remains.
+
+        Returns:
+            Number of analyses deleted
+        """
+        first_day, last_day = start[:10], end[:10]
+        days = "timestamp >= ? AND timestamp < date(?, '+1 day')"
+
+        cursor.execute("DROP TRIGGER main.trg_history_rollup_delete")
+        cursor.execute(
+            f"""
+            UPDATE main.analysis_confidence_histogram AS c
+            SET incident_count = c.incident_count - removed.n
+            FROM (
+                SELECT {_bucket_sql("max_prob")} AS bucket, final_label,
+                       COUNT(*) AS n
+                FROM main.analysis_records
+                WHERE timestamp >= ? AND timestamp < ?
+                GROUP BY 1, 2
+            ) AS removed
+            WHERE c.bucket = removed.bucket AND c.final_label = removed.final_label
+        """,
+            (start, end),
+        )
+        cursor.execute(
+            "DELETE FROM main.analysis_confidence_histogram WHERE incident_count <= 0"
+        )
+        cursor.execute(
+            "DELETE FROM main.analysis_records WHERE timestamp >= ? AND timestamp < ?",
+            (start, end),
+        )
+        deleted = cursor.rowcount
+
+        cursor.execute(
+            "DELETE FROM main.analysis_daily_rollup WHERE day >= ? AND day <= ?",
+            (first_day, last_day),
+        )
+        cursor.execute(
+            f"""
+            INSERT INTO main.analysis_daily_rollup
+            (day, final_label, analysis_mode, incident_count, llm_count,
+             prob_sum, prob_min, prob_max, first_seen, last_seen)
+            SELECT substr(timestamp, 1, 10), final_label,
+                   COALESCE(analysis_mode, ''), COUNT(*),
+                   SUM(COALESCE(use_llm, 0) != 0), SUM(max_prob),
+                   MIN(max_prob), MAX(max_prob), MIN(timestamp), MAX(timestamp)
+            FROM main.analysis_records
+            WHERE {days}
+            GROUP BY 1, 2, 3
+        """,
+            (first_day, last_day),
+        )
+        self._create_rollup_delete_trigger(cursor)
+        return deleted
+
+    def _rebuild_rollups(self, cursor):
+        """Recompute all rollup rows from analysis_records."""
+        cursor.execute("DELETE FROM analysis_daily_rollup")
+        cursor.execute("DELETE FROM analysis_confidence_histogram")
+
+        cursor.execute(
+            """
+            INSERT INTO analysis_daily_rollup
+            (day, final_label, analysis_mode, incident_count, llm_count,
+             prob_sum, prob_min, prob_max, first_seen, last_seen)
+            SELECT substr(timestamp, 1, 10), final_label,
+                   COALESCE(analysis_mode, ''), COUNT(*),
+                   SUM(COALESCE(use_llm, 0) != 0), SUM(max_prob),
+                   MIN(max_prob), MAX(max_prob), MIN(timestamp), MAX(timestamp)
+            FROM analysis_records
+            GROUP BY 1, 2, 3
+        """
+        )
+
+        cursor.execute(
+            f"""
+            INSERT INTO analysis_confidence_histogram
+            (bucket, final_label, incident_count)
+            SELECT {_bucket_sql("max_prob")}, final_label, COUNT(*)
+            FROM analysis_records
+            GROUP BY 1, 2
+        """
+        )
+
+    def rebuild_rollups(self):
+        """
+        Rebuild rollup tables from scratch.
+
+        Only needed if analysis_history was modified with triggers disabled
+        (e.g. by an external tool); normal writes keep rollups current.
+        """
+        with self.get_connection() as conn:
+            self._rebuild_rollups(conn.cursor())
 
     # Analysis History Methods
 
@@ -231,32 +1411,41 @@ class TriageDatabase:
         use_llm: bool = False,
         raw_result: Optional[Dict[str, Any]] = None,
         batch_id: Optional[str] = None,
+        embedding: Optional[Any] = None,
+        embedding_model: Optional[str] = None,
     ) -> int:
         """
         Save analysis result to history.
 
         Args:
             batch_id: Optional UUID for batch analyses
+            embedding: Optional normalized embedding of incident_text, kept
+                for similarity search (ignored if the text already has one
+                from the same model)
+            embedding_model: Model id of embedding (default: the configured
+                embedder, see embeddings.embedding_model_id)
 
         Returns:
-            Analysis ID
+            Analysis ID, or a Future resolving to it in write-behind mode.
+            The Future can be passed straight to the tag/note/bookmark methods.
         """
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-
-            timestamp = datetime.now().isoformat()
-            raw_result_json = json.dumps(raw_result) if raw_result else None
+        timestamp = datetime.now().isoformat()
+        raw_result_json = _raw_result_json(raw_result)
+        if embedding is not None:
+            embedding_model = _embedding_model(embedding_model)
 
+        def op(cursor, resolve):
+            text_id = self._intern_text(cursor, incident_text)
             cursor.execute(
                 """
-                INSERT INTO analysis_history 
-                (timestamp, incident_text, final_label, max_prob, uncertainty_level,
+                INSERT INTO analysis_records 
+                (timestamp, text_id, final_label, max_prob, uncertainty_level,
                  analysis_mode, difficulty, threshold, use_llm, raw_result, batch_id)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
                 (
                     timestamp,
-                    incident_text,
+                    text_id,
                     final_label,
                     max_prob,
                     uncertainty_level,
@@ -268,8 +1457,13 @@ class TriageDatabase:
                     batch_id,
                 ),
             )
+            analysis_id = cursor.lastrowid
+            self._index_iocs(cursor, analysis_id, incident_text)
+            if embedding is not None:
+                self._store_embedding(cursor, text_id, embedding, embedding_model)
+            return analysis_id
 
-            return cursor.lastrowid
+        return self._write(op)
 
     def save_batch_analysis(
         self,
@@ -279,6 +1473,8 @@ class TriageDatabase:
         results: List[Dict[str, Any]],
         use_preprocessing: bool = False,
         use_llm: bool = False,
+        embeddings: Optional[List[Any]] = None,
+        embedding_model: Optional[str] = None,
     ) -> int:
         """
         Save batch analysis metadata and all incidents.
@@ -290,13 +1486,17 @@ class TriageDatabase:
             results: List of analysis results
             use_preprocessing: Whether preprocessing was enabled
             use_llm: Whether LLM was enabled
+            embeddings: Optional embeddings aligned with results; None
+                entries are skipped
+            embedding_model: Model id of embeddings (see save_analysis)
 
         Returns:
-            Batch record ID
+            Batch record ID, or a Future resolving to it in write-behind mode
         """
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
+        if embeddings is not None:
+            embedding_model = _embedding_model(embedding_model)
 
+        def op(cursor, resolve):
             timestamp = datetime.now().isoformat()
             total_incidents = len(results)
 
@@ -347,20 +1547,21 @@ class TriageDatabase:
 
             # Save all incidents in the same connection (avoid nested connections)
             saved_ids = []
-            for result in results:
+            for i, result in enumerate(results):
                 incident_timestamp = datetime.now().isoformat()
-                raw_result_json = json.dumps(result)
+                raw_result_json = _raw_result_json(result)
+                text_id = self._intern_text(cursor, result.get("incident_text", ""))
 
                 cursor.execute(
                     """
-                    INSERT INTO analysis_history 
-                    (timestamp, incident_text, final_label, max_prob, uncertainty_level,
+                    INSERT INTO analysis_records 
+                    (timestamp, text_id, final_label, max_prob, uncertainty_level,
                      analysis_mode, difficulty, threshold, use_llm, raw_result, batch_id)
                     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
                     (
                         incident_timestamp,
-                        result.get("incident_text", ""),
+                        text_id,
                         result.get("final_label", "unknown"),
                         result.get("max_prob", 0.0),
                         None,  # uncertainty_level
@@ -373,9 +1574,19 @@ class TriageDatabase:
                     ),
                 )
                 saved_ids.append(cursor.lastrowid)
+                self._index_iocs(
+                    cursor, cursor.lastrowid, result.get("incident_text", "")
+                )
+                if embeddings is not None and embeddings[i] is not None:
+                    self._store_embedding(
+                        cursor, text_id, embeddings[i], embedding_model
+                    )
 
             return batch_record_id
 
+        return self._write(op)
+
+    @_cached_query
     def get_batch_history(self, limit: int = 50) -> List[Dict[str, Any]]:
         """
         Get list of all batch analyses.
@@ -406,6 +1617,7 @@ class TriageDatabase:
 
             return results
 
+    @_cached_query
     def get_batch_by_id(self, batch_id: str) -> Optional[Dict[str, Any]]:
         """
         Get batch metadata by batch_id.
@@ -429,6 +1641,7 @@ class TriageDatabase:
                 return record
             return None
 
+    @_cached_query
     def get_batch_incidents(self, batch_id: str) -> List[Dict[str, Any]]:
         """
         Get all incidents from a specific batch.
@@ -455,6 +1668,9 @@ class TriageDatabase:
                 # Parse JSON raw_result
                 if record.get("raw_result"):
                     record["raw_result"] = json.loads(record["raw_result"])
+                    record["raw_result"].setdefault(
+                        "incident_text", record["incident_text"]
+                    )
                 results.append(record)
 
             return results
@@ -471,15 +1687,13 @@ class TriageDatabase:
         """
         Update an existing analysis record (e.g., when re-running with LLM).
         """
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-
-            timestamp = datetime.now().isoformat()
-            raw_result_json = json.dumps(raw_result) if raw_result else None
+        timestamp = datetime.now().isoformat()
+        raw_result_json = _raw_result_json(raw_result)
 
+        def op(cursor, resolve):
             cursor.execute(
                 """
-                UPDATE analysis_history
+                UPDATE analysis_records
                 SET timestamp = ?, final_label = ?, max_prob = ?, 
                     uncertainty_level = ?, use_llm = ?, raw_result = ?
                 WHERE id = ?
@@ -491,10 +1705,13 @@ class TriageDatabase:
                     uncertainty_level,
                     int(use_llm),
                     raw_result_json,
-                    analysis_id,
+                    resolve(analysis_id),
                 ),
             )
 
+        self._write(op)
+
+    @_cached_query
     def get_analysis_history(
         self,
         limit: int = 100,
@@ -549,12 +1766,20 @@ class TriageDatabase:
         with self.get_connection() as conn:
             cursor = conn.cursor()
 
+            # Empty rollups first so the history delete triggers find no
+            # group rows to maintain
+            cursor.execute("DELETE FROM analysis_daily_rollup")
+            cursor.execute("DELETE FROM analysis_confidence_histogram")
+
             # Delete in proper order to respect foreign key constraints
+            cursor.execute("DELETE FROM incident_iocs")
+            cursor.execute("DELETE FROM incident_embeddings")
             cursor.execute("DELETE FROM analysis_tags")
             cursor.execute("DELETE FROM notes")
-            cursor.execute("DELETE FROM bookmarks")
+            cursor.execute("DELETE FROM bookmark_records")
             cursor.execute("DELETE FROM tags")
-            cursor.execute("DELETE FROM analysis_history")
+            cursor.execute("DELETE FROM analysis_records")
+            cursor.execute("DELETE FROM incident_texts")
             cursor.execute("DELETE FROM batch_analyses")
 
     def search_history(
@@ -577,6 +1802,7 @@ class TriageDatabase:
             rows = cursor.fetchall()
             return [dict(row) for row in rows]
 
+    @_cached_query
     def advanced_search(
         self,
         search_term: str = "",
@@ -587,6 +1813,7 @@ class TriageDatabase:
         max_confidence: Optional[float] = None,
         tag_ids: Optional[List[int]] = None,
         limit: int = 100,
+        include_archives: bool = False,
     ) -> List[Dict[str, Any]]:
         """
         Advanced search across analysis history with multiple filters.
@@ -600,56 +1827,81 @@ class TriageDatabase:
             max_confidence: Maximum confidence threshold (0.0-1.0)
             tag_ids: List of tag IDs to filter by
             limit: Maximum results to return
+            include_archives: Also search monthly archives written by
+                archive_history (only months overlapping the date range)
         """
+        query = "SELECT DISTINCT ah.* FROM analysis_history ah"
+        params = []
+        conditions = []
+
+        # Join with tags if filtering by tags
+        if tag_ids:
+            query += " LEFT JOIN analysis_tags at ON ah.id = at.analysis_id"
+            conditions.append(f"at.tag_id IN ({','.join(['?'] * len(tag_ids))})")
+            params.extend(tag_ids)
+
+        # Text search
+        if search_term:
+            conditions.append("ah.incident_text LIKE ?")
+            params.append(f"%{search_term}%")
+
+        # Date range
+        if start_date:
+            conditions.append("ah.timestamp >= ?")
+            params.append(start_date)
+        if end_date:
+            conditions.append("ah.timestamp <= ?")
+            params.append(end_date)
+
+        # Label filter
+        if label_filter:
+            conditions.append("ah.final_label = ?")
+            params.append(label_filter)
+
+        # Confidence range
+        if min_confidence is not None:
+            conditions.append("ah.max_prob >= ?")
+            params.append(min_confidence)
+        if max_confidence is not None:
+            conditions.append("ah.max_prob <= ?")
+            params.append(max_confidence)
+
+        # Build WHERE clause
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+
+        query += " ORDER BY ah.timestamp DESC LIMIT ?"
+        params.append(limit)
+
         with self.get_connection() as conn:
             cursor = conn.cursor()
+            cursor.execute(query, params)
+            results = [dict(row) for row in cursor.fetchall()]
 
-            query = "SELECT DISTINCT ah.* FROM analysis_history ah"
-            params = []
-            conditions = []
-
-            # Join with tags if filtering by tags
-            if tag_ids:
-                query += " LEFT JOIN analysis_tags at ON ah.id = at.analysis_id"
-                conditions.append(f"at.tag_id IN ({','.join(['?'] * len(tag_ids))})")
-                params.extend(tag_ids)
-
-            # Text search
-            if search_term:
-                conditions.append("ah.incident_text LIKE ?")
-                params.append(f"%{search_term}%")
-
-            # Date range
-            if start_date:
-                conditions.append("ah.timestamp >= ?")
-                params.append(start_date)
-            if end_date:
-                conditions.append("ah.timestamp <= ?")
-                params.append(end_date)
-
-            # Label filter
-            if label_filter:
-                conditions.append("ah.final_label = ?")
-                params.append(label_filter)
-
-            # Confidence range
-            if min_confidence is not None:
-                conditions.append("ah.max_prob >= ?")
-                params.append(min_confidence)
-            if max_confidence is not None:
-                conditions.append("ah.max_prob <= ?")
-                params.append(max_confidence)
-
-            # Build WHERE clause
-            if conditions:
-                query += " WHERE " + " AND ".join(conditions)
+        if not include_archives:
+            return results
 
-            query += " ORDER BY ah.timestamp DESC LIMIT ?"
-            params.append(limit)
+        for archive in self.list_archives():
+            month = archive["month"]
+            if (start_date and month < start_date[:7]) or (
+                end_date and month > end_date[:7]
+            ):
+                continue
+            # Archives are visited newest first; stop once a whole month is
+            # older than everything already in the top `limit`
+            if len(results) >= limit and month < results[-1]["timestamp"][:7]:
+                break
+
+            archive_conn = self._connect_archive(archive["path"])
+            try:
+                cursor = archive_conn.execute(query, params)
+                results.extend(dict(row) for row in cursor.fetchall())
+            finally:
+                archive_conn.close()
+            results.sort(key=lambda r: r["timestamp"], reverse=True)
+            del results[limit:]
 
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
+        return results
 
     def search_bookmarks(
         self, search_term: str, limit: int = 100
@@ -700,20 +1952,27 @@ class TriageDatabase:
         note: Optional[str] = None,
         analysis_id: Optional[int] = None,
     ) -> int:
-        """Add a bookmark."""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
+        """
+        Add a bookmark.
+
+        Returns:
+            Bookmark ID, or a Future resolving to it in write-behind mode
+        """
 
+        def op(cursor, resolve):
+            text_id = self._intern_text(cursor, incident_text)
             cursor.execute(
                 """
-                INSERT INTO bookmarks (analysis_id, incident_text, final_label, note)
+                INSERT INTO bookmark_records (analysis_id, text_id, final_label, note)
                 VALUES (?, ?, ?, ?)
             """,
-                (analysis_id, incident_text, final_label, note),
+                (resolve(analysis_id), text_id, final_label, note),
             )
-
             return cursor.lastrowid
 
+        return self._write(op)
+
+    @_cached_query
     def get_bookmarks(self, limit: int = 100) -> List[Dict[str, Any]]:
         """Get all bookmarks."""
         with self.get_connection() as conn:
@@ -733,18 +1992,30 @@ class TriageDatabase:
 
     def delete_bookmark(self, bookmark_id: int):
         """Delete a bookmark."""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM bookmarks WHERE id = ?", (bookmark_id,))
+
+        def op(cursor, resolve):
+            row_id = resolve(bookmark_id)
+            cursor.execute(
+                "SELECT text_id FROM bookmark_records WHERE id = ?", (row_id,)
+            )
+            row = cursor.fetchone()
+            cursor.execute("DELETE FROM bookmark_records WHERE id = ?", (row_id,))
+            if row is not None and row[0] is not None:
+                self._prune_incident_texts(cursor, row[0])
+
+        return self._write(op)
 
     def update_bookmark_note(self, bookmark_id: int, note: str):
         """Update the note for a bookmark."""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
+
+        def op(cursor, resolve):
             cursor.execute(
-                "UPDATE bookmarks SET note = ? WHERE id = ?", (note, bookmark_id)
+                "UPDATE bookmark_records SET note = ? WHERE id = ?",
+                (note, resolve(bookmark_id)),
             )
 
+        return self._write(op)
+
     # Tag Methods
 
     def create_tag(self, name: str, color: Optional[str] = None) -> int:
@@ -799,44 +2070,49 @@ class TriageDatabase:
 
     def add_tag_to_analysis(self, analysis_id: int, tag_id: int):
         """Associate a tag with an analysis."""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
 
+        def op(cursor, resolve):
             try:
                 cursor.execute(
                     """
                     INSERT INTO analysis_tags (analysis_id, tag_id)
                     VALUES (?, ?)
                 """,
-                    (analysis_id, tag_id),
+                    (resolve(analysis_id), tag_id),
                 )
             except sqlite3.IntegrityError:
                 pass  # Tag already associated
 
+        self._write(op)
+
     def remove_tag_from_analysis(self, analysis_id: int, tag_id: int):
         """Remove a tag from an analysis."""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
+
+        def op(cursor, resolve):
             cursor.execute(
                 """
                 DELETE FROM analysis_tags 
                 WHERE analysis_id = ? AND tag_id = ?
             """,
-                (analysis_id, tag_id),
+                (resolve(analysis_id), tag_id),
             )
 
+        self._write(op)
+
     def remove_all_tags_from_analysis(self, analysis_id: int):
         """Remove all tags from an analysis."""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
+
+        def op(cursor, resolve):
             cursor.execute(
                 """
                 DELETE FROM analysis_tags 
                 WHERE analysis_id = ?
             """,
-                (analysis_id,),
+                (resolve(analysis_id),),
             )
 
+        self._write(op)
+
     def get_tags_for_analysis(self, analysis_id: int) -> List[Dict[str, Any]]:
         """Get tags for a specific analysis."""
         with self.get_connection() as conn:
@@ -854,6 +2130,43 @@ class TriageDatabase:
             rows = cursor.fetchall()
             return [dict(row) for row in rows]
 
+    def get_tags_for_analyses(
+        self, analysis_ids: List[int]
+    ) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Get tags for many analyses in a single query.
+
+        Args:
+            analysis_ids: Analysis IDs to look up
+
+        Returns:
+            Mapping of analysis ID to its tags; every requested ID is present
+        """
+        tags: Dict[int, List[Dict[str, Any]]] = {aid: [] for aid in analysis_ids}
+        if not tags:
+            return tags
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+
+            # json_each keeps this one bound parameter however many IDs are
+            # passed, so long pages never hit SQLite's variable limit
+            cursor.execute(
+                """
+                SELECT at.analysis_id, t.* FROM analysis_tags at
+                JOIN tags t ON t.id = at.tag_id
+                WHERE at.analysis_id IN (SELECT value FROM json_each(?))
+                ORDER BY at.analysis_id, t.name
+            """,
+                (json.dumps(list(tags)),),
+            )
+
+            for row in cursor.fetchall():
+                tag = dict(row)
+                tags[tag.pop("analysis_id")].append(tag)
+
+            return tags
+
     # Notes Methods
 
     def add_note(
@@ -862,20 +2175,25 @@ class TriageDatabase:
         analysis_id: Optional[int] = None,
         author: Optional[str] = None,
     ) -> int:
-        """Add a note, optionally linked to an analysis."""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
+        """
+        Add a note, optionally linked to an analysis.
+
+        Returns:
+            Note ID, or a Future resolving to it in write-behind mode
+        """
 
+        def op(cursor, resolve):
             cursor.execute(
                 """
                 INSERT INTO notes (analysis_id, note_text, author)
                 VALUES (?, ?, ?)
             """,
-                (analysis_id, note_text, author),
+                (resolve(analysis_id), note_text, author),
             )
-
             return cursor.lastrowid
 
+        return self._write(op)
+
     def get_notes_for_analysis(self, analysis_id: int) -> List[Dict[str, Any]]:
         """Get notes for a specific analysis."""
         with self.get_connection() as conn:
@@ -893,42 +2211,1227 @@ class TriageDatabase:
             rows = cursor.fetchall()
             return [dict(row) for row in rows]
 
+    def get_notes_for_analyses(
+        self, analysis_ids: List[int]
+    ) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Get notes for many analyses in a single query.
+
+        Args:
+            analysis_ids: Analysis IDs to look up
+
+        Returns:
+            Mapping of analysis ID to its notes (newest first); every
+            requested ID is present
+        """
+        notes: Dict[int, List[Dict[str, Any]]] = {aid: [] for aid in analysis_ids}
+        if not notes:
+            return notes
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute(
+                """
+                SELECT * FROM notes
+                WHERE analysis_id IN (SELECT value FROM json_each(?))
+                ORDER BY analysis_id, created_at DESC
+            """,
+                (json.dumps(list(notes)),),
+            )
+
+            for row in cursor.fetchall():
+                notes[row["analysis_id"]].append(dict(row))
+
+            return notes
+
     def update_note(self, note_id: int, note_text: str):
         """Update an existing note."""
+
+        def op(cursor, resolve):
+            cursor.execute(
+                """
+                UPDATE notes
+                SET note_text = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            """,
+                (note_text, resolve(note_id)),
+            )
+
+        self._write(op)
+
+    def get_all_notes(self, limit: int = 1000) -> List[Dict[str, Any]]:
+        """Get all notes across all analyses."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute(
+                """
+                SELECT * FROM notes
+                ORDER BY created_at DESC
+                LIMIT ?
+            """,
+                (limit,),
+            )
+
+            rows = cursor.fetchall()
+            return [dict(row) for row in rows]
+
+    # Streaming and Count Methods
+
+    def _iter_rows(
+        self, query: str, params: Any = (), chunk_size: int = 500
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield query rows as dicts, fetching chunk_size rows at a time."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield dict(row)
+
+    def iter_analysis_history(
+        self,
+        label_filter: Optional[str] = None,
+        mode_filter: Optional[str] = None,
+        since_id: Optional[int] = None,
+        chunk_size: int = 500,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream analysis history in id order without materializing it.
+
+        Args:
+            label_filter: Specific label to filter by
+            mode_filter: Specific analysis mode to filter by
+            since_id: Only yield records with id greater than this
+            chunk_size: Rows fetched per round-trip
+        """
+        query = "SELECT * FROM analysis_history WHERE 1=1"
+        params: List[Any] = []
+
+        if label_filter:
+            query += " AND final_label = ?"
+            params.append(label_filter)
+
+        if mode_filter:
+            query += " AND analysis_mode = ?"
+            params.append(mode_filter)
+
+        if since_id is not None:
+            query += " AND id > ?"
+            params.append(since_id)
+
+        query += " ORDER BY id"
+
+        return self._iter_rows(query, params, chunk_size)
+
+    def iter_bookmarks(self, chunk_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """Stream all bookmarks, newest first."""
+        return self._iter_rows(
+            "SELECT * FROM bookmarks ORDER BY created_at DESC", (), chunk_size
+        )
+
+    def iter_notes(self, chunk_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """Stream all notes, newest first."""
+        return self._iter_rows(
+            "SELECT * FROM notes ORDER BY created_at DESC", (), chunk_size
+        )
+
+    def count_bookmarks(self, with_note: bool = False) -> int:
+        """
+        Count bookmarks.
+
+        Args:
+            with_note: Only count bookmarks that carry a non-empty note
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+
+            query = "SELECT COUNT(*) FROM bookmark_records"
+            if with_note:
+                query += " WHERE note IS NOT NULL AND note != ''"
+
+            cursor.execute(query)
+            return cursor.fetchone()[0]
+
+    def count_notes(self, analysis_id: Optional[int] = None) -> int:
+        """
+        Count analyst notes.
+
+        Args:
+            analysis_id: Only count notes attached to this analysis
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+
+            if analysis_id is None:
+                cursor.execute("SELECT COUNT(*) FROM notes")
+            else:
+                cursor.execute(
+                    "SELECT COUNT(*) FROM notes WHERE analysis_id = ?", (analysis_id,)
+                )
+            return cursor.fetchone()[0]
+
+    # Columnar Export Methods
+
+    def export_columnar(
+        self,
+        path: str,
+        filters: Optional[Dict[str, Any]] = None,
+        since_id: Optional[int] = None,
+        columns: Optional[List[str]] = None,
+        format: str = "parquet",
+        chunk_size: int = 50000,
+    ) -> Dict[str, Any]:
+        """
+        Export analysis history to a day-partitioned Parquet or Arrow dataset.
+
+        Rows are read in id order in chunks of chunk_size, each chunk on its
+        own short connection so the export never holds a long read lock, and
+        written as ``day=YYYY-MM-DD/part-<first id>-<n>.<ext>`` files. The
+        highest exported id is stored in ``_watermark.json`` under path, and
+        later calls without since_id append only newer rows.
+
+        Args:
+            path: Output directory for the dataset
+            filters: Optional ``final_label``, ``analysis_mode``,
+                ``start_date`` and ``end_date`` filters
+            since_id: Export rows with id greater than this (defaults to the
+                stored watermark, or everything on first export)
+            columns: analysis_history columns to export (defaults to all);
+                ``id`` is always included
+            format: "parquet" or "arrow" (Arrow IPC files)
+            chunk_size: Rows read and written per chunk
+
+        Returns:
+            Dict with rows exported, the new watermark and files written
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.dataset as pa_dataset
+        except ImportError as e:
+            raise ImportError(
+                "Columnar export requires pyarrow: pip install pyarrow"
+            ) from e
+
+        if format not in ("parquet", "arrow"):
+            raise ValueError("format must be 'parquet' or 'arrow'")
+
+        columns = list(columns or EXPORT_COLUMN_TYPES)
+        unknown = set(columns) - set(EXPORT_COLUMN_TYPES)
+        if unknown:
+            raise ValueError(f"Unknown columns: {', '.join(sorted(unknown))}")
+        if "id" not in columns:
+            columns.insert(0, "id")
+
+        out_dir = Path(path)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        watermark_path = out_dir / "_watermark.json"
+        if since_id is None and watermark_path.exists():
+            since_id = json.loads(watermark_path.read_text())["max_id"]
+        watermark = since_id or 0
+
+        filters = filters or {}
+        where = "WHERE id > ?"
+        filter_params: List[Any] = []
+        if filters.get("final_label"):
+            where += " AND final_label = ?"
+            filter_params.append(filters["final_label"])
+        if filters.get("analysis_mode"):
+            where += " AND analysis_mode = ?"
+            filter_params.append(filters["analysis_mode"])
+        if filters.get("start_date"):
+            where += " AND timestamp >= ?"
+            filter_params.append(filters["start_date"])
+        if filters.get("end_date"):
+            where += " AND timestamp <= ?"
+            filter_params.append(filters["end_date"])
+
+        query = f"""
+            SELECT {', '.join(columns)}, substr(timestamp, 1, 10) AS day
+            FROM analysis_history
+            {where}
+            ORDER BY id
+            LIMIT ?
+        """
+        schema = pa.schema(
+            [(name, EXPORT_COLUMN_TYPES[name]) for name in columns]
+            + [("day", "string")]
+        )
+        extension = "parquet" if format == "parquet" else "arrow"
+        file_format = "parquet" if format == "parquet" else "ipc"
+
+        rows_exported = 0
+        files: List[str] = []
+        while True:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(query, [watermark, *filter_params, chunk_size])
+                rows = cursor.fetchall()
+            if not rows:
+                break
+
+            table = pa.Table.from_pydict(
+                {
+                    name: [row[idx] for row in rows]
+                    for idx, name in enumerate(schema.names)
+                },
+                schema=schema,
+            )
+            pa_dataset.write_dataset(
+                table,
+                out_dir,
+                format=file_format,
+                partitioning=["day"],
+                partitioning_flavor="hive",
+                basename_template=f"part-{rows[0]['id']}-{{i}}.{extension}",
+                existing_data_behavior="overwrite_or_ignore",
+                file_visitor=lambda written: files.append(written.path),
+            )
+
+            rows_exported += len(rows)
+            watermark = rows[-1]["id"]
+            if len(rows) < chunk_size:
+                break
+
+        # Written last so an interrupted export is re-run from the previous
+        # watermark; part files are named by first id, so the re-run
+        # overwrites partial output instead of duplicating it
+        tmp_path = watermark_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({"max_id": watermark}))
+        tmp_path.replace(watermark_path)
+
+        return {"rows": rows_exported, "max_id": watermark, "files": files}
+
+    # IOC Index Methods
+
+    def backfill_iocs(self, batch_size: int = 1000) -> int:
+        """
+        Index IOCs for analyses saved before the IOC index existed.
+
+        Works through analysis_records in id order, one short transaction
+        per batch, and records its progress so an interrupted run resumes
+        where it stopped. Re-indexing an analysis is harmless. Analyses
+        saved since the index existed are already covered, so this only
+        needs to run once per legacy database (scripts/backfill_iocs.py).
+
+        Args:
+            batch_size: Analyses processed per transaction
+
+        Returns:
+            Number of analyses scanned
+        """
+        scanned = 0
+        while True:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT last_analysis_id FROM ioc_backfill_state")
+                last_id = cursor.fetchone()[0]
+                cursor.execute(
+                    """
+                    SELECT id, incident_text FROM analysis_history
+                    WHERE id > ?
+                    ORDER BY id
+                    LIMIT ?
+                """,
+                    (last_id, batch_size),
+                )
+                rows = cursor.fetchall()
+                if not rows:
+                    return scanned
+
+                for row in rows:
+                    self._index_iocs(cursor, row["id"], row["incident_text"])
+                cursor.execute(
+                    "UPDATE ioc_backfill_state SET last_analysis_id = ? "
+                    "WHERE last_analysis_id < ?",
+                    (rows[-1]["id"], rows[-1]["id"]),
+                )
+            scanned += len(rows)
+
+    def count_ioc_backfill_pending(self) -> int:
+        """Analyses that backfill_iocs has yet to scan."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT COUNT(*) FROM analysis_records
+                WHERE id > (SELECT last_analysis_id FROM ioc_backfill_state)
+            """
+            )
+            return cursor.fetchone()[0]
+
+    def find_by_ioc(
+        self, value: str, kind: Optional[str] = None, limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """
+        Find analyses mentioning an IOC, newest first.
+
+        Args:
+            value: Indicator value (matched case-insensitively)
+            kind: Optional IOC kind (url, email, ipv4, domain, hash, registry)
+            limit: Maximum results to return
+
+        Returns:
+            List of analysis records
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+
+            query = """
+                SELECT ah.* FROM analysis_history ah
+                WHERE ah.id IN (
+                    SELECT analysis_id FROM incident_iocs WHERE value = ?
+            """
+            params: List[Any] = [value.lower()]
+            if kind:
+                query += " AND kind = ?"
+                params.append(kind)
+            query += ") ORDER BY ah.timestamp DESC LIMIT ?"
+            params.append(limit)
+
+            cursor.execute(query, params)
+            return [dict(row) for row in cursor.fetchall()]
+
+    def ioc_cooccurrence(
+        self, value: str, kind: Optional[str] = None, limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        """
+        List IOCs that appear in the same analyses as the given one.
+
+        Args:
+            value: Indicator value to pivot on (case-insensitive)
+            kind: Optional IOC kind of the pivot value
+            limit: Maximum co-occurring IOCs to return
+
+        Returns:
+            List of dicts with kind, value and count (shared analyses),
+            most frequent first
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+
+            query = """
+                SELECT o.kind, o.value, COUNT(DISTINCT o.analysis_id) AS count
+                FROM incident_iocs i
+                JOIN incident_iocs o ON o.analysis_id = i.analysis_id
+                WHERE i.value = ? AND o.value != i.value
+            """
+            params: List[Any] = [value.lower()]
+            if kind:
+                query += " AND i.kind = ?"
+                params.append(kind)
+            query += " GROUP BY o.kind, o.value ORDER BY count DESC, o.value LIMIT ?"
+            params.append(limit)
+
+            cursor.execute(query, params)
+            return [dict(row) for row in cursor.fetchall()]
+
+    def get_ioc_kind_counts(self) -> Dict[str, int]:
+        """
+        Count indexed IOCs per kind.
+
+        Returns:
+            Mapping of IOC kind to the number of (analysis, IOC) pairs
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT kind, COUNT(*) FROM incident_iocs GROUP BY kind")
+            return {row[0]: row[1] for row in cursor.fetchall()}
+
+    # Embedding Methods
+
+    def get_texts_without_embeddings(
+        self, limit: int = 1000, model: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get stored narratives that have no embedding from model yet.
+
+        Includes narratives embedded by a different model (or before models
+        were recorded): storing a new vector for them replaces the old one.
+
+        Args:
+            limit: Maximum narratives to return
+            model: Embedding model id (default: the configured embedder,
+                see embeddings.embedding_model_id)
+
+        Returns:
+            List of dicts with text_id and text, oldest first
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT t.id AS text_id, t.text
+                FROM incident_texts t
+                LEFT JOIN incident_embeddings e
+                  ON e.text_id = t.id AND e.model = ?
+                WHERE e.text_id IS NULL
+                ORDER BY t.id
+                LIMIT ?
+            """,
+                (_embedding_model(model), limit),
+            )
+            return [dict(row) for row in cursor.fetchall()]
+
+    def store_embeddings(
+        self, vectors: Dict[int, Any], model: Optional[str] = None
+    ) -> int:
+        """
+        Store embeddings for existing narratives.
+
+        Args:
+            vectors: Mapping of text_id to normalized embedding; texts that
+                already have one from model are left unchanged, those with
+                one from another model get the new one
+            model: Model id of vectors (default: the configured embedder)
+
+        Returns:
+            Number of embeddings stored
+        """
+        model = _embedding_model(model)
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            before = conn.total_changes
+            for text_id, vector in vectors.items():
+                self._store_embedding(cursor, text_id, vector, model)
+            return conn.total_changes - before
+
+    def load_embeddings(
+        self, cache_dir: Optional[str] = None, model: Optional[str] = None
+    ) -> tuple:
+        """
+        Load every embedding stored by a model as one contiguous float16 matrix.
+
+        The matrix lives in .npy files next to the database and is
+        memory-mapped read-only, so similarity search never re-encodes the
+        corpus and repeated loads cost no copy. Each model gets its own
+        files; vectors from other models are left out, as they live in a
+        different vector space (see get_texts_without_embeddings for
+        re-encoding them).
+
+        The files are allocated with spare rows: embeddings of narratives
+        stored since (which have higher text ids) are appended in place, so
+        the first search after a save reads and writes only the new rows.
+        Only when older rows change (pruning, re-encoding) or the spare rows
+        run out is a new generation of the files written, under unique
+        names, and published by atomically replacing the metadata file, so
+        a reader always maps an ids/vectors pair that belong together.
+
+        Args:
+            cache_dir: Directory for the .npy files
+                (defaults to 'embeddings' next to the database)
+            model: Embedding model id (default: the configured embedder,
+                see embeddings.embedding_model_id)
+
+        Returns:
+            Tuple of (text_ids, matrix): int64 ids and the (n, dim) float16
+            matrix whose rows follow text_ids
+        """
+        import numpy as np
+
+        model = _embedding_model(model)
+        directory = (
+            Path(cache_dir)
+            if cache_dir is not None
+            else Path(self.db_path).parent / "embeddings"
+        )
+        model_tag = hashlib.sha256(model.encode("utf-8")).hexdigest()[:12]
+        stem = f"{Path(self.db_path).stem}_{model_tag}"
+        meta_path = directory / f"{stem}_vectors.json"
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            meta = _read_embedding_meta(meta_path, model)
+            state = self._embedding_files_state(cursor, meta, model)
+            if state == "append":
+                # Appends write into the current files, so they are
+                # serialised across sessions and processes by the database
+                # write lock; re-check under it in case another one ran
+                cursor.execute("BEGIN IMMEDIATE")
+                meta = _read_embedding_meta(meta_path, model)
+                state = self._embedding_files_state(cursor, meta, model)
+                if state == "append":
+                    meta = self._append_embedding_rows(
+                        cursor, directory, stem, meta, model
+                    )
+                    _write_embedding_meta(meta_path, meta)
+                conn.commit()
+            if state == "rebuild":
+                meta = self._write_embedding_generation(
+                    cursor, directory, stem, model
+                )
+                if meta is not None:
+                    previous = _read_embedding_meta(meta_path, model)
+                    _write_embedding_meta(meta_path, meta)
+                    _remove_embedding_generations(
+                        directory,
+                        stem,
+                        keep={meta["generation"], (previous or {}).get("generation")},
+                    )
+
+        if meta is None:
+            return np.empty(0, dtype=np.int64), np.empty((0, 0), dtype="<f2")
+        ids_path, matrix_path = _embedding_paths(directory, stem, meta["generation"])
+        rows = meta["rows"]
+        return (
+            np.load(ids_path, mmap_mode="r")[:rows],
+            np.load(matrix_path, mmap_mode="r")[:rows],
+        )
+
+    def _embedding_files_state(
+        self, cursor, meta: Optional[Dict[str, Any]], model: str
+    ) -> str:
+        """
+        How the embedding files described by meta compare to the database.
+
+        Returns:
+            'fresh' if they hold every stored vector of model, 'append' if
+            only vectors with higher text ids were added since and fit in
+            the spare rows, else 'rebuild'
+        """
+        if meta is None:
+            return "rebuild"
+        # Index-only scans of idx_embeddings_model; vectors are not read
+        cursor.execute(
+            """
+            SELECT COUNT(*), COALESCE(SUM(text_id), 0) FROM incident_embeddings
+            WHERE model = ? AND text_id <= ?
+        """,
+            (model, meta["max"]),
+        )
+        if list(cursor.fetchone()) != [meta["count"], meta["sum"]]:
+            return "rebuild"
+        cursor.execute(
+            "SELECT COUNT(*) FROM incident_embeddings WHERE model = ? AND text_id > ?",
+            (model, meta["max"]),
+        )
+        added = cursor.fetchone()[0]
+        if not added:
+            return "fresh"
+        return "append" if meta["rows"] + added <= meta["capacity"] else "rebuild"
+
+    def _append_embedding_rows(
+        self, cursor, directory: Path, stem: str, meta: Dict[str, Any], model: str
+    ) -> Dict[str, Any]:
+        """Write vectors added since meta into the files' spare rows."""
+        import numpy as np
+
+        cursor.execute(
+            """
+            SELECT text_id, vector FROM incident_embeddings
+            WHERE model = ? AND text_id > ?
+            ORDER BY text_id
+        """,
+            (model, meta["max"]),
+        )
+        added = cursor.fetchall()
+        dim = meta["dim"]
+        # Rows are only ever written past meta["rows"], which readers
+        # never look at until the new metadata is published
+        rows = [r for r in added if len(r[1]) == dim * 2]
+        ids_path, matrix_path = _embedding_paths(directory, stem, meta["generation"])
+        start, end = meta["rows"], meta["rows"] + len(rows)
+        if rows:
+            ids = np.load(ids_path, mmap_mode="r+")
+            matrix = np.load(matrix_path, mmap_mode="r+")
+            ids[start:end] = [r[0] for r in rows]
+            matrix[start:end] = np.frombuffer(
+                b"".join(r[1] for r in rows), dtype="<f2"
+            ).reshape(len(rows), dim)
+            ids.flush()
+            matrix.flush()
+            del ids, matrix
+
+        return {
+            **meta,
+            "rows": end,
+            "count": meta["count"] + len(added),
+            "max": added[-1][0],
+            "sum": meta["sum"] + sum(r[0] for r in added),
+        }
+
+    def _write_embedding_generation(
+        self, cursor, directory: Path, stem: str, model: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Write every vector of model into a new generation of the files.
+
+        Returns:
+            Its metadata (unpublished), or None if model has no vectors
+        """
+        import numpy as np
+
+        cursor.execute(
+            """
+            SELECT COUNT(*), MAX(text_id), COALESCE(SUM(text_id), 0)
+            FROM incident_embeddings WHERE model = ?
+        """,
+            (model,),
+        )
+        count, max_id, id_sum = cursor.fetchone()
+        if not count:
+            return None
+        cursor.execute(
+            "SELECT dim FROM incident_embeddings WHERE model = ? AND text_id = ?",
+            (model, max_id),
+        )
+        dim = cursor.fetchone()[0]
+        capacity = max(EMBEDDING_MIN_CAPACITY, int(count * EMBEDDING_GROWTH))
+
+        generation = uuid.uuid4().hex[:12]
+        ids_path, matrix_path = _embedding_paths(directory, stem, generation)
+        directory.mkdir(parents=True, exist_ok=True)
+        ids = np.lib.format.open_memmap(
+            ids_path, mode="w+", dtype=np.int64, shape=(capacity,)
+        )
+        matrix = np.lib.format.open_memmap(
+            matrix_path, mode="w+", dtype="<f2", shape=(capacity, dim)
+        )
+        cursor.execute(
+            """
+            SELECT text_id, vector FROM incident_embeddings
+            WHERE model = ?
+            ORDER BY text_id
+        """,
+            (model,),
+        )
+        i = 0
+        while True:
+            rows = cursor.fetchmany(5000)
+            if not rows:
+                break
+            rows = [r for r in rows if len(r[1]) == dim * 2]
+            ids[i : i + len(rows)] = [r[0] for r in rows]
+            matrix[i : i + len(rows)] = np.frombuffer(
+                b"".join(r[1] for r in rows), dtype="<f2"
+            ).reshape(len(rows), dim)
+            i += len(rows)
+        ids.flush()
+        matrix.flush()
+        del ids, matrix
+
+        return {
+            "model": model,
+            "generation": generation,
+            "dim": dim,
+            "rows": i,
+            "capacity": capacity,
+            "count": count,
+            "max": max_id,
+            "sum": id_sum,
+        }
+
+    def get_analyses_for_texts(self, text_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Get the latest analysis of each of the given narratives.
+
+        Returns:
+            Dict mapping text_id to its most recent analysis_history row
+        """
+        if not text_ids:
+            return {}
         with self.get_connection() as conn:
             cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT r.text_id, h.*
+                FROM analysis_history h
+                JOIN analysis_records r ON r.id = h.id
+                WHERE h.id IN (
+                    SELECT MAX(id) FROM analysis_records
+                    WHERE text_id IN (SELECT value FROM json_each(?))
+                    GROUP BY text_id
+                )
+            """,
+                (json.dumps([int(t) for t in text_ids]),),
+            )
+            analyses = {}
+            for row in cursor.fetchall():
+                record = dict(row)
+                analyses[record.pop("text_id")] = record
+            return analyses
+
+    # Hybrid Search Methods
+
+    def _record_filter_sql(self, filters: Optional[Dict[str, Any]]) -> tuple:
+        """
+        Build a WHERE clause over analysis_records (aliased r) from filters.
+
+        Returns:
+            Tuple of (condition or '', params)
+        """
+        columns = {
+            "start_date": "r.timestamp >= ?",
+            "end_date": "r.timestamp <= ?",
+            "label_filter": "r.final_label = ?",
+            "min_confidence": "r.max_prob >= ?",
+            "max_confidence": "r.max_prob <= ?",
+        }
+        unknown = set(filters or {}) - set(columns)
+        if unknown:
+            raise ValueError(f"Unknown search filters: {sorted(unknown)}")
+
+        conditions, params = [], []
+        for key, value in (filters or {}).items():
+            if value is not None and value != "":
+                conditions.append(columns[key])
+                params.append(value)
+        return " AND ".join(conditions), params
+
+    def _lexical_ranking(self, cursor, query: str, where: str, params: list, n: int):
+        """Text ids of the n best BM25 matches for query passing the filters."""
+        terms = re.findall(r"\w+", query.lower())
+        if not terms or not self.fts_available:
+            return []
+
+        # Quote every term so user input is never parsed as FTS5 syntax
+        sql = """
+            SELECT rowid FROM incident_texts_fts
+            WHERE incident_texts_fts MATCH ?
+        """
+        if where:
+            # A correlated EXISTS, not "rowid IN (...)": FTS5 re-runs the
+            # MATCH for every rowid in an IN list
+            sql += f"""
+                AND EXISTS (
+                    SELECT 1 FROM analysis_records r
+                    WHERE r.text_id = incident_texts_fts.rowid AND {where}
+                )
+            """
+        sql += " ORDER BY rank LIMIT ?"
+        cursor.execute(
+            sql, [" OR ".join(f'"{term}"' for term in terms), *params, n]
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+    def _semantic_ranking(
+        self,
+        cursor,
+        query_embedding: Any,
+        model: Optional[str],
+        where: str,
+        params: list,
+        n: int,
+    ):
+        """Text ids and cosine scores of the n nearest embeddings from model."""
+        import numpy as np
+
+        text_ids, matrix = self.load_embeddings(model=model)
+        query_embedding = np.asarray(query_embedding, dtype=np.float32).ravel()
+        if not len(text_ids) or matrix.shape[1] != len(query_embedding):
+            return [], []
+
+        if where:
+            cursor.execute(
+                f"SELECT DISTINCT text_id FROM analysis_records r WHERE {where}",
+                params,
+            )
+            allowed = np.fromiter((row[0] for row in cursor), dtype=np.int64)
+            rows = np.flatnonzero(np.isin(text_ids, allowed))
+            if not len(rows):
+                return [], []
+        else:
+            rows = None
+
+        # Gathering the allowed rows copies them out of the mapped files; it
+        # only pays off for selective filters, otherwise score every row
+        if rows is not None and len(rows) < len(text_ids) // 4:
+            candidates, text_ids = matrix[rows], text_ids[rows]
+            rows = None
+        else:
+            candidates = matrix
+
+        # Upcast the float16 matrix a cache-sized block at a time into one
+        # reused buffer, bounding memory and allocations
+        scores = np.empty(len(candidates), dtype=np.float32)
+        block = np.empty((min(4096, len(candidates)), matrix.shape[1]), np.float32)
+        for start in range(0, len(candidates), len(block)):
+            chunk = candidates[start : start + len(block)]
+            np.copyto(block[: len(chunk)], chunk)
+            np.dot(
+                block[: len(chunk)],
+                query_embedding,
+                out=scores[start : start + len(chunk)],
+            )
+        if rows is not None:
+            scores, text_ids = scores[rows], text_ids[rows]
+
+        n = min(n, len(scores))
+        best = np.argpartition(-scores, n - 1)[:n]
+        best = best[np.argsort(-scores[best])]
+        ids = text_ids[best]
+        return [int(i) for i in ids], [float(scores[i]) for i in best]
+
+    def hybrid_search(
+        self,
+        query: str,
+        filters: Optional[Dict[str, Any]] = None,
+        k: int = 20,
+        query_embedding: Optional[Any] = None,
+        candidates: int = 200,
+        rrf_k: int = 60,
+        embedding_model: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Rank analyses by combined keyword and semantic relevance.
+
+        BM25 over the FTS5 index and cosine similarity over the stored
+        embeddings (see load_embeddings) each rank the narratives that pass
+        the filters; the two rankings are merged with reciprocal rank
+        fusion. Filters are applied before scoring, never to the fused list.
+
+        Args:
+            query: Free-text query
+            filters: Optional filters named as in advanced_search:
+                start_date, end_date, label_filter, min_confidence,
+                max_confidence
+            k: Maximum results to return
+            query_embedding: Normalized embedding of query; without it only
+                the keyword ranking is used
+            candidates: Depth of each ranking before fusion
+            rrf_k: Reciprocal rank fusion constant
+            embedding_model: Model id of query_embedding (default: the
+                configured embedder); only stored vectors from the same
+                model are ranked
+
+        Returns:
+            Latest matching analysis per narrative, best first, with
+            hybrid_score, lexical_rank, semantic_rank and similarity_score
+            (rank/similarity are None when a side did not rank it)
+        """
+        where, params = self._record_filter_sql(filters)
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            lexical = self._lexical_ranking(cursor, query, where, params, candidates)
+            semantic, similarities = [], []
+            if query_embedding is not None:
+                semantic, similarities = self._semantic_ranking(
+                    cursor,
+                    query_embedding,
+                    embedding_model,
+                    where,
+                    params,
+                    candidates,
+                )
+
+            fused: Dict[int, Dict[str, Any]] = {}
+            for field, ranking in (
+                ("lexical_rank", lexical),
+                ("semantic_rank", semantic),
+            ):
+                for rank, text_id in enumerate(ranking, start=1):
+                    entry = fused.setdefault(
+                        text_id,
+                        {
+                            "hybrid_score": 0.0,
+                            "lexical_rank": None,
+                            "semantic_rank": None,
+                            "similarity_score": None,
+                        },
+                    )
+                    entry["hybrid_score"] += 1.0 / (rrf_k + rank)
+                    entry[field] = rank
+            for text_id, similarity in zip(semantic, similarities):
+                fused[text_id]["similarity_score"] = similarity
+
+            top = sorted(fused, key=lambda t: fused[t]["hybrid_score"], reverse=True)
+            top = top[:k]
+            if not top:
+                return []
+
+            # Report the newest analysis of each narrative that passes the filters
+            cursor.execute(
+                f"""
+                SELECT r.text_id, h.*
+                FROM analysis_history h
+                JOIN analysis_records r ON r.id = h.id
+                WHERE h.id IN (
+                    SELECT MAX(r.id) FROM analysis_records r
+                    WHERE r.text_id IN (SELECT value FROM json_each(?))
+                    {"AND " + where if where else ""}
+                    GROUP BY r.text_id
+                )
+            """,
+                [json.dumps(top), *params],
+            )
+            analyses = {}
+            for row in cursor.fetchall():
+                record = dict(row)
+                analyses[record.pop("text_id")] = record
+
+        return [
+            {**analyses[text_id], **fused[text_id]}
+            for text_id in top
+            if text_id in analyses
+        ]
+
+    # Archival Methods
+
+    def _archive_dir(self, archive_dir: Optional[str] = None) -> Path:
+        """Directory holding monthly archive databases."""
+        if archive_dir is not None:
+            return Path(archive_dir)
+        return Path(self.db_path).parent / "archive"
+
+    def _connect_archive(self, path: str) -> sqlite3.Connection:
+        """Open an archive database read-only."""
+        uri = f"file:{quote(str(Path(path).resolve()))}?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, timeout=30.0)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def list_archives(self, archive_dir: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        List monthly archive databases, newest month first.
+
+        Returns:
+            List of dicts with month ('YYYY-MM') and path
+        """
+        directory = self._archive_dir(archive_dir)
+        prefix = f"{Path(self.db_path).stem}_"
+        archives = [
+            {"month": path.stem[len(prefix) :], "path": str(path)}
+            for path in directory.glob(f"{prefix}????-??.db")
+        ]
+        return sorted(archives, key=lambda a: a["month"], reverse=True)
+
+    def archive_history(
+        self,
+        older_than_days: int = 180,
+        archive_dir: Optional[str] = None,
+        vacuum: bool = True,
+    ) -> Dict[str, int]:
+        """
+        Move old analysis history into monthly archive databases.
+
+        Rows older than the cutoff, together with their tag links and notes,
+        are copied into ``<db name>_YYYY-MM.db`` files and deleted from the
+        hot database in one transaction per month. Archives share the hot
+        schema, so advanced_search(include_archives=True) can query them
+        directly. Rollups follow the hot table, so dashboard totals cover
+        unarchived history only.
+
+        Args:
+            older_than_days: Archive analyses older than this many days
+            archive_dir: Archive directory (defaults to data/archive next to
+                the database)
+            vacuum: Return freed pages to the filesystem afterwards
+
+        Returns:
+            Mapping of archived month to number of analyses moved
+        """
+        cutoff = (datetime.now() - timedelta(days=older_than_days)).isoformat()
+        directory = self._archive_dir(archive_dir)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT DISTINCT substr(timestamp, 1, 7) FROM analysis_records
+                WHERE timestamp < ?
+                ORDER BY 1
+            """,
+                (cutoff,),
+            )
+            months = [row[0] for row in cursor.fetchall()]
+
+        moved = {}
+        for month in months:
+            month_start = datetime.strptime(f"{month}-01", "%Y-%m-%d")
+            next_month = (month_start + timedelta(days=32)).strftime("%Y-%m-01")
+            moved[month] = self._archive_range(
+                directory / f"{Path(self.db_path).stem}_{month}.db",
+                month_start.strftime("%Y-%m-%d"),
+                min(next_month, cutoff),
+            )
+
+        if vacuum and moved:
+            self.incremental_vacuum()
+        return moved
+
+    def _archive_range(self, path: Path, start: str, end: str) -> int:
+        """Move analyses with start <= timestamp < end into one archive file."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("ATTACH DATABASE ? AS archive", (str(path),))
+
+            # Archives are self-contained: history is stored flat, with the
+            # narrative inline, in the analysis_history view's column layout
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS archive.analysis_history AS
+                SELECT * FROM main.analysis_history WHERE 0
+            """
+            )
+            cursor.execute(
+                """
+                CREATE UNIQUE INDEX IF NOT EXISTS archive.idx_history_id
+                ON analysis_history(id)
+            """
+            )
+
+            # Mirror the hot schema so archives survive later migrations
+            for table in ("analysis_tags", "notes"):
+                cursor.execute(
+                    "SELECT sql FROM main.sqlite_master WHERE type = 'table' "
+                    "AND name = ?",
+                    (table,),
+                )
+                ddl = cursor.fetchone()[0]
+                cursor.execute(
+                    ddl.replace(
+                        f"CREATE TABLE {table}",
+                        f"CREATE TABLE IF NOT EXISTS archive.{table}",
+                        1,
+                    )
+                )
+            cursor.execute(
+                """
+                CREATE INDEX IF NOT EXISTS archive.idx_history_timestamp
+                ON analysis_history(timestamp)
+            """
+            )
+
+            in_range = """
+                analysis_id IN (
+                    SELECT id FROM main.analysis_records
+                    WHERE timestamp >= ? AND timestamp < ?
+                )
+            """
+            cursor.execute(
+                """
+                INSERT OR IGNORE INTO archive.analysis_history
+                SELECT * FROM main.analysis_history
+                WHERE timestamp >= ? AND timestamp < ?
+            """,
+                (start, end),
+            )
+            for table in ("analysis_tags", "notes"):
+                cursor.execute(
+                    f"INSERT OR IGNORE INTO archive.{table} "
+                    f"SELECT * FROM main.{table} WHERE {in_range}",
+                    (start, end),
+                )
+                cursor.execute(
+                    f"DELETE FROM main.{table} WHERE {in_range}", (start, end)
+                )
+            moved = self._delete_records_in_range(cursor, start, end)
+            self._prune_incident_texts(cursor)
+
+            conn.commit()
+            cursor.execute("DETACH DATABASE archive")
+            return moved
+
+    def incremental_vacuum(self, pages: int = 0):
+        """
+        Return free pages of the hot database to the filesystem.
+
+        Databases created before incremental auto-vacuum was enabled are
+        switched over with one full VACUUM; afterwards only free pages are
+        released, without rewriting the file.
+
+        Args:
+            pages: Maximum pages to release (0 releases all free pages)
+        """
+        conn = sqlite3.connect(self.db_path, timeout=30.0, isolation_level=None)
+        try:
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                conn.execute("VACUUM")
+            else:
+                conn.execute(f"PRAGMA incremental_vacuum({int(pages)})").fetchall()
+        finally:
+            conn.close()
+
+    def optimize(self):
+        """
+        Drop unreferenced incident texts, release free pages and refresh
+        query-planner statistics.
+        """
+        with self.get_connection() as conn:
+            self._prune_incident_texts(conn.cursor())
+        self.incremental_vacuum()
+        with self.get_connection() as conn:
+            conn.execute("PRAGMA optimize")
+
+    # Settings Methods
+
+    def _config(self) -> Dict[str, Any]:
+        """
+        Return cached settings, feature flags and active profile.
 
-            cursor.execute(
-                """
-                UPDATE notes
-                SET note_text = ?, updated_at = CURRENT_TIMESTAMP
-                WHERE id = ?
-            """,
-                (note_text, note_id),
-            )
+        The cache is trusted for config_cache_ttl seconds; after that one
+        single-row read of config_version decides whether to reload it.
+        """
+        cache = self._config_cache
+        generation = self._config_generation
+        now = time.monotonic()
+        if cache is not None and now - self._config_checked_at < self.config_cache_ttl:
+            return cache
 
-    def get_all_notes(self, limit: int = 1000) -> List[Dict[str, Any]]:
-        """Get all notes across all analyses."""
         with self.get_connection() as conn:
             cursor = conn.cursor()
 
-            cursor.execute(
+            cursor.execute("SELECT version FROM config_version WHERE id = 1")
+            version = cursor.fetchone()[0]
+            if cache is None or cache["version"] != version:
+                cursor.execute("SELECT key, value FROM user_settings")
+                settings = {row[0]: row[1] for row in cursor.fetchall()}
+
+                cursor.execute("SELECT flag_name, enabled FROM feature_flags")
+                flags = {row[0]: bool(row[1]) for row in cursor.fetchall()}
+
+                cursor.execute(
+                    """
+                    SELECT * FROM user_profiles WHERE is_active = 1 LIMIT 1
                 """
-                SELECT * FROM notes
-                ORDER BY created_at DESC
-                LIMIT ?
-            """,
-                (limit,),
-            )
+                )
+                row = cursor.fetchone()
 
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
+                cache = {
+                    "version": version,
+                    "settings": settings,
+                    "flags": flags,
+                    "active_profile": dict(row) if row else None,
+                }
+
+        # A write invalidated the cache while this read was in flight: its
+        # result may predate the write, so don't cache it
+        if generation == self._config_generation:
+            self._config_cache = cache
+            self._config_checked_at = now
+        return cache
+
+    def invalidate_config_cache(self):
+        """Drop cached settings/flags/profile so the next read reloads them."""
+        self._config_generation += 1
+        self._config_cache = None
 
-    # Settings Methods
+    @contextmanager
+    def _config_write(self):
+        """
+        Connection for a settings/flags/profile write.
+
+        The config cache is dropped after the write commits, not before:
+        otherwise a concurrent read in between could re-cache the old values
+        for the full TTL.
+        """
+        try:
+            with self.get_connection() as conn:
+                yield conn
+        finally:
+            self.invalidate_config_cache()
 
     def save_setting(self, key: str, value: Any):
         """Save a user setting."""
-        with self.get_connection() as conn:
+        with self._config_write() as conn:
             cursor = conn.cursor()
 
             value_json = json.dumps(value)
@@ -943,30 +3446,16 @@ class TriageDatabase:
 
     def get_setting(self, key: str, default: Any = None) -> Any:
         """Get a user setting."""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-
-            cursor.execute(
-                """
-                SELECT value FROM user_settings WHERE key = ?
-            """,
-                (key,),
-            )
-
-            row = cursor.fetchone()
-            if row:
-                return json.loads(row[0])
-            return default
+        # Values are cached as JSON text so callers always get a fresh copy
+        value_json = self._config()["settings"].get(key)
+        if value_json is not None:
+            return json.loads(value_json)
+        return default
 
     def get_all_settings(self) -> Dict[str, Any]:
         """Get all user settings."""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-
-            cursor.execute("SELECT key, value FROM user_settings")
-            rows = cursor.fetchall()
-
-            return {row[0]: json.loads(row[1]) for row in rows}
+        settings = self._config()["settings"]
+        return {key: json.loads(value) for key, value in settings.items()}
 
     # Profile Methods
 
@@ -983,7 +3472,7 @@ class TriageDatabase:
         preferences: Optional[Dict[str, Any]] = None,
     ) -> int:
         """Create a user profile."""
-        with self.get_connection() as conn:
+        with self._config_write() as conn:
             cursor = conn.cursor()
 
             # Merge role and email into preferences
@@ -1031,21 +3520,12 @@ class TriageDatabase:
 
     def get_active_profile(self) -> Optional[Dict[str, Any]]:
         """Get the currently active profile."""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-
-            cursor.execute(
-                """
-                SELECT * FROM user_profiles WHERE is_active = 1 LIMIT 1
-            """
-            )
-
-            row = cursor.fetchone()
-            return dict(row) if row else None
+        profile = self._config()["active_profile"]
+        return dict(profile) if profile else None
 
     def set_active_profile(self, profile_id: int):
         """Set a profile as active."""
-        with self.get_connection() as conn:
+        with self._config_write() as conn:
             cursor = conn.cursor()
 
             # Deactivate all profiles
@@ -1107,7 +3587,7 @@ class TriageDatabase:
         preferences: Optional[Dict[str, Any]] = None,
     ) -> bool:
         """Update an existing profile."""
-        with self.get_connection() as conn:
+        with self._config_write() as conn:
             cursor = conn.cursor()
 
             # Get current profile
@@ -1169,7 +3649,7 @@ class TriageDatabase:
 
     def delete_profile(self, profile_id: int) -> bool:
         """Delete a profile (cannot delete active profile)."""
-        with self.get_connection() as conn:
+        with self._config_write() as conn:
             cursor = conn.cursor()
 
             # Check if profile is active
@@ -1189,7 +3669,7 @@ class TriageDatabase:
 
     def set_setting(self, key: str, value: Any):
         """Set a user setting (creates or updates)."""
-        with self.get_connection() as conn:
+        with self._config_write() as conn:
             cursor = conn.cursor()
 
             value_json = json.dumps(value)
@@ -1206,7 +3686,7 @@ class TriageDatabase:
 
     def set_feature_flag(self, flag_name: str, enabled: bool, description: str = ""):
         """Set a feature flag."""
-        with self.get_connection() as conn:
+        with self._config_write() as conn:
             cursor = conn.cursor()
 
             cursor.execute(
@@ -1219,37 +3699,21 @@ class TriageDatabase:
 
     def is_feature_enabled(self, flag_name: str, default: bool = False) -> bool:
         """Check if a feature is enabled."""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-
-            cursor.execute(
-                """
-                SELECT enabled FROM feature_flags WHERE flag_name = ?
-            """,
-                (flag_name,),
-            )
-
-            row = cursor.fetchone()
-            if row:
-                return bool(row[0])
-            return default
+        return self._config()["flags"].get(flag_name, default)
 
     def get_all_feature_flags(self) -> Dict[str, bool]:
         """Get all feature flags."""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-
-            cursor.execute("SELECT flag_name, enabled FROM feature_flags")
-            rows = cursor.fetchall()
-
-            return {row[0]: bool(row[1]) for row in rows}
+        return dict(self._config()["flags"])
 
     # Search Helper Methods
 
+    @_cached_query
     def get_search_facets(self) -> Dict[str, Any]:
         """
         Get available filter options with counts for search UI.
 
+        Reads from the rollup tables, so cost does not grow with history size.
+
         Returns dictionary with:
         - classifications: List of (label, count) tuples
         - date_range: (earliest, latest) dates
@@ -1262,43 +3726,30 @@ class TriageDatabase:
             # Get classification counts
             cursor.execute(
                 """
-                SELECT final_label, COUNT(*) as count
-                FROM analysis_history
+                SELECT final_label, SUM(incident_count) as count
+                FROM analysis_daily_rollup
                 GROUP BY final_label
                 ORDER BY count DESC
             """
             )
             classifications = [(row[0], row[1]) for row in cursor.fetchall()]
 
-            # Get date range
+            # Get date range, confidence range and total count
             cursor.execute(
                 """
-                SELECT MIN(timestamp), MAX(timestamp)
-                FROM analysis_history
+                SELECT MIN(first_seen), MAX(last_seen),
+                       MIN(prob_min), MAX(prob_max),
+                       COALESCE(SUM(incident_count), 0)
+                FROM analysis_daily_rollup
             """
             )
-            date_row = cursor.fetchone()
-            date_range = (date_row[0], date_row[1]) if date_row else (None, None)
-
-            # Get confidence range
-            cursor.execute(
-                """
-                SELECT MIN(max_prob), MAX(max_prob)
-                FROM analysis_history
-            """
-            )
-            conf_row = cursor.fetchone()
-            confidence_range = (conf_row[0], conf_row[1]) if conf_row else (0.0, 1.0)
-
-            # Get total count
-            cursor.execute("SELECT COUNT(*) FROM analysis_history")
-            total_incidents = cursor.fetchone()[0]
+            row = cursor.fetchone()
 
             return {
                 "classifications": classifications,
-                "date_range": date_range,
-                "confidence_range": confidence_range,
-                "total_incidents": total_incidents,
+                "date_range": (row[0], row[1]),
+                "confidence_range": (row[2], row[3]),
+                "total_incidents": row[4],
             }
 
     def count_incidents(
@@ -1309,6 +3760,9 @@ class TriageDatabase:
         """
         Count incidents with optional filters.
 
+        Whole days are summed from the daily rollup; only the partial day at
+        the start of the window touches analysis_history (an indexed range).
+
         Args:
             classification: Filter by classification
             days: Only count incidents from last N days
@@ -1316,23 +3770,368 @@ class TriageDatabase:
         with self.get_connection() as conn:
             cursor = conn.cursor()
 
-            query = "SELECT COUNT(*) FROM analysis_history WHERE 1=1"
+            query = (
+                "SELECT COALESCE(SUM(incident_count), 0) "
+                "FROM analysis_daily_rollup WHERE 1=1"
+            )
             params = []
 
             if classification:
                 query += " AND final_label = ?"
                 params.append(classification)
 
+            if not days:
+                cursor.execute(query, params)
+                return cursor.fetchone()[0]
+
+            cutoff = datetime.now() - timedelta(days=days)
+            cutoff_day = cutoff.date().isoformat()
+            next_day = (cutoff.date() + timedelta(days=1)).isoformat()
+
+            query += " AND day > ?"
+            params.append(cutoff_day)
+            cursor.execute(query, params)
+            total = cursor.fetchone()[0]
+
+            # Partial first day straight from the indexed timestamp column
+            query = (
+                "SELECT COUNT(*) FROM analysis_records "
+                "WHERE timestamp >= ? AND timestamp < ?"
+            )
+            params = [cutoff.isoformat(), next_day]
+            if classification:
+                query += " AND final_label = ?"
+                params.append(classification)
+            cursor.execute(query, params)
+
+            return total + cursor.fetchone()[0]
+
+    # Rollup Query Methods
+
+    @_cached_query
+    def get_history_summary(self) -> Dict[str, Any]:
+        """
+        Get overall history statistics from the rollup tables.
+
+        Returns dictionary with:
+        - total_incidents: Total count
+        - llm_count: Analyses that used the LLM second opinion
+        - avg_confidence: Mean max_prob (0.0 when empty)
+        - confidence_range: (min, max) confidence
+        - date_range: (earliest, latest) timestamps
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute(
+                """
+                SELECT COALESCE(SUM(incident_count), 0),
+                       COALESCE(SUM(llm_count), 0),
+                       SUM(prob_sum),
+                       MIN(prob_min), MAX(prob_max),
+                       MIN(first_seen), MAX(last_seen)
+                FROM analysis_daily_rollup
+            """
+            )
+            row = cursor.fetchone()
+            total = row[0]
+
+            return {
+                "total_incidents": total,
+                "llm_count": row[1],
+                "avg_confidence": (row[2] / total) if total else 0.0,
+                "confidence_range": (row[3], row[4]),
+                "date_range": (row[5], row[6]),
+            }
+
+    def get_label_counts(
+        self,
+        days: Optional[int] = None,
+        mode_filter: Optional[str] = None,
+    ) -> List[tuple]:
+        """
+        Get (label, count) tuples ordered by count, from the daily rollup.
+
+        Args:
+            days: Only include the last N calendar days (including today)
+            mode_filter: Only include a specific analysis mode
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+
+            query = (
+                "SELECT final_label, SUM(incident_count) as count "
+                "FROM analysis_daily_rollup WHERE 1=1"
+            )
+            params = []
+
             if days:
-                from datetime import datetime, timedelta
+                start_day = (
+                    datetime.now().date() - timedelta(days=days - 1)
+                ).isoformat()
+                query += " AND day >= ?"
+                params.append(start_day)
+
+            if mode_filter:
+                query += " AND analysis_mode = ?"
+                params.append(mode_filter)
 
-                cutoff = (datetime.now() - timedelta(days=days)).isoformat()
-                query += " AND timestamp >= ?"
-                params.append(cutoff)
+            query += " GROUP BY final_label ORDER BY count DESC"
 
             cursor.execute(query, params)
-            return cursor.fetchone()[0]
+            return [(row[0], row[1]) for row in cursor.fetchall()]
+
+    def get_daily_label_counts(
+        self,
+        days: int = 30,
+        label_filter: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get per-day, per-label counts and confidence stats from the rollup.
+
+        Args:
+            days: Number of calendar days to include (including today)
+            label_filter: Specific label to filter by
+
+        Returns:
+            List of dicts with day, final_label, count, llm_count,
+            avg_confidence, min_confidence and max_confidence, ordered by day
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+
+            start_day = (
+                datetime.now().date() - timedelta(days=days - 1)
+            ).isoformat()
+            query = """
+                SELECT day, final_label,
+                       SUM(incident_count) AS count,
+                       SUM(llm_count) AS llm_count,
+                       SUM(prob_sum) / SUM(incident_count) AS avg_confidence,
+                       MIN(prob_min) AS min_confidence,
+                       MAX(prob_max) AS max_confidence
+                FROM analysis_daily_rollup
+                WHERE day >= ?
+            """
+            params: List[Any] = [start_day]
+
+            if label_filter:
+                query += " AND final_label = ?"
+                params.append(label_filter)
+
+            query += " GROUP BY day, final_label ORDER BY day, final_label"
+
+            cursor.execute(query, params)
+            return [dict(row) for row in cursor.fetchall()]
+
+    @_cached_query
+    def get_confidence_histogram(
+        self, label_filter: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the confidence histogram maintained alongside analysis history.
+
+        Buckets are CONFIDENCE_HISTOGRAM_BINS equal-width slices of [0, 1];
+        a bucket covers lower <= max_prob < upper (the last one includes 1.0).
+
+        Args:
+            label_filter: Specific label to filter by
+
+        Returns:
+            List of dicts with final_label, bucket, lower, upper and count
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+
+            query = (
+                "SELECT final_label, bucket, incident_count "
+                "FROM analysis_confidence_histogram"
+            )
+            params = []
+
+            if label_filter:
+                query += " WHERE final_label = ?"
+                params.append(label_filter)
+
+            query += " ORDER BY final_label, bucket"
+
+            cursor.execute(query, params)
+            width = 1.0 / CONFIDENCE_HISTOGRAM_BINS
+            return [
+                {
+                    "final_label": row[0],
+                    "bucket": row[1],
+                    "lower": round(row[1] * width, 6),
+                    "upper": round((row[1] + 1) * width, 6),
+                    "count": row[2],
+                }
+                for row in cursor.fetchall()
+            ]
+
+    # Time-Window Aggregation Methods
+
+    def get_window_stats(
+        self,
+        windows: Dict[str, timedelta],
+        label_filter: Optional[str] = None,
+        mode_filter: Optional[str] = None,
+        now: Optional[datetime] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Count incidents and summarize confidence over trailing time windows.
+
+        All windows are evaluated in a single indexed range scan covering the
+        largest one, so the cost depends on the window size, not history size.
+
+        Args:
+            windows: Mapping of window name to look-back span,
+                e.g. {"24h": timedelta(hours=24), "7d": timedelta(days=7)}
+            label_filter: Specific label to filter by
+            mode_filter: Specific analysis mode to filter by
+            now: End of every window (defaults to datetime.now())
+
+        Returns:
+            Mapping of window name to dict with count, llm_count and
+            avg_confidence
+        """
+        if not windows:
+            return {}
+
+        now = now or datetime.now()
+        names = list(windows)
+        cutoffs = [(now - windows[name]).isoformat() for name in names]
+
+        columns = []
+        params: List[Any] = []
+        for cutoff in cutoffs:
+            columns.append(
+                "COALESCE(SUM(timestamp > ?), 0), "
+                "COALESCE(SUM(timestamp > ? AND COALESCE(use_llm, 0) != 0), 0), "
+                "AVG(CASE WHEN timestamp > ? THEN max_prob END)"
+            )
+            params.extend([cutoff, cutoff, cutoff])
+
+        query = (
+            f"SELECT {', '.join(columns)} FROM analysis_records "
+            "WHERE timestamp > ? AND timestamp <= ?"
+        )
+        params.extend([min(cutoffs), now.isoformat()])
+
+        if label_filter:
+            query += " AND final_label = ?"
+            params.append(label_filter)
+
+        if mode_filter:
+            query += " AND analysis_mode = ?"
+            params.append(mode_filter)
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            row = cursor.fetchone()
+
+        return {
+            name: {
+                "count": row[idx * 3],
+                "llm_count": row[idx * 3 + 1],
+                "avg_confidence": row[idx * 3 + 2] or 0.0,
+            }
+            for idx, name in enumerate(names)
+        }
+
+    def get_time_buckets(
+        self,
+        granularity: str = "day",
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        label_filter: Optional[str] = None,
+        mode_filter: Optional[str] = None,
+        group_by: Optional[str] = None,
+        rolling: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get time-bucketed incident counts and confidence statistics.
+
+        Aggregation runs in SQL over the indexed timestamp column; only one
+        row per bucket (and group) is returned.
+
+        Args:
+            granularity: 'hour', 'day' or 'week'
+            start: Only include incidents after this time
+            end: Only include incidents up to this time (defaults to now)
+            label_filter: Specific label to filter by
+            mode_filter: Specific analysis mode to filter by
+            group_by: Optional 'label' or 'mode' to split each bucket
+            rolling: If True, buckets are consecutive spans counted back from
+                `end` (bucket 0 is the most recent) instead of calendar
+                hours/days/ISO weeks
+
+        Returns:
+            List of dicts with bucket, count, llm_count, avg_confidence,
+            min_confidence, max_confidence (plus final_label or
+            analysis_mode when grouped), ordered by bucket
+        """
+        if granularity not in TIME_BUCKET_SPANS:
+            raise ValueError(
+                f"Unknown granularity '{granularity}'. "
+                f"Expected one of: {', '.join(TIME_BUCKET_SPANS)}"
+            )
+        group_columns = {"label": "final_label", "mode": "analysis_mode"}
+        if group_by is not None and group_by not in group_columns:
+            raise ValueError("group_by must be None, 'label' or 'mode'")
+
+        end = end or datetime.now()
+        params: List[Any] = []
+
+        if rolling:
+            span_days = TIME_BUCKET_SPANS[granularity].total_seconds() / 86400
+            bucket_expr = "CAST((julianday(?) - julianday(timestamp)) / ? AS INTEGER)"
+            params.extend([end.isoformat(), span_days])
+        else:
+            bucket_expr = {
+                "hour": "substr(timestamp, 1, 13)",
+                "day": "substr(timestamp, 1, 10)",
+                "week": "date(substr(timestamp, 1, 10), '-6 days', 'weekday 1')",
+            }[granularity]
+
+        select = [f"{bucket_expr} AS bucket"]
+        group = ["bucket"]
+        if group_by:
+            select.append(group_columns[group_by])
+            group.append(group_columns[group_by])
+        select.append(
+            "COUNT(*) AS count, "
+            "SUM(COALESCE(use_llm, 0) != 0) AS llm_count, "
+            "AVG(max_prob) AS avg_confidence, "
+            "MIN(max_prob) AS min_confidence, "
+            "MAX(max_prob) AS max_confidence"
+        )
+
+        query = f"SELECT {', '.join(select)} FROM analysis_records WHERE timestamp <= ?"
+        params.append(end.isoformat())
+
+        if start is not None:
+            query += " AND timestamp > ?"
+            params.append(start.isoformat())
+
+        if label_filter:
+            query += " AND final_label = ?"
+            params.append(label_filter)
+
+        if mode_filter:
+            query += " AND analysis_mode = ?"
+            params.append(mode_filter)
+
+        # Rolling buckets count back from `end`; present oldest first
+        order = ["bucket DESC" if rolling else "bucket"] + group[1:]
+        query += f" GROUP BY {', '.join(group)} ORDER BY {', '.join(order)}"
 
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            return [dict(row) for row in cursor.fetchall()]
+
+    @_cached_query
     def get_recent_incidents(
         self, limit: int = 10, classification: Optional[str] = None
     ) -> List[Dict[str, Any]]:
@@ -1354,54 +4153,152 @@ class TriageDatabase:
             rows = cursor.fetchall()
             return [dict(row) for row in rows]
 
+    def _validate_select(self, sql_query: str):
+        """Reject anything other than a plain SELECT statement."""
+        import re
+
+        # Remove SQL comments (both -- and /* */ style) before validation
+        # Remove single-line comments (-- ...)
+        query_no_comments = re.sub(r"--[^\n]*", "", sql_query)
+        # Remove multi-line comments (/* ... */)
+        query_no_comments = re.sub(r"/\*.*?\*/", "", query_no_comments, flags=re.DOTALL)
+
+        query_upper = query_no_comments.strip().upper()
+        if not query_upper.startswith("SELECT"):
+            raise ValueError("Only SELECT queries are allowed in read-only mode")
+
+        # Prevent dangerous operations - use word boundaries to avoid false
+        # positives like "CREATE" in "created_at" or "UPDATE" in "updated_at"
+        dangerous_keywords = [
+            "DROP",
+            "DELETE",
+            "UPDATE",
+            "INSERT",
+            "ALTER",
+            "CREATE",
+            "TRUNCATE",
+            "EXEC",
+            "EXECUTE",
+        ]
+        for keyword in dangerous_keywords:
+            pattern = r"\b" + keyword + r"\b"
+            if re.search(pattern, query_upper):
+                raise ValueError(f"Query contains forbidden keyword: {keyword}")
+
+    def _run_readonly_query(
+        self, sql_query: str, max_rows: int, timeout: float
+    ) -> tuple[List[str], List[List[Any]], bool]:
+        """
+        Run a SELECT on a read-only connection under row and time budgets.
+
+        The connection is opened with mode=ro and query_only, so it can never
+        take the write lock. Rows are streamed with fetchmany and stored
+        column-wise; a progress handler aborts the statement once the
+        wall-clock budget is spent.
+
+        Returns:
+            Tuple of (column names, one value list per column, truncated flag)
+
+        Raises:
+            TimeoutError: If the query runs longer than timeout seconds
+        """
+        self._validate_select(sql_query)
+
+        uri = f"file:{quote(str(Path(self.db_path).resolve()))}?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, timeout=timeout)
+        deadline = time.monotonic() + timeout
+        conn.set_progress_handler(lambda: time.monotonic() > deadline, 10000)
+        try:
+            conn.execute("PRAGMA query_only = 1")
+            cursor = conn.cursor()
+            try:
+                cursor.execute(sql_query)
+                column_names = (
+                    [description[0] for description in cursor.description]
+                    if cursor.description
+                    else []
+                )
+                columns: List[List[Any]] = [[] for _ in column_names]
+                fetched = 0
+                truncated = False
+                while True:
+                    rows = cursor.fetchmany(min(1000, max_rows + 1 - fetched))
+                    if not rows:
+                        break
+                    if fetched + len(rows) > max_rows:
+                        rows = rows[: max_rows - fetched]
+                        truncated = True
+                    for idx, values in enumerate(columns):
+                        values.extend(row[idx] for row in rows)
+                    fetched += len(rows)
+                    if truncated:
+                        break
+            except sqlite3.OperationalError as e:
+                if "interrupted" in str(e) and time.monotonic() > deadline:
+                    raise TimeoutError(
+                        f"Query exceeded the {timeout:g}s time budget"
+                    ) from e
+                raise
+        finally:
+            conn.close()
+
+        return column_names, columns, truncated
+
+    def query_dataframe(
+        self, sql_query: str, max_rows: int = 10000, timeout: float = 5.0
+    ):
+        """
+        Execute a power-user SELECT and return the result as a DataFrame.
+
+        Runs on a read-only connection with a row cap and a wall-clock
+        budget, so a careless query cannot lock writers or exhaust memory.
+
+        Args:
+            sql_query: The SELECT query to execute
+            max_rows: Maximum rows returned; extra rows are discarded
+            timeout: Seconds the query may run before it is aborted
+
+        Returns:
+            pandas DataFrame; ``df.attrs["truncated"]`` is True when the
+            row cap was hit
+        """
+        import pandas as pd
+
+        column_names, columns, truncated = self._run_readonly_query(
+            sql_query, max_rows, timeout
+        )
+        # Build by position so duplicate column names (joins) survive
+        df = pd.DataFrame(dict(enumerate(columns)), columns=range(len(columns)))
+        df.columns = column_names
+        df.attrs["truncated"] = truncated
+        return df
+
     def execute_custom_query(
-        self, sql_query: str, read_only: bool = True
+        self,
+        sql_query: str,
+        read_only: bool = True,
+        max_rows: int = 10000,
+        timeout: float = 5.0,
     ) -> tuple[List[Dict[str, Any]], List[str]]:
         """
         Execute a custom SQL query (for power users).
 
         Args:
             sql_query: The SQL query to execute
-            read_only: If True, only SELECT queries are allowed
+            read_only: If True, only SELECT queries are allowed and they run
+                on a read-only connection under max_rows/timeout budgets
+            max_rows: Row cap for read-only queries
+            timeout: Wall-clock budget in seconds for read-only queries
 
         Returns:
             Tuple of (results as list of dicts, column names)
         """
-        # Safety check - only allow SELECT queries in read-only mode
         if read_only:
-            import re
-
-            # Remove SQL comments (both -- and /* */ style) before validation
-            # Remove single-line comments (-- ...)
-            query_no_comments = re.sub(r"--[^\n]*", "", sql_query)
-            # Remove multi-line comments (/* ... */)
-            query_no_comments = re.sub(
-                r"/\*.*?\*/", "", query_no_comments, flags=re.DOTALL
-            )
-
-            query_upper = query_no_comments.strip().upper()
-            if not query_upper.startswith("SELECT"):
-                raise ValueError("Only SELECT queries are allowed in read-only mode")
-
-            # Prevent dangerous operations - use word boundaries to avoid false positives
-            # Check for these keywords as separate words, not within column names like "created_at"
-            dangerous_keywords = [
-                "DROP",
-                "DELETE",
-                "UPDATE",
-                "INSERT",
-                "ALTER",
-                "CREATE",
-                "TRUNCATE",
-                "EXEC",
-                "EXECUTE",
-            ]
-            for keyword in dangerous_keywords:
-                # Use word boundary regex to match keyword as a complete word
-                # This prevents matching "CREATE" in "created_at" or "UPDATE" in "updated_at"
-                pattern = r"\b" + keyword + r"\b"
-                if re.search(pattern, query_upper):
-                    raise ValueError(f"Query contains forbidden keyword: {keyword}")
+            column_names, columns, _ = self._run_readonly_query(
+                sql_query, max_rows, timeout
+            )
+            results = [dict(zip(column_names, row)) for row in zip(*columns)]
+            return results, column_names
 
         with self.get_connection() as conn:
             cursor = conn.cursor()
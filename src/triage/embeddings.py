@@ -11,22 +11,106 @@ Enables features like:
 
 from __future__ import annotations
 
+import importlib.util
 import os
+from pathlib import Path
 from typing import TYPE_CHECKING, List, Optional, Tuple
 import numpy as np
 
 if TYPE_CHECKING:
     from sentence_transformers import SentenceTransformer
-else:
-    try:
-        from sentence_transformers import SentenceTransformer  # type: ignore
-    except ImportError:
-        SentenceTransformer = None  # type: ignore
+
+    from .static_embeddings import StaticEmbeddings
+
+# sentence-transformers (and torch behind it) is imported when the model is
+# first loaded, not with this module, so importing the CLI or UI stays fast
 
 # Default model: all-MiniLM-L6-v2 (384 dims, 90MB, fast)
 DEFAULT_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
 EMBEDDING_MODEL = os.getenv("TRIAGE_EMBEDDING_MODEL", DEFAULT_EMBEDDING_MODEL)
 
+# Padded tokens per encode batch (batch size x longest text in the batch).
+# Texts are sorted by length first, so batches of short narratives grow
+# large while batches of long ones shrink instead of padding everything to
+# the longest text in the input.
+EMBED_TOKEN_BUDGET = int(os.getenv("TRIAGE_EMBED_TOKEN_BUDGET", "8192"))
+MAX_EMBED_BATCH_SIZE = 256
+
+# torch intra-op threads used for encoding (unset: torch's default)
+TORCH_THREADS = os.getenv("TRIAGE_TORCH_THREADS")
+
+# Inference backend for the embedding model (CPU-oriented alternatives to
+# fp32 PyTorch; check agreement with scripts/validate_embedding_backend.py):
+# - torch: fp32 PyTorch (reference)
+# - int8: PyTorch with dynamic int8 quantization of the Linear layers
+# - onnx: sentence-transformers ONNX Runtime export (needs optimum[onnxruntime])
+# - onnx-int8: the int8-quantized ONNX export shipped with the model
+# - openvino: sentence-transformers OpenVINO export (needs optimum[openvino])
+# - static: word vectors distilled from the model, mean-pooled (NumPy only;
+#   build with scripts/distill_static_embeddings.py)
+EMBEDDING_BACKENDS = ("torch", "int8", "onnx", "onnx-int8", "openvino", "static")
+EMBEDDING_BACKEND = os.getenv("TRIAGE_EMBEDDING_BACKEND", "torch")
+ONNX_INT8_FILE = os.getenv("TRIAGE_ONNX_INT8_FILE", "onnx/model_qint8_avx2.onnx")
+STATIC_EMBEDDINGS_PATH = os.getenv(
+    "TRIAGE_STATIC_EMBEDDINGS",
+    str(Path(__file__).resolve().parents[2] / "models" / "static_embeddings.npz"),
+)
+
+
+def _approx_tokens(text: str) -> int:
+    """Cheap word-piece count estimate used only for batching."""
+    # ~4 characters per word piece, plus [CLS]/[SEP]
+    return len(text) // 4 + 2
+
+
+def embedding_model_id(
+    model_name: Optional[str] = None, backend: Optional[str] = None
+) -> str:
+    """Identifier of the vector space a model + backend pair embeds into.
+
+    Stored embeddings are tagged with it, so vectors from different models
+    or backends (e.g. static word vectors vs the transformer) are never
+    compared with each other.
+
+    Args:
+        model_name: Embedding model (default: TRIAGE_EMBEDDING_MODEL)
+        backend: Inference backend (default: TRIAGE_EMBEDDING_BACKEND)
+    """
+    return f"{model_name or EMBEDDING_MODEL}@{backend or EMBEDDING_BACKEND}"
+
+
+def length_buckets(
+    lengths: List[int],
+    token_budget: int = EMBED_TOKEN_BUDGET,
+    max_batch_size: int = MAX_EMBED_BATCH_SIZE,
+) -> List[np.ndarray]:
+    """Group texts into length-sorted batches that fit a padded-token budget.
+
+    Args:
+        lengths: Token count of each text
+        token_budget: Maximum batch size x longest length per batch
+        max_batch_size: Upper bound on texts per batch
+
+    Returns:
+        List of index arrays into lengths, shortest texts first; every
+        index appears exactly once
+    """
+    order = np.argsort(np.asarray(lengths), kind="stable")
+    batches = []
+    start = 0
+    while start < len(order):
+        end = start + 1
+        # Sorted ascending, so the last text in a batch is its longest
+        while (
+            end < len(order)
+            and end - start < max_batch_size
+            and (end - start + 1) * lengths[order[end]] <= token_budget
+        ):
+            end += 1
+        batches.append(order[start:end])
+        start = end
+    return batches
+
 
 class IncidentEmbeddings:
     """Semantic embeddings for cybersecurity incidents.
@@ -43,40 +127,101 @@ class IncidentEmbeddings:
         >>> similar = embedder.find_similar(embed, corpus_embeddings, top_k=5)
     """
 
-    def __init__(self, model_name: Optional[str] = None):
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        num_threads: Optional[int] = None,
+        backend: Optional[str] = None,
+    ):
         """Initialize embedding model.
 
         Args:
             model_name: HuggingFace model name (default: all-MiniLM-L6-v2)
+            num_threads: torch intra-op threads for encoding (default:
+                TRIAGE_TORCH_THREADS, else torch's own default)
+            backend: One of EMBEDDING_BACKENDS (default:
+                TRIAGE_EMBEDDING_BACKEND, else torch)
+
+        Raises:
+            ValueError: If backend is not one of EMBEDDING_BACKENDS
         """
-        if SentenceTransformer is None:
+        backend = backend or EMBEDDING_BACKEND
+        if backend not in EMBEDDING_BACKENDS:
+            raise ValueError(
+                f"Unknown embedding backend {backend!r}; "
+                f"expected one of {', '.join(EMBEDDING_BACKENDS)}"
+            )
+
+        if (
+            backend != "static"
+            and importlib.util.find_spec("sentence_transformers") is None
+        ):
             raise RuntimeError(
                 "sentence-transformers not installed. "
                 "Install with: pip install sentence-transformers"
             )
 
         self.model_name = model_name or EMBEDDING_MODEL
-        self._model: Optional[SentenceTransformer] = None
+        if num_threads is None and TORCH_THREADS:
+            num_threads = int(TORCH_THREADS)
+        self.num_threads = num_threads
+        self.backend = backend
+        self._model: Optional[SentenceTransformer | StaticEmbeddings] = None
 
     @property
-    def model(self) -> "SentenceTransformer":
+    def model_id(self) -> str:
+        """Identifier of this embedder's vector space (see embedding_model_id)."""
+        return embedding_model_id(self.model_name, self.backend)
+
+    @property
+    def model(self) -> "SentenceTransformer | StaticEmbeddings":
         """Lazy-load the embedding model."""
-        if self._model is None:
-            self._model = SentenceTransformer(self.model_name)
+        if self._model is None and self.backend == "static":
+            from .static_embeddings import StaticEmbeddings
+
+            self._model = StaticEmbeddings.load(STATIC_EMBEDDINGS_PATH)
+        elif self._model is None:
+            from sentence_transformers import SentenceTransformer
+
+            if self.num_threads:
+                import torch
+
+                torch.set_num_threads(self.num_threads)
+
+            if self.backend in ("onnx", "onnx-int8", "openvino"):
+                runtime = "openvino" if self.backend == "openvino" else "onnx"
+                kwargs = {"backend": runtime}
+                if self.backend == "onnx-int8":
+                    kwargs["model_kwargs"] = {"file_name": ONNX_INT8_FILE}
+                self._model = SentenceTransformer(self.model_name, **kwargs)
+            elif self.backend == "int8":
+                import torch
+
+                model = SentenceTransformer(self.model_name, device="cpu")
+                self._model = torch.ao.quantization.quantize_dynamic(
+                    model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True
+                )
+            else:
+                self._model = SentenceTransformer(self.model_name)
         return self._model
 
     def encode(
         self,
         texts: str | List[str],
         normalize: bool = True,
-        batch_size: int = 32,
+        batch_size: Optional[int] = None,
+        token_budget: int = EMBED_TOKEN_BUDGET,
     ) -> np.ndarray:
         """Encode text(s) into semantic embeddings.
 
+        Texts are encoded in length-sorted batches sized to token_budget,
+        then returned in input order.
+
         Args:
             texts: Single text or list of texts
             normalize: L2 normalize for cosine similarity (recommended)
-            batch_size: Batch size for encoding
+            batch_size: Maximum texts per batch (default: MAX_EMBED_BATCH_SIZE)
+            token_budget: Padded tokens per batch
 
         Returns:
             Numpy array of shape (n_texts, embedding_dim)
@@ -84,13 +229,33 @@ class IncidentEmbeddings:
         if isinstance(texts, str):
             texts = [texts]
 
-        embeddings = self.model.encode(
-            texts,
-            batch_size=batch_size,
-            normalize_embeddings=normalize,
-            show_progress_bar=len(texts) > 100,
+        model = self.model
+        if self.backend == "static":
+            # Lookup and mean pooling: no padding, so no bucketing either
+            return model.encode(texts, normalize=normalize)
+        if len(texts) <= 1:
+            return model.encode(texts, normalize_embeddings=normalize)
+
+        # Texts longer than the model's window are truncated, so they cost
+        # no more than max_seq_length each
+        max_len = getattr(model, "max_seq_length", None) or 512
+        lengths = [min(_approx_tokens(text), max_len) for text in texts]
+        batches = length_buckets(
+            lengths, token_budget, batch_size or MAX_EMBED_BATCH_SIZE
         )
 
+        embeddings = None
+        for indices in batches:
+            vectors = model.encode(
+                [texts[i] for i in indices],
+                batch_size=len(indices),
+                normalize_embeddings=normalize,
+                show_progress_bar=False,
+            )
+            if embeddings is None:
+                embeddings = np.empty((len(texts), vectors.shape[1]), vectors.dtype)
+            embeddings[indices] = vectors
+
         return embeddings
 
     def similarity(
@@ -197,4 +362,4 @@ def get_embedder() -> IncidentEmbeddings:
     return _embedder
 
 
-__all__ = ["IncidentEmbeddings", "get_embedder"]
+__all__ = ["IncidentEmbeddings", "embedding_model_id", "get_embedder"]
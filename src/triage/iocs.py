@@ -0,0 +1,62 @@
+"""
+Indicator-of-compromise (IOC) extraction for incident narratives.
+
+Deliberately lightweight (regex only, stdlib only) so it can run on every
+save in the database layer as well as in the LLM rationale guardrail.
+"""
+
+import re
+from typing import List, Tuple
+
+# Kind -> pattern. Values are lowercased after matching, so patterns only
+# need to describe the shape of each indicator.
+IOC_PATTERNS = {
+    "url": re.compile(r"https?://[^\s\"'<>]+", re.IGNORECASE),
+    "email": re.compile(r"\b[a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,}\b", re.IGNORECASE),
+    "ipv4": re.compile(r"\b(?:\d{1,3}\.){3}\d{1,3}\b"),
+    "domain": re.compile(
+        r"\b(?:[a-z0-9-]+\.)+(?:com|net|org|io|gov|edu|co|biz|info|cloud|xyz)\b",
+        re.IGNORECASE,
+    ),
+    "hash": re.compile(
+        r"\b(?:[a-f0-9]{64}|[a-f0-9]{40}|[a-f0-9]{32})\b", re.IGNORECASE
+    ),
+    "registry": re.compile(
+        r"\b(?:HKEY_[A-Z_]+|HK(?:LM|CU|CR|U|CC))(?:\\[^\s\"']+)*", re.IGNORECASE
+    ),
+}
+
+# Human-readable names used by the dashboard
+IOC_KIND_LABELS = {
+    "ipv4": "IP Addresses",
+    "domain": "Domain Names",
+    "hash": "File Hashes",
+    "email": "Email Addresses",
+    "url": "URLs",
+    "registry": "Registry Keys",
+}
+
+
+def extract_iocs(text: str) -> List[Tuple[str, str]]:
+    """
+    Extract IOCs from free text.
+
+    Args:
+        text: Incident narrative
+
+    Returns:
+        Sorted, de-duplicated list of (kind, value) pairs; values are
+        lowercased and URLs lose trailing punctuation
+    """
+    if not text:
+        return []
+
+    found = set()
+    for kind, pattern in IOC_PATTERNS.items():
+        for match in pattern.finditer(text):
+            value = match.group(0).lower()
+            if kind == "url":
+                value = value.rstrip(".,;:!?)]}")
+            found.add((kind, value))
+
+    return sorted(found)
@@ -8,8 +8,6 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Any, Dict, Optional, Tuple
 
-import requests
-
 # Optional debug flag shared with the rest of the project
 LLM_DEBUG = os.getenv("NLP_TRIAGE_LLM_DEBUG", "0").strip() not in {
     "",
@@ -26,10 +24,29 @@ HF_DEFAULT_MODEL = (
 HF_TOKEN_ENV = os.getenv("TRIAGE_HF_TOKEN") or os.getenv("HF_TOKEN") or ""
 
 
-try:  # pragma: no cover - import is environment dependent
-    from llama_cpp import Llama  # type: ignore
-except Exception:  # pragma: no cover - if llama_cpp is not installed
-    Llama = None  # type: ignore
+_LLAMA_UNSET = object()
+_llama_class: Any = _LLAMA_UNSET
+
+
+def load_llama() -> Any:
+    """
+    Import ``llama_cpp.Llama`` on first use.
+
+    llama_cpp is slow to import and only needed for local inference, so it
+    is not imported with this module.
+
+    Returns:
+        The Llama class, or None if llama_cpp is not installed or importable
+    """
+    global _llama_class
+    if _llama_class is _LLAMA_UNSET:
+        try:  # pragma: no cover - import is environment dependent
+            from llama_cpp import Llama  # type: ignore
+
+            _llama_class = Llama
+        except Exception:  # pragma: no cover - if llama_cpp is not installed
+            _llama_class = None
+    return _llama_class
 
 
 def _debug(msg: str) -> None:
@@ -122,6 +139,8 @@ class HuggingFaceInferenceClient:
         if not self.model:
             raise ValueError("HuggingFaceInferenceClient requires a model id")
 
+        import requests
+
         self.endpoint = self.endpoint.rstrip("/")
         self._session = requests.Session()
         _debug(
@@ -254,6 +273,7 @@ class LocalLLMClient:
         if not os.path.exists(path):
             raise FileNotFoundError(f"LLM model not found at: {path}")
 
+        Llama = load_llama()
         if Llama is None:
             raise RuntimeError(
                 "llama_cpp is not installed or importable. "
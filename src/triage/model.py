@@ -1,9 +1,21 @@
+import gc
+import hashlib
+import json
+import os
+import re
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
-import joblib
+import numpy as np
 
+from .embeddings import EMBEDDING_BACKEND
 from .preprocess import clean_description
+from .scoring import SplitLinearScorer
+
+# Enhanced classifier retrained for an embedding backend. Backends without
+# one use enhanced_logreg.joblib (same TF-IDF + 384-dim feature layout).
+ENHANCED_MODEL_FILES = {"static": "enhanced_static_logreg.joblib"}
 
 # Module-level cache for vectorizer and model artifacts
 # These persist for the lifetime of the Python process, enabling:
@@ -12,12 +24,60 @@ from .preprocess import clean_description
 # 3. Consistent model state across multiple CLI operations
 _VECTORIZER = None
 _MODEL = None
+_BASELINE_MODEL = None
+
+# Memory-map the numeric parts of model artifacts (TRIAGE_MODEL_MMAP=1)
+# instead of reading them into private heap memory: processes loading the
+# same files then share one copy through the page cache. Only the runtime
+# artifact (TRIAGE_RUNTIME_MODEL or the registry) is served straight from
+# the mapped arrays; the joblib pair is not, see load_vectorizer_and_model
+MODEL_MMAP = os.getenv("TRIAGE_MODEL_MMAP", "") not in ("", "0")
+
+# Cascade inference: incidents the TF-IDF-only baseline scores at or above
+# the gate skip the embedding + enhanced model. The gate is calibrated by
+# scripts/calibrate_cascade.py into models/cascade.json; TRIAGE_CASCADE_GATE
+# overrides it.
+CASCADE_CONFIG_FILE = "cascade.json"
+DEFAULT_CASCADE_GATE = 0.90
+
+# NumPy-only runtime artifact (see export_runtime_model): a directory of
+# .npy arrays plus manifest.json, loadable without scikit-learn or scipy
+RUNTIME_FORMAT = "triage-runtime"
+RUNTIME_FORMAT_VERSION = 1
+RUNTIME_MANIFEST = "manifest.json"
+RUNTIME_ARRAYS = (
+    "vocabulary",
+    "idf",
+    "tfidf_weights",
+    "embedding_weights",
+    "intercept",
+    "classes",
+)
+# Loaded runtime models by (resolved artifact path, mmap)
+_RUNTIME_MODELS: Dict[Tuple[Path, bool], "RuntimeModel"] = {}
+
+
+def _file_sha256(path: Path) -> str:
+    """Hex SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
 
 
 def _get_models_dir() -> Path:
     return Path(__file__).resolve().parents[2] / "models"
 
 
+def _get_enhanced_model_path(models_dir: Path) -> Path:
+    """Enhanced classifier for the configured embedding backend."""
+    retrained = ENHANCED_MODEL_FILES.get(EMBEDDING_BACKEND)
+    if retrained and (models_dir / retrained).exists():
+        return models_dir / retrained
+    return models_dir / "enhanced_logreg.joblib"
+
+
 def load_vectorizer_and_model():
     """
     Load ML model artifacts with automatic caching.
@@ -33,7 +93,17 @@ def load_vectorizer_and_model():
     
     Cache invalidation:
     - Automatic: When Python process exits
-    - Manual: Restart the process to reload updated models
+    - Manual: Restart the process to reload updated models, or serve from
+      the model registry (TRIAGE_MODEL_REGISTRY, see load_serving_models),
+      which hot-swaps new versions in place
+
+    With TRIAGE_MODEL_MMAP=1 the pickles' NumPy arrays (coefficients, IDF)
+    are memory-mapped read-only, but this saves little: the vocabulary is
+    a Python dict unpickled into every process, and the split scorer used
+    for prediction copies the coefficient blocks to the heap (transposed).
+    To share the model between processes, serve the runtime artifact
+    (TRIAGE_RUNTIME_MODEL or the model registry), whose arrays, vocabulary
+    included, are used in place.
     
     Returns:
         Tuple of (vectorizer, model) from cached or fresh load.
@@ -48,19 +118,524 @@ def load_vectorizer_and_model():
 
     models_dir = _get_models_dir()
     vectorizer_path = models_dir / "vectorizer.joblib"
-    model_path = models_dir / "enhanced_logreg.joblib"
+    model_path = _get_enhanced_model_path(models_dir)
 
     if not vectorizer_path.exists():
         raise FileNotFoundError(f"Vectorizer not found at: {vectorizer_path}")
     if not model_path.exists():
         raise FileNotFoundError(f"Model not found at: {model_path}")
 
-    _VECTORIZER = joblib.load(vectorizer_path)
-    _MODEL = joblib.load(model_path)
+    import joblib
+
+    mmap_mode = "r" if MODEL_MMAP else None
+    _VECTORIZER = joblib.load(vectorizer_path, mmap_mode=mmap_mode)
+    _MODEL = joblib.load(model_path, mmap_mode=mmap_mode)
 
     return _VECTORIZER, _MODEL
 
 
+def load_baseline_model():
+    """
+    Load the TF-IDF-only baseline classifier (cached like the enhanced model).
+
+    Raises:
+        FileNotFoundError: If baseline_logreg.joblib doesn't exist.
+    """
+    global _BASELINE_MODEL
+
+    if _BASELINE_MODEL is not None:
+        return _BASELINE_MODEL
+
+    model_path = _get_models_dir() / "baseline_logreg.joblib"
+    if not model_path.exists():
+        raise FileNotFoundError(f"Baseline model not found at: {model_path}")
+
+    import joblib
+
+    _BASELINE_MODEL = joblib.load(model_path)
+    return _BASELINE_MODEL
+
+
+def load_cascade_gate() -> float:
+    """Baseline confidence at or above which cascade inference stops early."""
+    override = os.getenv("TRIAGE_CASCADE_GATE")
+    if override:
+        return float(override)
+    config_path = _get_models_dir() / CASCADE_CONFIG_FILE
+    if config_path.exists():
+        with open(config_path, "r") as f:
+            return float(json.load(f)["gate"])
+    return DEFAULT_CASCADE_GATE
+
+
+def calibrate_cascade_gate(
+    baseline_proba: np.ndarray,
+    enhanced_labels: np.ndarray,
+    classes: np.ndarray,
+    target_agreement: float = 0.995,
+) -> Dict[str, Any]:
+    """
+    Lowest cascade gate whose labels still agree with the enhanced model.
+
+    Escalated incidents get the enhanced label, so the cascade only
+    disagrees on incidents the baseline answers itself with a different
+    label than the enhanced model would have.
+
+    Args:
+        baseline_proba: (n, n_classes) baseline predict_proba output
+        enhanced_labels: Enhanced model labels for the same incidents
+        classes: Class labels in baseline_proba column order
+        target_agreement: Minimum fraction of cascade labels equal to the
+                enhanced model's
+
+    Returns:
+        Dict with gate, agreement and escalation_rate at that gate,
+        target_agreement and samples
+    """
+    n = len(baseline_proba)
+    max_prob = baseline_proba.max(axis=1)
+    disagrees = classes[baseline_proba.argmax(axis=1)] != np.asarray(enhanced_labels)
+
+    # Accepting the k most confident incidents; cumulative disagreements
+    order = np.argsort(-max_prob, kind="stable")
+    sorted_prob = max_prob[order]
+    agreement = 1.0 - np.cumsum(disagrees[order]) / n
+
+    # A gate accepts every incident tied at its probability, so only the
+    # last position of each run of equal probabilities is a valid cut
+    valid = np.append(sorted_prob[1:] != sorted_prob[:-1], True)
+    ok = np.flatnonzero(valid & (agreement >= target_agreement))
+
+    if len(ok):
+        cut = ok[-1]
+        gate, accepted, cut_agreement = float(sorted_prob[cut]), cut + 1, agreement[cut]
+    else:
+        # Nothing can be answered early: a gate above 1 escalates everything
+        gate, accepted, cut_agreement = float(np.nextafter(1.0, 2.0)), 0, 1.0
+
+    return {
+        "gate": gate,
+        "agreement": float(cut_agreement),
+        "escalation_rate": 1.0 - accepted / n if n else 0.0,
+        "target_agreement": target_agreement,
+        "samples": n,
+    }
+
+
+# -----------------------------------------------------------------------------
+# NumPy-only runtime
+# -----------------------------------------------------------------------------
+class TfidfRows:
+    """
+    Rows of TF-IDF features in CSR layout (indptr, indices, data).
+
+    Supports just what split scoring needs, without scipy: shape, row
+    selection and a product with a dense weight matrix.
+    """
+
+    def __init__(self, indptr, indices, data, n_features: int):
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.shape = (len(indptr) - 1, n_features)
+
+    def __getitem__(self, rows) -> "TfidfRows":
+        rows = np.arange(self.shape[0])[rows]
+        starts, lengths = self.indptr[rows], np.diff(self.indptr)[rows]
+        indptr = np.concatenate([[0], np.cumsum(lengths)])
+        # Position of every kept entry in the original data/indices
+        take = np.repeat(starts - indptr[:-1], lengths) + np.arange(indptr[-1])
+        return TfidfRows(indptr, self.indices[take], self.data[take], self.shape[1])
+
+    def __matmul__(self, weights: np.ndarray) -> np.ndarray:
+        out = np.zeros((self.shape[0], weights.shape[1]), dtype=np.float64)
+        counts = np.diff(self.indptr)
+        nonempty = counts > 0
+        if nonempty.any():
+            products = self.data[:, None] * weights[self.indices]
+            out[nonempty] = np.add.reduceat(
+                products, self.indptr[:-1][nonempty], axis=0
+            )
+        return out
+
+
+class RuntimeModel(SplitLinearScorer):
+    """
+    TF-IDF vectorizer and enhanced classifier compiled to NumPy arrays.
+
+    Acts as both the vectorizer (transform) and the classifier
+    (predict_proba(X_tfidf, embeddings)), so it can stand in for the
+    joblib pair in the CLI; probabilities match the scikit-learn models.
+    """
+
+    def __init__(self, manifest: Dict[str, Any], arrays: Dict[str, np.ndarray]):
+        """
+        Args:
+            manifest: Parsed manifest.json
+            arrays: RUNTIME_ARRAYS by name
+        """
+        super().__init__(
+            arrays["classes"],
+            arrays["tfidf_weights"],
+            arrays["embedding_weights"],
+            arrays["intercept"],
+            manifest["link"],
+        )
+        self.manifest = manifest
+        self.vocabulary = arrays["vocabulary"]
+        self.idf = arrays["idf"]
+
+        analyzer = manifest["analyzer"]
+        self._token_pattern = re.compile(analyzer["token_pattern"])
+        self._lowercase = analyzer["lowercase"]
+        self._stop_words = frozenset(analyzer["stop_words"])
+        self._ngram_range = tuple(analyzer["ngram_range"])
+        self._sublinear_tf = analyzer["sublinear_tf"]
+        self._binary = analyzer["binary"]
+        self._norm = analyzer["norm"]
+
+    @classmethod
+    def load(
+        cls, path: str | Path, mmap: bool = False, verify: bool = False
+    ) -> "RuntimeModel":
+        """
+        Load an artifact written by export_runtime_model.
+
+        Args:
+            path: Artifact directory
+            mmap: Memory-map the arrays read-only instead of reading them,
+                    so every process using the artifact shares its pages
+            verify: Check every array file against its manifest checksum
+
+        Raises:
+            FileNotFoundError: If path has no manifest
+            ValueError: If the artifact format is not supported, or a
+                    verified array doesn't match its checksum
+        """
+        path = Path(path)
+        manifest_path = path / RUNTIME_MANIFEST
+        if not manifest_path.exists():
+            raise FileNotFoundError(f"Runtime model not found at: {path}")
+        with open(manifest_path, "r") as f:
+            manifest = json.load(f)
+        if (
+            manifest.get("format") != RUNTIME_FORMAT
+            or manifest.get("format_version") != RUNTIME_FORMAT_VERSION
+        ):
+            raise ValueError(
+                f"Unsupported runtime model format at {path}: "
+                f"{manifest.get('format')} v{manifest.get('format_version')}"
+            )
+        if verify:
+            for name in RUNTIME_ARRAYS:
+                expected = manifest["arrays"][name].get("sha256")
+                if expected != _file_sha256(path / f"{name}.npy"):
+                    raise ValueError(f"Checksum mismatch for {name}.npy in {path}")
+        mmap_mode = "r" if mmap else None
+        arrays = {
+            name: np.load(path / f"{name}.npy", mmap_mode=mmap_mode)
+            for name in RUNTIME_ARRAYS
+        }
+        return cls(manifest, arrays)
+
+    def _analyze(self, text: str) -> List[str]:
+        """Terms of text, as TfidfVectorizer's word analyzer produces them."""
+        if self._lowercase:
+            text = text.lower()
+        tokens = [
+            token
+            for token in self._token_pattern.findall(text)
+            if token not in self._stop_words
+        ]
+        min_n, max_n = self._ngram_range
+        terms = list(tokens) if min_n == 1 else []
+        for n in range(max(min_n, 2), min(max_n, len(tokens)) + 1):
+            terms.extend(
+                " ".join(tokens[i : i + n]) for i in range(len(tokens) - n + 1)
+            )
+        return terms
+
+    def transform(self, texts: List[str]) -> TfidfRows:
+        """TF-IDF features of texts (same values as the fitted vectorizer)."""
+        n_docs, n_terms = len(texts), len(self.vocabulary)
+        offsets = np.zeros(n_docs + 1, dtype=np.int64)
+        terms: List[str] = []
+        for i, text in enumerate(texts):
+            terms.extend(self._analyze(text))
+            offsets[i + 1] = len(terms)
+
+        doc = np.repeat(np.arange(n_docs), np.diff(offsets))
+        if terms:
+            # Vocabulary is sorted UTF-8 (same order as the terms), so lookup
+            # is a binary search
+            terms_array = np.array([term.encode("utf-8") for term in terms])
+            column = np.searchsorted(self.vocabulary, terms_array)
+            column = np.minimum(column, n_terms - 1)
+            known = self.vocabulary[column] == terms_array
+            doc, column = doc[known], column[known]
+        else:
+            column = np.zeros(0, dtype=np.int64)
+
+        # Term counts per (document, column), sorted like CSR
+        keys, counts = np.unique(doc * n_terms + column, return_counts=True)
+        doc, column = keys // n_terms, keys % n_terms
+        tf = counts.astype(np.float64)
+        if self._binary:
+            tf[:] = 1.0
+        elif self._sublinear_tf:
+            tf = np.log(tf) + 1.0
+        values = tf * self.idf[column]
+
+        if self._norm == "l2":
+            norms = np.sqrt(np.bincount(doc, values**2, minlength=n_docs))
+            values /= norms[doc]
+        elif self._norm == "l1":
+            norms = np.bincount(doc, np.abs(values), minlength=n_docs)
+            values /= norms[doc]
+
+        indptr = np.concatenate([[0], np.cumsum(np.bincount(doc, minlength=n_docs))])
+        return TfidfRows(indptr, column, values, n_terms)
+
+
+def export_runtime_model(vectorizer, clf, output_dir: str | Path) -> Path:
+    """
+    Compile a fitted TfidfVectorizer and linear classifier into a
+    NumPy-only runtime artifact (see RuntimeModel).
+
+    Args:
+        vectorizer: Fitted TfidfVectorizer (word analyzer)
+        clf: Classifier over [TF-IDF | embedding] features (see
+                SplitLinearScorer.from_classifier)
+        output_dir: Directory to write manifest.json and the .npy arrays to
+
+    Returns:
+        output_dir as a Path
+
+    Raises:
+        ValueError: If the vectorizer uses options the runtime can't replay
+    """
+    params = vectorizer.get_params()
+    unsupported = {
+        "analyzer": "word",
+        "tokenizer": None,
+        "preprocessor": None,
+        "strip_accents": None,
+    }
+    for name, supported in unsupported.items():
+        if params[name] != supported:
+            raise ValueError(f"Runtime export needs {name}={supported!r}")
+    if params["norm"] not in ("l2", "l1", None):
+        raise ValueError(f"Unsupported norm: {params['norm']!r}")
+
+    terms = sorted(vectorizer.vocabulary_, key=vectorizer.vocabulary_.get)
+    # UTF-8 bytes sort in code point order, like the vectorizer's columns
+    vocabulary = np.array([term.encode("utf-8") for term in terms])
+    if not np.all(vocabulary[:-1] < vocabulary[1:]):
+        raise ValueError("Vectorizer columns are not in sorted term order")
+
+    scorer = SplitLinearScorer.from_classifier(clf, len(terms))
+    idf = vectorizer.idf_ if params["use_idf"] else np.ones(len(terms))
+    arrays = {
+        "vocabulary": vocabulary,
+        "idf": np.asarray(idf, dtype=np.float64),
+        "tfidf_weights": scorer.tfidf_weights,
+        "embedding_weights": scorer.embedding_weights,
+        "intercept": scorer.intercept,
+        "classes": np.asarray(scorer.classes_, dtype=str),
+    }
+
+    stop_words = vectorizer.get_stop_words()
+    manifest = {
+        "format": RUNTIME_FORMAT,
+        "format_version": RUNTIME_FORMAT_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(),
+        "link": scorer.link,
+        "n_tfidf": scorer.n_tfidf,
+        "n_embedding": scorer.n_embedding,
+        "classes": arrays["classes"].tolist(),
+        "analyzer": {
+            "lowercase": params["lowercase"],
+            "token_pattern": params["token_pattern"],
+            "ngram_range": list(params["ngram_range"]),
+            "stop_words": sorted(stop_words) if stop_words else [],
+            "sublinear_tf": params["sublinear_tf"],
+            "binary": params["binary"],
+            "norm": params["norm"],
+        },
+    }
+    return _write_runtime_artifact(arrays, manifest, output_dir)
+
+
+def _write_runtime_artifact(
+    arrays: Dict[str, np.ndarray], manifest: Dict[str, Any], output_dir: str | Path
+) -> Path:
+    """Save arrays as .npy and manifest.json with their dtypes and checksums."""
+    manifest = dict(manifest, arrays={})
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for name, array in arrays.items():
+        array_path = output_dir / f"{name}.npy"
+        np.save(array_path, array, allow_pickle=False)
+        manifest["arrays"][name] = {
+            "dtype": array.dtype.str,
+            "shape": list(array.shape),
+            "sha256": _file_sha256(array_path),
+        }
+    with open(output_dir / RUNTIME_MANIFEST, "w") as f:
+        json.dump(manifest, f, indent=2)
+    return output_dir
+
+
+def optimize_runtime_model(
+    model: RuntimeModel,
+    output_dir: str | Path,
+    tolerance: float,
+    dtype: str = "float32",
+) -> Path:
+    """
+    Write a smaller copy of a runtime model.
+
+    1. Prunes vocabulary terms whose TF-IDF coefficients are within
+       tolerance of zero for every class, so they no longer cost lookup or
+       memory in transform
+    2. Re-indexes the IDF and TF-IDF coefficient arrays to the kept terms
+    3. Casts IDF and coefficient blocks to dtype (intercepts stay float64)
+
+    Pruned terms also drop out of each document's TF-IDF norm, so
+    probabilities change slightly even for terms with tiny coefficients;
+    scripts/optimize_runtime_model.py measures by how much.
+
+    Args:
+        model: Runtime model to optimize (not modified)
+        output_dir: Directory for the optimized artifact
+        tolerance: Prune terms with max |coefficient| <= tolerance; the
+            useful range depends on the model's coefficient scale, so
+            scripts/optimize_runtime_model.py picks it by sweeping
+        dtype: Floating point type of the IDF and coefficient arrays
+
+    Returns:
+        output_dir as a Path
+
+    Raises:
+        ValueError: If tolerance would prune every term
+    """
+    keep = np.abs(model.tfidf_weights).max(axis=1) > tolerance
+    if not keep.any():
+        raise ValueError(f"Tolerance {tolerance:g} prunes the whole vocabulary")
+    arrays = {
+        "vocabulary": np.asarray(model.vocabulary)[keep],
+        "idf": np.asarray(model.idf, dtype=dtype)[keep],
+        "tfidf_weights": np.ascontiguousarray(model.tfidf_weights[keep], dtype=dtype),
+        "embedding_weights": np.ascontiguousarray(
+            model.embedding_weights, dtype=dtype
+        ),
+        "intercept": np.asarray(model.intercept, dtype=np.float64),
+        "classes": np.asarray(model.classes_),
+    }
+    manifest = dict(
+        model.manifest,
+        created=datetime.now(timezone.utc).isoformat(),
+        n_tfidf=int(keep.sum()),
+        optimized={
+            "source_n_tfidf": model.n_tfidf,
+            "pruned_terms": int((~keep).sum()),
+            "tolerance": tolerance,
+            "dtype": np.dtype(dtype).name,
+        },
+    )
+    return _write_runtime_artifact(arrays, manifest, output_dir)
+
+
+def load_runtime_model(
+    path: Optional[str | Path] = None, mmap: Optional[bool] = None
+) -> RuntimeModel:
+    """
+    Load the NumPy-only runtime model with caching (like
+    load_vectorizer_and_model, but importing neither scikit-learn nor scipy).
+
+    Each artifact directory is loaded once per process, so repeated calls
+    (one per prediction, or after preload_for_workers) return the same
+    object and share its arrays.
+
+    Args:
+        path: Artifact directory (default: TRIAGE_RUNTIME_MODEL when it
+            names a directory, else models/runtime)
+        mmap: Memory-map the arrays (default: TRIAGE_MODEL_MMAP)
+    """
+    if path is None:
+        path = os.getenv("TRIAGE_RUNTIME_MODEL", "1")
+        if path == "1":
+            path = _get_models_dir() / "runtime"
+    if mmap is None:
+        mmap = MODEL_MMAP
+
+    key = (Path(path).resolve(), bool(mmap))
+    model = _RUNTIME_MODELS.get(key)
+    if model is None:
+        model = _RUNTIME_MODELS[key] = RuntimeModel.load(key[0], mmap=mmap)
+    return model
+
+
+def load_serving_models():
+    """
+    Vectorizer and classifier for serving predictions.
+
+    In order of precedence:
+    - TRIAGE_MODEL_REGISTRY set (to a registry directory, or to 1 for
+      models/registry): the registry's active version, hot-reloaded when
+      it changes on disk (see triage.registry)
+    - TRIAGE_RUNTIME_MODEL set (to an artifact directory, or to 1 for
+      models/runtime): the NumPy-only runtime model
+    - Otherwise: the joblib pair from load_vectorizer_and_model
+
+    A runtime model serves as both vectorizer and classifier. Call this per
+    request rather than holding on to the result, so registry swaps apply.
+
+    Returns:
+        Tuple of (vectorizer, model)
+    """
+    if os.getenv("TRIAGE_MODEL_REGISTRY"):
+        from .registry import get_registry
+
+        runtime = get_registry().get()
+        return runtime, runtime
+
+    if os.getenv("TRIAGE_RUNTIME_MODEL"):
+        runtime = load_runtime_model()
+        return runtime, runtime
+    return load_vectorizer_and_model()
+
+
+def preload_for_workers(runtime: bool = False) -> None:
+    """
+    Load models in a parent process before it forks worker processes.
+
+    Call once in the parent (e.g. a gunicorn preload hook, or before
+    creating a multiprocessing "fork" pool). Workers inherit the loaded
+    models, and the parent's objects are moved to the permanent GC
+    generation (gc.freeze) so the collector never writes to their headers
+    in a child: the pages stay shared copy-on-write instead of being copied
+    into every worker. With runtime=True and TRIAGE_MODEL_MMAP=1 the
+    arrays are also file-backed pages shared by unrelated processes; the
+    joblib pair's scorer and vocabulary stay on the heap either way (see
+    load_vectorizer_and_model), shared only through fork.
+
+    Args:
+        runtime: Preload the NumPy-only runtime model load_serving_models
+                serves (TRIAGE_RUNTIME_MODEL) instead of the joblib pair
+    """
+    if runtime:
+        load_runtime_model()
+    else:
+        from .scoring import split_scorer
+
+        vectorizer, clf = load_vectorizer_and_model()
+        # Build the cached scorer now rather than once per worker
+        split_scorer(clf, len(vectorizer.vocabulary_))
+    gc.collect()
+    gc.freeze()
+
+
 def predict_event_type(
     raw_text: str,
     top_k: int = 5,
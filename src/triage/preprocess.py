@@ -1,4 +1,10 @@
 import re
+from pathlib import Path
+
+# Incident dataset the evaluation scripts in scripts/ sample from
+DEFAULT_DATASET = (
+    Path(__file__).resolve().parents[2] / "data" / "cyber_incidents_simulated.csv"
+)
 
 
 def clean_description(text: str) -> str:
@@ -45,3 +51,26 @@ def clean_description(text: str) -> str:
     text = re.sub(r"\s+", " ", text).strip()
 
     return text
+
+
+def load_incident_sample(
+    path: Path = DEFAULT_DATASET, size: int = 5000, seed: int = 42
+):
+    """
+    Cleaned descriptions and event_type labels of a random dataset sample.
+
+    Args:
+        path: CSV with description and event_type columns
+        size: Incidents to sample (all of them if the dataset is smaller)
+        seed: Sampling seed
+
+    Returns:
+        (list of cleaned texts, array of labels)
+    """
+    import pandas as pd
+
+    df = pd.read_csv(path, usecols=["description", "event_type"]).dropna()
+    if len(df) > size:
+        df = df.sample(n=size, random_state=seed)
+    texts = [clean_description(text) for text in df["description"]]
+    return texts, df["event_type"].to_numpy()
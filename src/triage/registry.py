@@ -0,0 +1,311 @@
+"""
+Versioned model registry with hot reload for long-running processes.
+
+Versions are NumPy-only runtime artifacts (see model.export_runtime_model),
+whose manifest.json records each array's sha256 checksum, the feature
+layout (n_tfidf, n_embedding) and the class list. Layout under the
+registry root (models/registry by default):
+
+    versions/<version>/   manifest.json + .npy arrays, never modified
+    ACTIVE                name of the version to serve
+
+publish() writes a version into a temporary directory and renames it into
+place, and activate() replaces ACTIVE with os.replace, so readers never
+see a half-written version or a half-written pointer.
+
+ModelRegistry.get() stats ACTIVE on every call. When it changes, one
+thread loads (and verifies) the new version while concurrent callers keep
+getting the previous one, then the active model is swapped in a single
+assignment: no downtime, and no version loaded twice. Loaded versions stay
+in a small LRU cache, so switching back to a recent version is instant.
+
+Example:
+    >>> registry = ModelRegistry()
+    >>> registry.publish(vectorizer, clf, version="2026-10-19")
+    >>> model = registry.get()  # call per request to pick up new versions
+    >>> model.predict_proba(model.transform(texts), embeddings)
+"""
+
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import warnings
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .model import (
+    MODEL_MMAP,
+    RUNTIME_MANIFEST,
+    RuntimeModel,
+    _get_models_dir,
+    export_runtime_model,
+)
+
+REGISTRY_DIR = "registry"
+VERSIONS_DIR = "versions"
+ACTIVE_FILE = "ACTIVE"
+
+# Loaded versions kept in memory (the active one plus recent ones)
+DEFAULT_CACHE_SIZE = int(os.getenv("TRIAGE_REGISTRY_CACHE_SIZE", "2"))
+
+_VERSION_PATTERN = re.compile(r"^[\w][\w.-]*$")
+
+
+class ModelRegistry:
+    """Versioned runtime models on disk, with an LRU cache of loaded ones."""
+
+    def __init__(
+        self,
+        root: Optional[str | Path] = None,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        mmap: Optional[bool] = None,
+    ):
+        """
+        Args:
+            root: Registry directory (default: models/registry)
+            cache_size: Maximum number of loaded versions kept in memory
+            mmap: Memory-map version arrays (default: TRIAGE_MODEL_MMAP)
+        """
+        if cache_size < 1:
+            raise ValueError("cache_size must be at least 1")
+        self.root = Path(root) if root else _get_models_dir() / REGISTRY_DIR
+        self.cache_size = cache_size
+        self.mmap = MODEL_MMAP if mmap is None else mmap
+
+        self._cache: "OrderedDict[str, RuntimeModel]" = OrderedDict()
+        self._lock = threading.Lock()
+        # (version, model), replaced as a whole so readers never see a mix
+        self._active: Optional[Tuple[str, RuntimeModel]] = None
+        self._active_stamp: Optional[Tuple[int, int, int]] = None
+
+    @property
+    def versions_dir(self) -> Path:
+        return self.root / VERSIONS_DIR
+
+    def versions(self) -> List[str]:
+        """Published version names, oldest name first."""
+        if not self.versions_dir.exists():
+            return []
+        return sorted(
+            path.name
+            for path in self.versions_dir.iterdir()
+            if (path / RUNTIME_MANIFEST).exists() and not path.name.startswith(".")
+        )
+
+    def version_path(self, version: str) -> Path:
+        """
+        Directory of a published version.
+
+        Raises:
+            FileNotFoundError: If the version is not published
+        """
+        path = self.versions_dir / version
+        if not _VERSION_PATTERN.match(version) or not (
+            path / RUNTIME_MANIFEST
+        ).exists():
+            raise FileNotFoundError(f"Model version not found: {version}")
+        return path
+
+    def manifest(self, version: str) -> Dict[str, Any]:
+        """Parsed manifest.json of a version (checksums, layout, classes)."""
+        with open(self.version_path(version) / RUNTIME_MANIFEST, "r") as f:
+            return json.load(f)
+
+    def active_version(self) -> Optional[str]:
+        """Version named by ACTIVE, or None if nothing is active yet."""
+        try:
+            return (self.root / ACTIVE_FILE).read_text().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def publish(
+        self,
+        vectorizer,
+        clf,
+        version: Optional[str] = None,
+        activate: bool = True,
+    ) -> str:
+        """
+        Export a vectorizer + classifier pair as a new version.
+
+        Args:
+            vectorizer: Fitted TfidfVectorizer
+            clf: Fitted classifier over [TF-IDF | embedding] features
+            version: Version name (default: a UTC timestamp)
+            activate: Make it the active version
+
+        Returns:
+            The version name
+
+        Raises:
+            FileExistsError: If the version is already published
+        """
+        return self._add(
+            lambda tmp: export_runtime_model(vectorizer, clf, tmp), version, activate
+        )
+
+    def publish_artifact(
+        self,
+        artifact_dir: str | Path,
+        version: Optional[str] = None,
+        activate: bool = True,
+    ) -> str:
+        """
+        Copy an existing runtime artifact directory in as a new version.
+
+        The copy is verified against the artifact's checksums before it is
+        published. See publish for arguments and errors.
+        """
+
+        def copy(tmp: Path):
+            shutil.copytree(artifact_dir, tmp, dirs_exist_ok=True)
+            RuntimeModel.load(tmp, verify=True)
+
+        return self._add(copy, version, activate)
+
+    def _add(self, write, version: Optional[str], activate: bool) -> str:
+        """Write a version to a temporary directory, then rename it in."""
+        version = version or datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+        if not _VERSION_PATTERN.match(version):
+            raise ValueError(f"Invalid version name: {version!r}")
+        target = self.versions_dir / version
+        if target.exists():
+            raise FileExistsError(f"Model version already exists: {version}")
+
+        self.versions_dir.mkdir(parents=True, exist_ok=True)
+        tmp = Path(tempfile.mkdtemp(prefix=f".{version}-", dir=self.versions_dir))
+        try:
+            write(tmp)
+            tmp.rename(target)
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+
+        if activate:
+            self.activate(version)
+        return version
+
+    def activate(self, version: str) -> None:
+        """
+        Atomically point ACTIVE at a published version.
+
+        Processes serving from this registry swap to it on their next get().
+
+        Raises:
+            FileNotFoundError: If the version is not published
+        """
+        self.version_path(version)
+        self.root.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=f".{ACTIVE_FILE}-", dir=self.root)
+        with os.fdopen(fd, "w") as f:
+            f.write(version + "\n")
+        os.replace(tmp, self.root / ACTIVE_FILE)
+
+    def load(self, version: str) -> RuntimeModel:
+        """
+        Loaded model for a version, from the LRU cache or verified from disk.
+
+        Raises:
+            FileNotFoundError: If the version is not published
+            ValueError: If its arrays don't match the manifest checksums
+        """
+        with self._lock:
+            return self._load_locked(version)
+
+    def _load_locked(self, version: str) -> RuntimeModel:
+        model = self._cache.get(version)
+        if model is not None:
+            self._cache.move_to_end(version)
+            return model
+
+        model = RuntimeModel.load(
+            self.version_path(version), mmap=self.mmap, verify=True
+        )
+        self._cache[version] = model
+        self._evict(keep=version)
+        return model
+
+    def _evict(self, keep: str) -> None:
+        """Drop least recently used versions, never keep or the active one."""
+        protected = {keep, self._active[0] if self._active else keep}
+        for version in list(self._cache):
+            if len(self._cache) <= self.cache_size:
+                break
+            if version not in protected:
+                del self._cache[version]
+
+    def _stamp(self) -> Optional[Tuple[int, int, int]]:
+        """Identity of the ACTIVE file: changes on every activate()."""
+        try:
+            stat = (self.root / ACTIVE_FILE).stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def get(self) -> RuntimeModel:
+        """
+        The active version's model, hot-swapped when ACTIVE changes.
+
+        Raises:
+            FileNotFoundError: If no version is active (on the first call;
+                    afterwards a failed swap keeps the current model and
+                    warns)
+        """
+        active = self._active
+        if active is not None and self._stamp() == self._active_stamp:
+            return active[1]
+
+        # One thread swaps; the others keep serving the current model
+        if not self._lock.acquire(blocking=active is None):
+            return active[1]
+        try:
+            stamp = self._stamp()
+            if self._active is not None and stamp == self._active_stamp:
+                return self._active[1]
+
+            version = self.active_version()
+            try:
+                if version is None:
+                    raise FileNotFoundError(f"No active model version in {self.root}")
+                model = self._load_locked(version)
+            except (FileNotFoundError, ValueError) as e:
+                if self._active is None:
+                    raise
+                # Don't retry on every call: wait for ACTIVE to change again
+                self._active_stamp = stamp
+                warnings.warn(
+                    f"Keeping model version {self._active[0]}: {e}", RuntimeWarning
+                )
+                return self._active[1]
+
+            self._active = (version, model)
+            self._active_stamp = stamp
+            self._evict(keep=version)
+            return model
+        finally:
+            self._lock.release()
+
+
+# Singleton for easy access
+_registry: Optional[ModelRegistry] = None
+
+
+def get_registry() -> ModelRegistry:
+    """
+    Get or create the global registry.
+
+    Its root is TRIAGE_MODEL_REGISTRY (1 means models/registry).
+    """
+    global _registry
+    if _registry is None:
+        root = os.getenv("TRIAGE_MODEL_REGISTRY", "1")
+        _registry = ModelRegistry(None if root == "1" else root)
+    return _registry
+
+
+__all__ = ["ModelRegistry", "get_registry"]
@@ -0,0 +1,152 @@
+"""
+Split linear scoring for the TF-IDF (+ embedding) logistic-regression models.
+
+The enhanced classifier is linear over [TF-IDF | embedding] features, so its
+coefficients split into a TF-IDF block W1 and an embedding block W2:
+
+    logits = X_tfidf @ W1 + E @ W2 + b
+
+Scoring the blocks separately (a sparse-dense and a dense BLAS product)
+avoids building a sparse hstack of a dense embedding for every call, which
+is what predict_proba needs. Probabilities follow the model's own link:
+per-class sigmoids normalized to sum to 1 for OneVsRestClassifier (how the
+shipped models were trained), softmax for multinomial LogisticRegression.
+"""
+
+import weakref
+from typing import Optional
+
+import numpy as np
+
+_SCORERS: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def link_probabilities(logits: np.ndarray, link: str) -> np.ndarray:
+    """
+    Class probabilities from logits of shape (n_samples, n_outputs).
+
+    Args:
+        logits: Linear decision values
+        link: 'ovr' (normalized per-class sigmoids, OneVsRestClassifier),
+                'binary' (one sigmoid output) or 'softmax'
+    """
+    if link == "softmax":
+        exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+        return exp / exp.sum(axis=1, keepdims=True)
+
+    # Sigmoid as exp(-log(1 + e^-x)), which doesn't overflow
+    proba = np.exp(-np.logaddexp(0.0, -logits))
+    if link == "binary":
+        return np.hstack([1 - proba, proba])
+    return proba / proba.sum(axis=1, keepdims=True)
+
+
+class SplitLinearScorer:
+    """predict_proba for a linear model over [TF-IDF | embedding] features."""
+
+    def __init__(
+        self,
+        classes: np.ndarray,
+        tfidf_weights: np.ndarray,
+        embedding_weights: np.ndarray,
+        intercept: np.ndarray,
+        link: str,
+    ):
+        """
+        Args:
+            classes: Class labels, in output order
+            tfidf_weights: (n_tfidf, n_outputs) TF-IDF block W1
+            embedding_weights: (n_embedding, n_outputs) embedding block W2
+            intercept: (n_outputs,) bias b
+            link: See link_probabilities
+        """
+        self.classes_ = np.asarray(classes)
+        self.tfidf_weights = tfidf_weights
+        self.embedding_weights = embedding_weights
+        self.intercept = intercept
+        self.link = link
+
+    @classmethod
+    def from_classifier(cls, clf, n_tfidf: int) -> "SplitLinearScorer":
+        """
+        Split a fitted scikit-learn model's coefficients.
+
+        Args:
+            clf: Fitted OneVsRestClassifier of binary LogisticRegression, or a
+                    LogisticRegression
+            n_tfidf: Number of TF-IDF columns (the rest are embedding columns)
+
+        Raises:
+            TypeError: If clf is not a supported linear model
+        """
+        if hasattr(clf, "estimators_"):
+            estimators = clf.estimators_
+            if not all(hasattr(e, "coef_") for e in estimators):
+                raise TypeError("OneVsRest estimators must be linear models")
+            coef = np.vstack([e.coef_ for e in estimators])
+            intercept = np.concatenate([e.intercept_ for e in estimators])
+            link = "ovr" if len(estimators) > 1 else "binary"
+        elif hasattr(clf, "coef_"):
+            coef, intercept = clf.coef_, clf.intercept_
+            link = "binary" if coef.shape[0] == 1 else "softmax"
+        else:
+            raise TypeError(f"Unsupported classifier: {type(clf).__name__}")
+
+        if n_tfidf > coef.shape[1]:
+            raise ValueError(
+                f"Model has {coef.shape[1]} features, fewer than {n_tfidf} TF-IDF"
+            )
+
+        # (n_features, n_outputs) blocks, contiguous for the products
+        return cls(
+            clf.classes_,
+            np.ascontiguousarray(coef[:, :n_tfidf].T),
+            np.ascontiguousarray(coef[:, n_tfidf:].T),
+            np.asarray(intercept, dtype=np.float64),
+            link,
+        )
+
+    @property
+    def n_tfidf(self) -> int:
+        """Number of TF-IDF columns the model expects."""
+        return self.tfidf_weights.shape[0]
+
+    @property
+    def n_embedding(self) -> int:
+        """Number of embedding columns the model expects (0: TF-IDF only)."""
+        return self.embedding_weights.shape[0]
+
+    def decision_function(self, X_tfidf, embeddings: Optional[np.ndarray] = None):
+        """Logits of shape (n_samples, n_outputs)."""
+        logits = np.asarray(X_tfidf @ self.tfidf_weights)
+        if self.n_embedding:
+            if embeddings is None:
+                raise ValueError("This model needs embeddings")
+            embeddings = np.asarray(embeddings).reshape(-1, self.n_embedding)
+            logits = logits + embeddings @ self.embedding_weights
+        return logits + self.intercept
+
+    def predict_proba(self, X_tfidf, embeddings: Optional[np.ndarray] = None):
+        """Class probabilities, matching clf.predict_proba on hstacked features."""
+        return link_probabilities(
+            self.decision_function(X_tfidf, embeddings), self.link
+        )
+
+    def predict(self, X_tfidf, embeddings: Optional[np.ndarray] = None):
+        """Most probable class for each sample."""
+        return self.classes_[np.argmax(self.predict_proba(X_tfidf, embeddings), axis=1)]
+
+
+def split_scorer(clf, n_tfidf: int) -> SplitLinearScorer:
+    """
+    SplitLinearScorer for clf, built once per model object.
+
+    Scorers (such as triage.model.RuntimeModel) are returned as they are.
+    """
+    if isinstance(clf, SplitLinearScorer):
+        return clf
+    scorer = _SCORERS.get(clf)
+    if scorer is None or scorer.n_tfidf != n_tfidf:
+        scorer = SplitLinearScorer.from_classifier(clf, n_tfidf)
+        _SCORERS[clf] = scorer
+    return scorer
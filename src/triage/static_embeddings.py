@@ -0,0 +1,175 @@
+"""
+Static word embeddings distilled from the sentence-transformer.
+
+A model2vec-style fast path for high-volume streams: every word of the
+incident vocabulary is encoded once by the transformer, and a narrative's
+embedding is the mean of its words' vectors. Encoding is then a table lookup
+plus an average (NumPy only, no torch), at close to TF-IDF speed, for a
+small loss in accuracy.
+
+Word vectors are scaled by smooth inverse frequency (SIF) weights at
+distillation time so frequent boilerplate words contribute less to the mean.
+"""
+
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+# SIF smoothing constant: weight(word) = a / (a + p(word))
+SIF_ALPHA = 1e-3
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens, matching clean_description's output."""
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+class StaticEmbeddings:
+    """Word-vector lookup table with mean pooling.
+
+    Follows the IncidentEmbeddings.encode contract, so it can stand in for
+    the transformer (see the "static" embedding backend).
+
+    Example:
+        >>> static = StaticEmbeddings.load("models/static_embeddings.npz")
+        >>> vectors = static.encode(["phishing email with credential link"])
+    """
+
+    def __init__(
+        self, vocab: List[str], vectors: np.ndarray, source_model: str = ""
+    ):
+        """
+        Args:
+            vocab: Words, one per row of vectors
+            vectors: (len(vocab), dim) word vectors
+            source_model: Name of the transformer the vectors came from
+        """
+        if len(vocab) != len(vectors):
+            raise ValueError("vocab and vectors must have the same length")
+        self.vocab = list(vocab)
+        self.vectors = np.asarray(vectors, dtype=np.float32)
+        self.source_model = source_model
+        self._index: Dict[str, int] = {word: i for i, word in enumerate(self.vocab)}
+
+    @property
+    def dim(self) -> int:
+        """Embedding dimension."""
+        return self.vectors.shape[1]
+
+    @classmethod
+    def distill(
+        cls,
+        texts: Iterable[str],
+        embedder,
+        min_count: int = 2,
+        max_vocab: int = 50000,
+    ) -> "StaticEmbeddings":
+        """
+        Distill word vectors for the vocabulary of texts.
+
+        Args:
+            texts: Corpus the vocabulary and word frequencies come from
+            embedder: IncidentEmbeddings (transformer backend) to encode
+                    each vocabulary word with
+            min_count: Drop words seen fewer times than this
+            max_vocab: Keep at most this many of the most frequent words
+
+        Returns:
+            StaticEmbeddings over the distilled vocabulary
+        """
+        counts = Counter()
+        for text in texts:
+            counts.update(tokenize(text))
+
+        vocab = [
+            word for word, n in counts.most_common(max_vocab) if n >= min_count
+        ]
+        if not vocab:
+            raise ValueError("No words reach min_count in the corpus")
+
+        vectors = embedder.encode(vocab, normalize=True).astype(np.float32)
+
+        total = sum(counts.values())
+        frequency = np.array([counts[word] for word in vocab]) / total
+        weights = SIF_ALPHA / (SIF_ALPHA + frequency)
+        vectors *= weights[:, None].astype(np.float32)
+
+        return cls(vocab, vectors, source_model=getattr(embedder, "model_name", ""))
+
+    def encode(
+        self,
+        texts: str | List[str],
+        normalize: bool = True,
+        batch_size: Optional[int] = None,
+        token_budget: Optional[int] = None,
+    ) -> np.ndarray:
+        """Encode text(s) as the mean of their known words' vectors.
+
+        Args:
+            texts: Single text or list of texts
+            normalize: L2 normalize for cosine similarity (recommended)
+            batch_size: Accepted for IncidentEmbeddings compatibility; unused
+            token_budget: Accepted for IncidentEmbeddings compatibility; unused
+
+        Returns:
+            Numpy array of shape (n_texts, dim); texts with no known words
+            get a zero vector
+        """
+        if isinstance(texts, str):
+            texts = [texts]
+
+        ids: List[int] = []
+        offsets = np.zeros(len(texts) + 1, dtype=np.int64)
+        for i, text in enumerate(texts):
+            ids.extend(
+                self._index[word] for word in tokenize(text) if word in self._index
+            )
+            offsets[i + 1] = len(ids)
+
+        counts = np.diff(offsets)
+        embeddings = np.zeros((len(texts), self.dim), dtype=np.float32)
+        nonempty = counts > 0
+        if nonempty.any():
+            # Sum each text's run of word vectors; texts without known
+            # words stay zero
+            sums = np.add.reduceat(
+                self.vectors[np.asarray(ids)], offsets[:-1][nonempty], axis=0
+            )
+            embeddings[nonempty] = sums / counts[nonempty, None]
+
+        if normalize:
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings /= np.where(norms > 0, norms, 1)
+        return embeddings
+
+    def save(self, path: str | Path):
+        """Write vocabulary and vectors to a .npz file."""
+        np.savez(
+            path,
+            vocab=np.array(self.vocab),
+            vectors=self.vectors,
+            source_model=np.array(self.source_model),
+        )
+
+    @classmethod
+    def load(cls, path: str | Path) -> "StaticEmbeddings":
+        """
+        Load a model written by save().
+
+        Raises:
+            FileNotFoundError: If path does not exist
+        """
+        path = Path(path)
+        if not path.exists():
+            raise FileNotFoundError(f"Static embeddings not found at: {path}")
+        with np.load(path) as data:
+            return cls(
+                data["vocab"].tolist(),
+                data["vectors"],
+                source_model=str(data["source_model"]),
+            )
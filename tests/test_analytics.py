@@ -0,0 +1,94 @@
+# tests/test_analytics.py
+import pytest
+
+pytest.importorskip("duckdb")
+pytest.importorskip("pyarrow")
+
+from triage.analytics import AnalyticsEngine
+from triage.database import TriageDatabase
+
+
+@pytest.fixture
+def db(tmp_path):
+    return TriageDatabase(str(tmp_path / "triage.db"))
+
+
+def _batch_result(text, label, prob, techniques=()):
+    return {
+        "incident_text": text,
+        "final_label": label,
+        "display_label": label,
+        "max_prob": prob,
+        "final_label_mitre_techniques": list(techniques),
+    }
+
+
+def test_reports_match_python_aggregation(db, tmp_path):
+    engine = AnalyticsEngine.for_database(db, export_dir=str(tmp_path / "export"))
+    assert engine.threat_brief_stats()["total"] == 0
+    assert engine.severity_index()["overall"] == 0
+
+    db.save_batch_analysis(
+        "b1",
+        "batch",
+        "batch.csv",
+        [
+            _batch_result("x" * 1000, "malware", 0.9, ["T1059", "T1105"]),
+            _batch_result("short", "phishing", 0.5, ["T1566"]),
+            _batch_result("benign", "benign_activity", 0.95),
+        ],
+    )
+    db.save_analysis("other batch", "web_attack", 0.7)
+    assert engine.refresh() == 4
+
+    # malware: 90*.6 + .9*1.2*20 + 1*.3*10 = 78.6
+    # phishing: 65*.6 + .5*1.2*20 + (5/500)*.3*10 = 51.03
+    # benign: 10*.6 + .95*.8*20 + (6/500)*.3*10 = 21.236
+    index = engine.severity_index(batch_id="b1")
+    assert sorted(index["scores"]) == pytest.approx([21.236, 51.03, 78.6])
+    assert index["overall"] == pytest.approx((78.6 + 51.03 + 21.236) / 3)
+    assert (index["critical"], index["high"], index["medium"], index["low"]) == (
+        0,
+        1,
+        1,
+        1,
+    )
+
+    stats = engine.threat_brief_stats(batch_id="b1", top_techniques=2)
+    assert stats["total"] == 3
+    assert stats["high_conf_count"] == 2
+    assert stats["distinct_techniques"] == 3
+    assert stats["technique_occurrences"] == 3
+    assert len(stats["technique_counts"]) == 2
+    assert stats["critical_counts"] == {"malware": 1}
+
+    assert dict(engine.label_counts())["web_attack"] == 1
+    assert engine.refresh() == 0
+    engine.close()
+
+
+def test_concurrent_refreshes_load_each_row_once(db, tmp_path):
+    import threading
+
+    engine = AnalyticsEngine.for_database(db, export_dir=str(tmp_path / "export"))
+    db.save_batch_analysis(
+        "b1",
+        "batch",
+        "batch.csv",
+        [_batch_result(f"incident {i}", "malware", 0.9) for i in range(200)],
+    )
+
+    barrier = threading.Barrier(4)
+
+    def refresh():
+        barrier.wait()
+        engine.refresh()
+
+    threads = [threading.Thread(target=refresh) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert engine.threat_brief_stats()["total"] == 200
+    assert engine.label_counts() == [("malware", 200)]
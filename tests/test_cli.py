@@ -1,4 +1,10 @@
+import subprocess
+import sys
+
+import pytest
+
 from triage.cli import (
+    predict_batch,
     predict_with_uncertainty,
     load_artifacts,
 )
@@ -35,3 +41,140 @@ def test_cli_prediction_structure():
 
     probs_only = [p for _, p in probs]
     assert probs_only == sorted(probs_only, reverse=True)
+
+
+def test_cli_import_defers_heavy_dependencies():
+    # A fresh interpreter, since this one may already have them loaded
+    heavy = [
+        "torch",
+        "sentence_transformers",
+        "llama_cpp",
+        "scipy",
+        "rich.progress",
+        "joblib",
+        "requests",
+    ]
+    code = (
+        "import sys, triage.cli; "
+        f"print(','.join(m for m in {heavy!r} if m in sys.modules))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert out.stdout.strip() == ""
+
+
+def test_predict_batch_cascade_settles_confident_incidents_without_embeddings():
+    from triage.model import load_baseline_model, load_vectorizer_and_model
+
+    vectorizer, clf = load_vectorizer_and_model()
+    baseline = load_baseline_model()
+    texts = [
+        "User reported a suspicious email with a fake login page.",
+        "EDR detected ransomware encrypting files on a finance workstation.",
+    ]
+
+    # A gate of 0 never escalates, so the embedder is never called
+    results = predict_batch(
+        texts,
+        vectorizer,
+        clf,
+        None,
+        clf.classes_,
+        baseline_clf=baseline,
+        cascade_gate=0.0,
+    )
+    for text, result in zip(texts, results):
+        assert result["escalated"] is False
+        single = predict_with_uncertainty(
+            text,
+            vectorizer,
+            clf,
+            None,
+            clf.classes_,
+            baseline_clf=baseline,
+            cascade_gate=0.0,
+        )
+        assert single["final_label"] == result["final_label"]
+        assert single["max_prob"] == pytest.approx(result["max_prob"])
+
+
+def test_calibrate_cascade_gate_meets_target_agreement():
+    import numpy as np
+
+    from triage.model import calibrate_cascade_gate
+
+    classes = np.array(["malware", "phishing"])
+    baseline_proba = np.array(
+        [[0.99, 0.01], [0.95, 0.05], [0.3, 0.7], [0.6, 0.4], [0.55, 0.45]]
+    )
+    # The baseline is wrong only at 0.6 confidence
+    enhanced = np.array(["malware", "malware", "phishing", "phishing", "malware"])
+
+    calibration = calibrate_cascade_gate(baseline_proba, enhanced, classes, 1.0)
+    assert calibration["gate"] == 0.7
+    assert calibration["agreement"] == 1.0
+    assert calibration["escalation_rate"] == 0.4
+
+    # Allowing one disagreement in five lets the gate drop to 0.55
+    calibration = calibrate_cascade_gate(baseline_proba, enhanced, classes, 0.8)
+    assert calibration["gate"] == 0.55
+    assert calibration["escalation_rate"] == 0.0
+
+
+def test_interactive_mode_fetches_models_per_incident(monkeypatch):
+    import triage.cli as cli
+
+    # Each call stands in for a newly activated model registry version
+    versions = iter(["v1", "v2", "v3"])
+    used = []
+    inputs = iter(["phishing email", "ransomware", "exit"])
+    monkeypatch.setattr(sys, "argv", ["triage"])
+    monkeypatch.setattr(
+        cli, "load_artifacts", lambda: (None, next(versions), None, [])
+    )
+    monkeypatch.setattr(
+        cli,
+        "predict_with_uncertainty",
+        lambda text, vectorizer, clf, *args, **kwargs: used.append(clf) or {},
+    )
+    monkeypatch.setattr(cli, "show_progress_bar", lambda: None)
+    monkeypatch.setattr(cli, "print_pretty", lambda result: None)
+    monkeypatch.setattr(cli.console, "input", lambda prompt: next(inputs))
+
+    cli.main()
+
+    assert used == ["v2", "v3"]
+
+
+def test_cascade_rejects_a_baseline_that_doesnt_fit_the_serving_model(
+    tmp_path, monkeypatch
+):
+    import triage.cli as cli
+    from triage.model import (
+        RuntimeModel,
+        export_runtime_model,
+        load_baseline_model,
+        load_vectorizer_and_model,
+        optimize_runtime_model,
+    )
+
+    vectorizer, clf = load_vectorizer_and_model()
+    baseline = load_baseline_model()
+    cli.check_cascade_baseline(baseline, vectorizer, clf.classes_)
+
+    source = RuntimeModel.load(export_runtime_model(vectorizer, clf, tmp_path / "a"))
+    pruned = RuntimeModel.load(
+        optimize_runtime_model(source, tmp_path / "b", tolerance=0.3)
+    )
+    with pytest.raises(ValueError, match="TF-IDF features"):
+        cli.check_cascade_baseline(baseline, pruned, pruned.classes_)
+    with pytest.raises(ValueError, match="different classes"):
+        cli.check_cascade_baseline(baseline, vectorizer, clf.classes_[::-1])
+
+    monkeypatch.setattr(sys, "argv", ["triage", "--cascade", "--text", "phish"])
+    monkeypatch.setattr(
+        cli, "load_artifacts", lambda: (pruned, pruned, None, pruned.classes_)
+    )
+    with pytest.raises(SystemExit):
+        cli.main()
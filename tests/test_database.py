@@ -0,0 +1,850 @@
+"""
+Tests for the SQLite persistence layer (triage.database).
+
+Every test uses a throwaway database under tmp_path so the bundled
+data/triage.db is never touched.
+"""
+
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from triage.database import TriageDatabase
+
+
+@pytest.fixture
+def db(tmp_path):
+    return TriageDatabase(str(tmp_path / "triage.db"))
+
+
+def _set_timestamp(db, analysis_id, ts):
+    with db.get_connection() as conn:
+        conn.execute(
+            "UPDATE analysis_history SET timestamp = ? WHERE id = ?",
+            (ts.isoformat(), analysis_id),
+        )
+
+
+def _facets_from_base_table(db):
+    """Recompute search facets with full scans, as the pre-rollup code did."""
+    with db.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT final_label, COUNT(*) FROM analysis_history GROUP BY final_label"
+        )
+        classifications = dict(cursor.fetchall())
+        cursor.execute(
+            "SELECT MIN(timestamp), MAX(timestamp), MIN(max_prob), MAX(max_prob), "
+            "COUNT(*) FROM analysis_history"
+        )
+        row = cursor.fetchone()
+    return classifications, (row[0], row[1]), (row[2], row[3]), row[4]
+
+
+def _assert_rollups_match(db):
+    classifications, date_range, confidence_range, total = _facets_from_base_table(db)
+    facets = db.get_search_facets()
+    assert dict(facets["classifications"]) == classifications
+    assert facets["date_range"] == date_range
+    assert facets["confidence_range"] == confidence_range
+    assert facets["total_incidents"] == total
+
+    histogram_total = sum(b["count"] for b in db.get_confidence_histogram())
+    assert histogram_total == total
+
+
+def test_rollups_track_inserts_updates_and_deletes(db):
+    now = datetime.now()
+    ids = []
+    for i, (label, prob) in enumerate(
+        [("phishing", 0.91), ("malware", 0.55), ("phishing", 0.72), ("malware", 0.99)]
+    ):
+        analysis_id = db.save_analysis("text", label, prob, use_llm=(i % 2 == 0))
+        _set_timestamp(db, analysis_id, now - timedelta(days=i))
+        ids.append(analysis_id)
+    _assert_rollups_match(db)
+
+    # Relabel and lower the confidence of the current extreme
+    db.update_analysis(ids[3], "web_attack", 0.41)
+    _assert_rollups_match(db)
+
+    with db.get_connection() as conn:
+        conn.execute("DELETE FROM analysis_history WHERE id = ?", (ids[0],))
+    _assert_rollups_match(db)
+
+    summary = db.get_history_summary()
+    assert summary["total_incidents"] == 3
+    assert summary["avg_confidence"] == pytest.approx((0.55 + 0.72 + 0.41) / 3)
+    assert dict(db.get_label_counts()) == {
+        "malware": 1,
+        "phishing": 1,
+        "web_attack": 1,
+    }
+
+
+def test_count_incidents_matches_timestamp_window(db):
+    now = datetime.now()
+    for days_ago in (0, 1, 3, 8, 40):
+        analysis_id = db.save_analysis("text", "phishing", 0.9)
+        _set_timestamp(db, analysis_id, now - timedelta(days=days_ago, hours=1))
+    db.save_analysis("text", "malware", 0.8)
+
+    assert db.count_incidents() == 6
+    assert db.count_incidents(days=7) == 4
+    assert db.count_incidents(classification="phishing", days=30) == 4
+    assert db.count_incidents(classification="malware") == 1
+
+
+def test_rollups_backfilled_for_existing_database(db):
+    db.save_analysis("text", "phishing", 0.9)
+    db.save_analysis("text", "malware", 0.3)
+    with db.get_connection() as conn:
+        conn.execute("DELETE FROM analysis_daily_rollup")
+        conn.execute("DELETE FROM analysis_confidence_histogram")
+
+    reopened = TriageDatabase(db.db_path)
+    _assert_rollups_match(reopened)
+
+
+def test_clear_history_empties_rollups(db):
+    db.save_analysis("text", "phishing", 0.9)
+    db.clear_history()
+
+    assert db.get_history_summary()["total_incidents"] == 0
+    assert db.get_confidence_histogram() == []
+
+
+def test_window_stats_and_rolling_buckets(db):
+    now = datetime.now()
+    for hours_ago, label, use_llm in [
+        (1, "phishing", True),
+        (30, "phishing", False),
+        (30, "malware", True),
+        (24 * 10, "malware", False),
+    ]:
+        analysis_id = db.save_analysis("text", label, 0.8, use_llm=use_llm)
+        _set_timestamp(db, analysis_id, now - timedelta(hours=hours_ago))
+
+    windows = db.get_window_stats(
+        {"24h": timedelta(hours=24), "7d": timedelta(days=7)}, now=now
+    )
+    assert windows["24h"]["count"] == 1
+    assert windows["7d"]["count"] == 3
+    assert windows["7d"]["llm_count"] == 2
+    assert windows["7d"]["avg_confidence"] == pytest.approx(0.8)
+
+    buckets = db.get_time_buckets(
+        "day", start=now - timedelta(days=7), end=now, rolling=True
+    )
+    assert [(b["bucket"], b["count"]) for b in buckets] == [(1, 2), (0, 1)]
+
+    by_label = db.get_time_buckets("week", group_by="label")
+    assert sum(b["count"] for b in by_label) == 4
+    assert {b["final_label"] for b in by_label} == {"phishing", "malware"}
+
+    with pytest.raises(ValueError):
+        db.get_time_buckets("month")
+
+
+def test_iterators_stream_in_chunks_and_counts(db):
+    ids = [db.save_analysis(f"text {i}", "phishing", 0.9) for i in range(7)]
+    db.add_bookmark("text 0", "phishing", note="check sender", analysis_id=ids[0])
+    db.add_bookmark("text 1", "phishing", analysis_id=ids[1])
+    db.add_note("escalated", analysis_id=ids[2])
+
+    streamed = db.iter_analysis_history(chunk_size=3)
+    assert next(streamed)["id"] == ids[0]
+    assert [r["id"] for r in streamed] == ids[1:]
+    assert [r["id"] for r in db.iter_analysis_history(since_id=ids[4])] == ids[5:]
+
+    assert len(list(db.iter_bookmarks(chunk_size=1))) == 2
+    assert [n["note_text"] for n in db.iter_notes()] == ["escalated"]
+
+    assert db.count_incidents() == 7
+    assert db.count_bookmarks() == 2
+    assert db.count_bookmarks(with_note=True) == 1
+    assert db.count_notes() == 1
+    assert db.count_notes(analysis_id=ids[0]) == 0
+
+
+def test_write_behind_batches_writes_and_resolves_ids(tmp_path):
+    db = TriageDatabase(str(tmp_path / "triage.db"), write_behind=True)
+    tag_id = db.create_tag("urgent")
+
+    pending = [db.save_analysis(f"text {i}", "phishing", 0.9) for i in range(20)]
+    db.add_tag_to_analysis(pending[0], tag_id)
+    note = db.add_note("follow up", analysis_id=pending[1])
+    db.update_analysis(pending[2], "malware", 0.6)
+    bookmark_id = db.add_bookmark("text 3", "phishing", analysis_id=pending[3])
+
+    db.flush()
+    ids = [future.result() for future in pending]
+    assert ids == sorted(ids)
+    assert db.count_incidents() == 20
+    assert [t["name"] for t in db.get_tags_for_analysis(ids[0])] == ["urgent"]
+    assert db.get_notes_for_analysis(ids[1])[0]["id"] == note.result()
+    assert dict(db.get_label_counts()) == {"phishing": 19, "malware": 1}
+    assert next(db.iter_bookmarks())["analysis_id"] == ids[3]
+    assert bookmark_id
+
+    db.save_analysis("late", "malware", 0.7)
+    db.close()
+    assert db.count_incidents() == 21
+
+
+def test_write_behind_orders_bookmarks_and_batches_and_reports_errors(tmp_path):
+    from concurrent.futures import Future
+
+    db = TriageDatabase(str(tmp_path / "triage.db"), write_behind=True)
+    saved = db.save_analysis("text 0", "phishing", 0.9)
+    bookmark = db.add_bookmark("text 0", "phishing", analysis_id=saved)
+    db.update_bookmark_note(bookmark, "checked")
+    batch = db.save_batch_analysis(
+        "batch-1",
+        "batch",
+        "batch.csv",
+        [{"incident_text": "text 1", "final_label": "malware", "max_prob": 0.8}],
+    )
+    assert isinstance(bookmark, Future) and isinstance(batch, Future)
+
+    assert db.resolve(batch, timeout=10) > 0
+    assert next(db.iter_bookmarks())["note"] == "checked"
+    assert db.count_incidents() == 2
+    db.resolve(db.delete_bookmark(bookmark), timeout=10)
+    assert db.count_bookmarks() == 0
+
+    failed: Future = Future()
+    failed.set_exception(ValueError("analysis save failed"))
+    with pytest.raises(ValueError, match="analysis save failed"):
+        db.resolve(db.add_bookmark("text 2", analysis_id=failed), timeout=10)
+    assert db.resolve(7) == 7
+    db.close()
+
+
+def test_batched_tag_and_note_lookups_match_single_lookups(db):
+    ids = [db.save_analysis(f"text {i}", "phishing", 0.9) for i in range(3)]
+    urgent = db.create_tag("urgent")
+    reviewed = db.create_tag("reviewed")
+    db.add_tag_to_analysis(ids[0], urgent)
+    db.add_tag_to_analysis(ids[0], reviewed)
+    db.add_tag_to_analysis(ids[2], urgent)
+    db.add_note("first", analysis_id=ids[0])
+    db.add_note("second", analysis_id=ids[2])
+
+    tags = db.get_tags_for_analyses(ids)
+    notes = db.get_notes_for_analyses(ids)
+    assert set(tags) == set(notes) == set(ids)
+    for analysis_id in ids:
+        assert sorted(t["id"] for t in tags[analysis_id]) == sorted(
+            t["id"] for t in db.get_tags_for_analysis(analysis_id)
+        )
+        assert notes[analysis_id] == db.get_notes_for_analysis(analysis_id)
+
+    assert db.get_tags_for_analyses([]) == {}
+
+
+def test_config_cache_invalidated_by_local_and_external_writes(db, monkeypatch):
+    db.set_feature_flag("beta_ui", True)
+    db.save_setting("theme", {"mode": "dark"})
+    profile_id = db.create_profile("Alice")
+    db.set_active_profile(profile_id)
+
+    assert db.is_feature_enabled("beta_ui")
+    assert db.get_setting("theme") == {"mode": "dark"}
+    assert db.get_active_profile()["name"] == "Alice"
+
+    # Served from memory: no connection is opened while the cache is fresh
+    def _no_connection():
+        raise AssertionError("config read hit SQLite")
+
+    with monkeypatch.context() as m:
+        m.setattr(db, "get_connection", _no_connection)
+        assert db.is_feature_enabled("beta_ui")
+        assert db.get_all_feature_flags() == {"beta_ui": True}
+        db.get_setting("theme")["mode"] = "mutated"
+        assert db.get_setting("theme") == {"mode": "dark"}
+
+    # A write from another process is picked up once the TTL has elapsed
+    other = TriageDatabase(db.db_path)
+    other.set_feature_flag("beta_ui", False)
+    assert db.is_feature_enabled("beta_ui")
+    db._config_checked_at -= db.config_cache_ttl
+    assert not db.is_feature_enabled("beta_ui")
+
+    db.update_profile(profile_id, name="Alice B")
+    assert db.get_active_profile()["name"] == "Alice B"
+
+
+def test_config_cache_invalidated_only_after_write_commits(db, monkeypatch):
+    db.set_feature_flag("beta_ui", False)
+    assert not db.is_feature_enabled("beta_ui")
+
+    # The write is already visible to other connections when the cache drops
+    committed = []
+    invalidate = db.invalidate_config_cache
+
+    def _record_then_invalidate():
+        with sqlite3.connect(db.db_path) as conn:
+            committed.append(
+                conn.execute(
+                    "SELECT enabled FROM feature_flags WHERE flag_name = 'beta_ui'"
+                ).fetchone()[0]
+            )
+        invalidate()
+
+    monkeypatch.setattr(db, "invalidate_config_cache", _record_then_invalidate)
+    db.set_feature_flag("beta_ui", True)
+    assert committed == [1]
+    monkeypatch.undo()
+
+    # A read that overlapped a write returns its result without caching it
+    get_connection = db.get_connection
+
+    @contextmanager
+    def _write_during_read():
+        with get_connection() as conn:
+            db.invalidate_config_cache()
+            yield conn
+
+    db.invalidate_config_cache()
+    monkeypatch.setattr(db, "get_connection", _write_during_read)
+    assert db.is_feature_enabled("beta_ui")
+    assert db._config_cache is None
+
+
+def test_result_cache_serves_reruns_and_invalidates_on_write(tmp_path, monkeypatch):
+    db = TriageDatabase(str(tmp_path / "triage.db"), result_cache_size=2)
+    db.save_analysis("phishing email", "phishing", 0.9)
+
+    first = db.get_recent_incidents(limit=5)
+    first[0]["final_label"] = "mutated"
+
+    def _no_connection():
+        raise AssertionError("cached read hit SQLite")
+
+    with monkeypatch.context() as m:
+        m.setattr(db, "get_connection", _no_connection)
+        assert db.get_recent_incidents(limit=5)[0]["final_label"] == "phishing"
+    assert db.result_cache_hits == 1
+
+    db.save_analysis("malware dropper", "malware", 0.8)
+    assert len(db.get_recent_incidents(limit=5)) == 2
+    assert db.advanced_search(label_filter="malware")[0]["final_label"] == "malware"
+
+    # LRU bound: a third distinct query evicts the least recently used entry
+    db.get_batch_history()
+    assert len(db._result_cache) == 2
+    assert ("get_recent_incidents", '[[], {"limit": 5}]') not in db._result_cache
+
+
+def test_result_cache_invalidated_by_other_connections(tmp_path):
+    path = str(tmp_path / "triage.db")
+    db = TriageDatabase(path, result_cache_size=8)
+    db.save_analysis("phishing email", "phishing", 0.9)
+    assert db.count_incidents() == 1
+    assert db.get_history_summary()["total_incidents"] == 1
+
+    # Another session's instance (own connections, own write generation)
+    TriageDatabase(path).save_analysis("malware dropper", "malware", 0.8)
+    assert db.get_history_summary()["total_incidents"] == db.count_incidents() == 2
+
+    # A plain connection from another tool or process
+    with sqlite3.connect(path) as conn:
+        conn.execute("DELETE FROM analysis_records WHERE final_label = 'malware'")
+    assert db.get_history_summary()["total_incidents"] == 1
+    hits = db.result_cache_hits
+    db.get_history_summary()
+    assert db.result_cache_hits == hits + 1
+    db.close()
+
+
+def test_result_cache_disabled_by_default(db):
+    db.save_analysis("text", "phishing", 0.9)
+    db.get_recent_incidents()
+    assert len(db._result_cache) == 0
+
+
+def test_custom_query_is_read_only_capped_and_time_boxed(db):
+    for i in range(25):
+        db.save_analysis(f"text {i}", "phishing", 0.9)
+
+    df = db.query_dataframe(
+        "SELECT a.id, b.id FROM analysis_history a JOIN analysis_history b "
+        "ON a.id = b.id ORDER BY a.id",
+        max_rows=10,
+    )
+    assert list(df.columns) == ["id", "id"]
+    assert len(df) == 10
+    assert df.attrs["truncated"]
+
+    results, columns = db.execute_custom_query(
+        "SELECT final_label FROM analysis_history"
+    )
+    assert columns == ["final_label"] and len(results) == 25
+
+    with pytest.raises(ValueError):
+        db.query_dataframe("DELETE FROM analysis_history")
+
+    # The connection itself refuses writes even if validation were bypassed
+    db._validate_select = lambda sql: None
+    with pytest.raises(Exception, match="readonly|read-only|query_only"):
+        db.query_dataframe("DELETE FROM analysis_history")
+    assert db.count_incidents() == 25
+
+    runaway = (
+        "WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n) "
+        "SELECT COUNT(*) FROM n"
+    )
+    with pytest.raises(TimeoutError):
+        db.query_dataframe(runaway, timeout=0.2)
+
+
+def test_export_columnar_appends_from_watermark(db, tmp_path):
+    pyarrow_dataset = pytest.importorskip("pyarrow.dataset")
+    now = datetime.now()
+    for i in range(5):
+        analysis_id = db.save_analysis(
+            f"text {i}", "phishing" if i % 2 else "malware", 0.5 + i / 10
+        )
+        _set_timestamp(db, analysis_id, now - timedelta(days=i % 2))
+
+    out = tmp_path / "export"
+    first = db.export_columnar(
+        str(out), columns=["final_label", "max_prob"], chunk_size=2
+    )
+    assert first["rows"] == 5
+    assert len({Path(f).parent.name for f in first["files"]}) == 2
+
+    db.save_analysis("late", "malware", 0.99)
+    second = db.export_columnar(str(out), columns=["final_label", "max_prob"])
+    assert second["rows"] == 1
+    assert second["max_id"] == first["max_id"] + 1
+    assert db.export_columnar(str(out))["rows"] == 0
+
+    table = pyarrow_dataset.dataset(out, format="parquet", partitioning="hive")
+    table = table.to_table()
+    assert table.num_rows == 6
+    assert set(table.column_names) == {"id", "final_label", "max_prob", "day"}
+
+    arrow = db.export_columnar(
+        str(tmp_path / "ipc"), filters={"final_label": "malware"}, format="arrow"
+    )
+    assert arrow["rows"] == 4
+    assert all(f.endswith(".arrow") for f in arrow["files"])
+
+
+def test_archive_history_moves_old_rows_and_keeps_them_searchable(db, tmp_path):
+    now = datetime.now()
+    tag_id = db.create_tag("legacy")
+    old_ids = []
+    for days_ago in (400, 370, 200):
+        analysis_id = db.save_analysis(f"old beacon {days_ago}", "malware", 0.7)
+        _set_timestamp(db, analysis_id, now - timedelta(days=days_ago))
+        old_ids.append(analysis_id)
+    db.add_tag_to_analysis(old_ids[0], tag_id)
+    db.add_note("seen before", analysis_id=old_ids[0])
+    db.save_analysis("fresh beacon", "malware", 0.9)
+
+    moved = db.archive_history(older_than_days=180)
+    assert sum(moved.values()) == 3
+    assert len(db.list_archives()) == len(moved)
+    assert db.count_incidents() == 1
+    assert db.count_notes() == 0
+    _assert_rollups_match(db)
+
+    assert len(db.advanced_search("beacon")) == 1
+    found = db.advanced_search("beacon", include_archives=True)
+    assert [r["incident_text"] for r in found][:2] == [
+        "fresh beacon",
+        "old beacon 200",
+    ]
+    assert len(found) == 4
+    assert len(db.advanced_search("beacon", include_archives=True, limit=2)) == 2
+    tagged = db.advanced_search(tag_ids=[tag_id], include_archives=True)
+    assert [r["id"] for r in tagged] == [old_ids[0]]
+
+    # Re-running is a no-op and the hot file uses incremental auto-vacuum
+    assert db.archive_history(older_than_days=180) == {}
+    with db.get_connection() as conn:
+        assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+
+
+def test_archive_rebuilds_rollups_once_for_large_days(db, tmp_path):
+    import time
+
+    # One busy day straddling the cutoff: part of it is archived
+    cutoff_day = datetime.now() - timedelta(days=180)
+    rows = [
+        (
+            (cutoff_day - timedelta(hours=12) + timedelta(seconds=4 * i)).isoformat(),
+            ("phishing", "malware")[i % 2],
+            (i % 97) / 97,
+        )
+        for i in range(20000)
+    ]
+    with db.get_connection() as conn:
+        conn.execute("INSERT INTO incident_texts (text_hash, text) VALUES ('h', 'x')")
+        conn.executemany(
+            "INSERT INTO analysis_records (timestamp, text_id, final_label, max_prob) "
+            "VALUES (?, 1, ?, ?)",
+            rows,
+        )
+
+    start = time.perf_counter()
+    moved = db.archive_history(
+        older_than_days=180, archive_dir=str(tmp_path), vacuum=False
+    )
+    assert time.perf_counter() - start < 5
+    assert 0 < sum(moved.values()) < len(rows)
+    _assert_rollups_match(db)
+
+    # The per-row retract trigger is back for ordinary deletes
+    with db.get_connection() as conn:
+        conn.execute(
+            "DELETE FROM analysis_records WHERE id = (SELECT MIN(id) FROM "
+            "analysis_records)"
+        )
+    _assert_rollups_match(db)
+
+
+def test_incident_texts_are_deduplicated_behind_views(db):
+    alert = "Repeated beacon to 203.0.113.7 from host WS-12"
+    first = db.save_analysis(
+        alert,
+        "malware",
+        0.8,
+        raw_result={"incident_text": alert, "probabilities": {"malware": 0.8}},
+        batch_id="single",
+    )
+    db.save_analysis(alert, "malware", 0.9)
+    db.add_bookmark(alert, "malware", analysis_id=first)
+    db.save_batch_analysis(
+        "batch-1",
+        "nightly",
+        "alerts.csv",
+        [{"incident_text": alert, "final_label": "malware", "max_prob": 0.7}],
+    )
+
+    with db.get_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM incident_texts").fetchone()[0] == 1
+        with pytest.raises(Exception, match="immutable"):
+            conn.execute(
+                "UPDATE analysis_history SET incident_text = 'x' WHERE id = ?",
+                (first,),
+            )
+
+    assert db.get_analysis_by_id(first)["incident_text"] == alert
+    assert db.get_bookmarks()[0]["incident_text"] == alert
+    batch = db.get_batch_incidents("batch-1")
+    assert batch[0]["raw_result"]["incident_text"] == alert
+    # The narrative is never copied into raw_result, by either save path
+    with db.get_connection() as conn:
+        stored = [r[0] for r in conn.execute("SELECT raw_result FROM analysis_records")]
+    assert not any(alert in raw for raw in stored if raw)
+    single = db.get_batch_incidents("single")[0]["raw_result"]
+    assert single == {"incident_text": alert, "probabilities": {"malware": 0.8}}
+
+    db.clear_history()
+    with db.get_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM incident_texts").fetchone()[0] == 0
+
+
+def test_delete_bookmark_prunes_only_its_own_narrative(db):
+    analysed = db.save_analysis("kept by its analysis", "malware", 0.9)
+    kept = db.add_bookmark("kept by its analysis", analysis_id=analysed)
+    dropped = db.add_bookmark("only bookmarked")
+    with db.get_connection() as conn:
+        # Orphans left by other paths wait for optimize()
+        conn.execute("INSERT INTO incident_texts (text_hash, text) VALUES ('h', 'x')")
+
+    def texts():
+        with db.get_connection() as conn:
+            return {r[0] for r in conn.execute("SELECT text FROM incident_texts")}
+
+    db.delete_bookmark(dropped)
+    assert texts() == {"kept by its analysis", "x"}
+    db.delete_bookmark(kept)
+    db.delete_bookmark(kept)
+    assert texts() == {"kept by its analysis", "x"}
+    db.optimize()
+    assert texts() == {"kept by its analysis"}
+
+
+def test_legacy_inline_text_database_is_migrated(tmp_path):
+    import sqlite3
+
+    path = tmp_path / "legacy.db"
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        CREATE TABLE analysis_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp TEXT NOT NULL, incident_text TEXT NOT NULL,
+            final_label TEXT NOT NULL, max_prob REAL NOT NULL,
+            uncertainty_level TEXT, analysis_mode TEXT, difficulty TEXT,
+            threshold REAL, use_llm INTEGER, raw_result TEXT, batch_id TEXT,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE TABLE bookmarks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, analysis_id INTEGER,
+            incident_text TEXT NOT NULL, final_label TEXT, note TEXT,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP
+        );
+        INSERT INTO analysis_history (timestamp, incident_text, final_label, max_prob)
+        VALUES ('2024-05-01T10:00:00', 'same text', 'phishing', 0.9),
+               ('2024-05-02T10:00:00', 'same text', 'phishing', 0.7),
+               ('2024-05-03T10:00:00', 'other text', 'malware', 0.6);
+        INSERT INTO bookmarks (analysis_id, incident_text, note)
+        VALUES (1, 'same text', 'keep');
+        """
+    )
+    conn.commit()
+    conn.close()
+
+    db = TriageDatabase(str(path))
+    history = db.get_analysis_history(limit=10)
+    assert sorted(r["incident_text"] for r in history) == [
+        "other text",
+        "same text",
+        "same text",
+    ]
+    assert db.get_bookmarks()[0]["note"] == "keep"
+    _assert_rollups_match(db)
+
+    # New ids continue after the migrated ones
+    assert db.save_analysis("new text", "malware", 0.5) == 4
+    with db.get_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM incident_texts").fetchone()[0] == 3
+
+
+def test_ioc_index_find_cooccurrence_and_backfill(db):
+    first = db.save_analysis(
+        "Beacon from 10.0.0.5 to evil.example.com", "malware", 0.9
+    )
+    second = db.save_analysis(
+        "Phish from 10.0.0.5 linking https://evil.example.com/login", "phishing", 0.8
+    )
+    db.save_analysis("Printer jam on floor 3", "other", 0.4)
+
+    assert [r["id"] for r in db.find_by_ioc("10.0.0.5")] == [second, first]
+    assert [r["id"] for r in db.find_by_ioc("EVIL.example.com", kind="domain")] == [
+        second,
+        first,
+    ]
+    assert db.find_by_ioc("10.0.0.5", kind="domain") == []
+
+    pivots = {
+        (c["kind"], c["value"]): c["count"] for c in db.ioc_cooccurrence("10.0.0.5")
+    }
+    assert pivots[("domain", "evil.example.com")] == 2
+    assert pivots[("url", "https://evil.example.com/login")] == 1
+    assert db.get_ioc_kind_counts()["ipv4"] == 2
+
+    # Save-time indexing advances the backfill watermark
+    assert db.count_ioc_backfill_pending() == 0
+    assert db.backfill_iocs() == 0
+
+    # Deleting an analysis drops its IOCs; backfill re-indexes a legacy
+    # database's rows, and new saves don't skip the watermark past them
+    with db.get_connection() as conn:
+        conn.execute("DELETE FROM analysis_history WHERE id = ?", (first,))
+        conn.execute("DELETE FROM incident_iocs")
+        conn.execute("UPDATE ioc_backfill_state SET last_analysis_id = 0")
+    assert db.find_by_ioc("10.0.0.5") == []
+    db.save_analysis("Scan from 10.0.0.9", "other", 0.5)
+    assert db.count_ioc_backfill_pending() == 3
+    assert db.backfill_iocs(batch_size=1) == 3
+    assert [r["id"] for r in db.find_by_ioc("10.0.0.5")] == [second]
+    assert db.backfill_iocs() == 0
+
+
+def test_embeddings_stored_once_per_text_and_memory_mapped(db, tmp_path):
+    import numpy as np
+
+    first = db.save_analysis("alpha", "malware", 0.9, embedding=[1.0, 0.0, 0.0])
+    # A re-analysis of the same text keeps the original vector
+    second = db.save_analysis("alpha", "malware", 0.8, embedding=[0.0, 1.0, 0.0])
+    db.save_batch_analysis(
+        "b1",
+        "batch",
+        "batch.csv",
+        [
+            {"incident_text": "beta", "final_label": "phishing", "max_prob": 0.7},
+            {"incident_text": "gamma", "final_label": "other", "max_prob": 0.5},
+        ],
+        embeddings=[np.array([0.0, 0.6, 0.8], dtype=np.float32), None],
+    )
+
+    missing = db.get_texts_without_embeddings()
+    assert [m["text"] for m in missing] == ["gamma"]
+    assert db.store_embeddings({missing[0]["text_id"]: [0.0, 0.0, 1.0]}) == 1
+    assert db.get_texts_without_embeddings() == []
+
+    cache_dir = tmp_path / "vectors"
+    text_ids, matrix = db.load_embeddings(cache_dir=str(cache_dir))
+    assert isinstance(matrix, np.memmap)
+    assert matrix.dtype == np.float16 and matrix.shape == (3, 3)
+    np.testing.assert_allclose(matrix[0], [1.0, 0.0, 0.0])
+    np.testing.assert_allclose(matrix[1], [0.0, 0.6, 0.8], atol=1e-3)
+
+    analyses = db.get_analyses_for_texts([int(t) for t in text_ids])
+    assert analyses[int(text_ids[0])]["id"] == second
+    assert analyses[int(text_ids[1])]["incident_text"] == "beta"
+
+    # Cached files are reused until the stored set changes
+    (matrix_path,) = cache_dir.glob("triage_*_vectors.npy")
+    mtime = matrix_path.stat().st_mtime_ns
+    db.load_embeddings(cache_dir=str(cache_dir))
+    assert matrix_path.stat().st_mtime_ns == mtime
+
+    with db.get_connection() as conn:
+        conn.execute("DELETE FROM analysis_history WHERE id IN (?, ?)", (first, second))
+    db.optimize()
+    text_ids, matrix = db.load_embeddings(cache_dir=str(cache_dir))
+    assert matrix.shape == (2, 3)
+    np.testing.assert_allclose(matrix[0], [0.0, 0.6, 0.8], atol=1e-3)
+
+
+def test_embeddings_are_kept_per_model_and_re_encoded_on_mismatch(db, tmp_path):
+    import numpy as np
+
+    cache_dir = str(tmp_path / "vectors")
+    db.save_analysis("alpha", "malware", 0.9, embedding=[1.0, 0.0])
+    db.save_analysis(
+        "beta", "phishing", 0.7, embedding=[0.0, 1.0], embedding_model="static"
+    )
+
+    # Each model only sees its own vectors, cached in its own files
+    text_ids, matrix = db.load_embeddings(cache_dir=cache_dir)
+    assert len(text_ids) == 1
+    np.testing.assert_allclose(matrix[0], [1.0, 0.0])
+    text_ids, matrix = db.load_embeddings(cache_dir=cache_dir, model="static")
+    np.testing.assert_allclose(matrix, [[0.0, 1.0]])
+    assert len(list((tmp_path / "vectors").glob("*_vectors.npy"))) == 2
+    assert db.hybrid_search("alpha beta", query_embedding=[0.0, 1.0])[0][
+        "semantic_rank"
+    ] == 1
+    assert [
+        r["final_label"]
+        for r in db.hybrid_search(
+            "zzz", query_embedding=[0.0, 1.0], embedding_model="static"
+        )
+    ] == ["phishing"]
+
+    # A text embedded by another model is re-encoded, replacing its vector
+    missing = db.get_texts_without_embeddings()
+    assert [m["text"] for m in missing] == ["beta"]
+    assert db.store_embeddings({missing[0]["text_id"]: [0.6, 0.8]}) == 1
+    assert db.get_texts_without_embeddings() == []
+    assert db.store_embeddings({missing[0]["text_id"]: [0.0, 1.0]}) == 0
+    text_ids, matrix = db.load_embeddings(cache_dir=cache_dir)
+    np.testing.assert_allclose(matrix, [[1.0, 0.0], [0.6, 0.8]], atol=1e-3)
+    assert len(db.load_embeddings(cache_dir=cache_dir, model="static")[0]) == 0
+
+    # Vectors stored before models were recorded count as mismatched
+    with sqlite3.connect(db.db_path) as conn:
+        conn.execute("DROP INDEX idx_embeddings_model")
+        conn.execute("ALTER TABLE incident_embeddings DROP COLUMN model")
+    db = TriageDatabase(db.db_path)
+    assert [m["text"] for m in db.get_texts_without_embeddings()] == ["alpha", "beta"]
+    assert len(db.load_embeddings(cache_dir=cache_dir)[0]) == 0
+
+
+def test_search_after_save_appends_instead_of_rewriting_embeddings(db, tmp_path):
+    import time
+
+    import numpy as np
+    from triage.embeddings import embedding_model_id
+
+    n, dim = 50000, 384
+    vectors = np.random.default_rng(0).normal(size=(n, dim))
+    vectors = (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype("<f2")
+    with db.get_connection() as conn:
+        conn.executemany(
+            "INSERT INTO incident_texts (id, text_hash, text) VALUES (?, ?, ?)",
+            ((i, f"h{i}", f"alert {i}") for i in range(1, n + 1)),
+        )
+        conn.executemany(
+            "INSERT INTO incident_embeddings (text_id, dim, vector, model) "
+            "VALUES (?, ?, ?, ?)",
+            (
+                (i + 1, dim, vectors[i].tobytes(), embedding_model_id())
+                for i in range(n)
+            ),
+        )
+    cache_dir = tmp_path / "embeddings"
+    cached = {"cache_dir": str(cache_dir)}
+    db.load_embeddings(**cached)
+    (generation,) = cache_dir.glob("*_vectors.npy")
+
+    query = np.zeros(dim, dtype=np.float32)
+    query[0] = 1.0
+    db.save_analysis("brand new beacon", "malware", 0.9, embedding=query)
+
+    start = time.perf_counter()
+    text_ids, matrix = db.load_embeddings(**cached)
+    assert time.perf_counter() - start < 0.5
+    assert list(cache_dir.glob("*_vectors.npy")) == [generation]
+    assert len(text_ids) == n + 1
+    np.testing.assert_allclose(matrix[-1], query)
+    np.testing.assert_allclose(matrix[:n], vectors)
+
+    # The default cache directory is used by hybrid_search itself
+    db.load_embeddings()
+    db.save_analysis("another new beacon", "malware", 0.8, embedding=query)
+    start = time.perf_counter()
+    results = db.hybrid_search("zzz", query_embedding=query, k=2)
+    assert time.perf_counter() - start < 1
+    assert {r["incident_text"] for r in results} == {
+        "brand new beacon",
+        "another new beacon",
+    }
+
+
+def test_hybrid_search_fuses_keyword_and_vector_rankings(db):
+    phish = db.save_analysis(
+        "Credential phishing email with a fake login page",
+        "phishing",
+        0.9,
+        embedding=[1.0, 0.0],
+    )
+    malware = db.save_analysis(
+        "Ransomware encrypted the file server", "malware", 0.8, embedding=[0.0, 1.0]
+    )
+    lure = db.save_analysis(
+        "User clicked a suspicious link in an email",
+        "phishing",
+        0.4,
+        embedding=[0.8, 0.6],
+    )
+
+    # Keyword-only: FTS5 input is quoted, so syntax characters are harmless
+    lexical = db.hybrid_search('email AND "login', k=5)
+    assert [r["id"] for r in lexical][:2] == [phish, lure]
+    assert lexical[0]["semantic_rank"] is None
+
+    fused = db.hybrid_search("suspicious email", k=5, query_embedding=[0.8, 0.6])
+    assert fused[0]["id"] == lure
+    assert fused[0]["lexical_rank"] is not None and fused[0]["semantic_rank"] == 1
+    assert fused[0]["similarity_score"] == pytest.approx(1.0, abs=1e-3)
+    assert [r["id"] for r in fused] == [lure, phish, malware]
+
+    # Filters are applied before ranking
+    confident = db.hybrid_search(
+        "email",
+        filters={"min_confidence": 0.5, "label_filter": "phishing"},
+        query_embedding=[0.8, 0.6],
+    )
+    assert [r["id"] for r in confident] == [phish]
+
+    with pytest.raises(ValueError):
+        db.hybrid_search("email", filters={"colour": "red"})
+
+    # The full-text index follows text pruning
+    with db.get_connection() as conn:
+        conn.execute("DELETE FROM analysis_history WHERE id = ?", (phish,))
+    db.optimize()
+    assert [r["id"] for r in db.hybrid_search("login")] == []
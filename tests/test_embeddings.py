@@ -0,0 +1,80 @@
+# tests/test_embeddings.py
+
+import numpy as np
+import pytest
+
+from triage.embeddings import IncidentEmbeddings, length_buckets
+from triage.static_embeddings import StaticEmbeddings
+
+
+def test_length_buckets_respect_token_budget_and_cover_every_text():
+    lengths = [120, 8, 40, 8, 500, 16, 8, 64]
+    batches = length_buckets(lengths, token_budget=128, max_batch_size=3)
+
+    covered = np.concatenate(batches)
+    assert sorted(covered.tolist()) == list(range(len(lengths)))
+    # Shortest texts first, and no batch pads past the budget
+    assert [lengths[i] for i in covered] == sorted(lengths)
+    for batch in batches:
+        assert len(batch) <= 3
+        assert len(batch) == 1 or len(batch) * max(lengths[i] for i in batch) <= 128
+    # A text longer than the whole budget still gets a batch of its own
+    assert [4] in [batch.tolist() for batch in batches]
+
+
+def test_length_buckets_empty():
+    assert length_buckets([]) == []
+
+
+def test_unknown_embedding_backend_rejected():
+    with pytest.raises(ValueError, match="Unknown embedding backend"):
+        IncidentEmbeddings(backend="fp8")
+
+
+class _WordEmbedder:
+    """One-hot vector per distinct word, standing in for the transformer."""
+
+    model_name = "one-hot"
+
+    def __init__(self, words):
+        self.words = sorted(words)
+
+    def encode(self, texts, normalize=True):
+        vectors = np.zeros((len(texts), len(self.words)), dtype=np.float32)
+        for i, text in enumerate(texts):
+            vectors[i, self.words.index(text)] = 1.0
+        return vectors
+
+
+def test_static_embeddings_distill_and_mean_pool(tmp_path):
+    corpus = ["phishing email link", "phishing email attachment", "malware beacon"]
+    words = {word for text in corpus for word in text.split()}
+    static = StaticEmbeddings.distill(corpus, _WordEmbedder(words), min_count=1)
+
+    assert static.source_model == "one-hot"
+    assert set(static.vocab) == words
+
+    vectors = static.encode(["Phishing beacon", "nothing known here"])
+    assert vectors.shape == (2, len(words))
+    np.testing.assert_allclose(np.linalg.norm(vectors[0]), 1.0, rtol=1e-6)
+    assert not vectors[1].any()
+    # Rare words weigh more than frequent ones (SIF)
+    beacon = vectors[0, sorted(words).index("beacon")]
+    phishing = vectors[0, sorted(words).index("phishing")]
+    assert beacon > phishing > 0
+
+    path = tmp_path / "static.npz"
+    static.save(path)
+    loaded = StaticEmbeddings.load(path)
+    np.testing.assert_array_equal(loaded.encode(["phishing beacon"]), vectors[:1])
+    assert loaded.source_model == "one-hot"
+
+
+def test_static_backend_needs_no_transformer(tmp_path, monkeypatch):
+    path = tmp_path / "static.npz"
+    StaticEmbeddings(["alert", "login"], np.eye(2)).save(path)
+    monkeypatch.setattr("triage.embeddings.STATIC_EMBEDDINGS_PATH", str(path))
+
+    embedder = IncidentEmbeddings(backend="static")
+    vectors = embedder.encode(["login alert", "login"])
+    np.testing.assert_allclose(vectors, [[2**-0.5, 2**-0.5], [0, 1]], rtol=1e-6)
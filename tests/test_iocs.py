@@ -0,0 +1,25 @@
+# tests/test_iocs.py
+
+from triage.iocs import extract_iocs
+
+
+def test_extract_iocs_kinds_and_normalisation():
+    text = (
+        "Beacon from 10.0.0.5 to https://Evil.example.com/payload.exe, "
+        "phish sent by Bob@Corp-Mail.com; dropped "
+        "44d88612fea8a8f36de82e1278abb02f and set HKLM\\Software\\Run"
+    )
+    iocs = extract_iocs(text)
+
+    assert ("ipv4", "10.0.0.5") in iocs
+    assert ("url", "https://evil.example.com/payload.exe") in iocs
+    assert ("email", "bob@corp-mail.com") in iocs
+    assert ("domain", "evil.example.com") in iocs
+    assert ("hash", "44d88612fea8a8f36de82e1278abb02f") in iocs
+    assert ("registry", "hklm\\software\\run") in iocs
+    assert iocs == sorted(set(iocs))
+
+
+def test_extract_iocs_empty_text():
+    assert extract_iocs("") == []
+    assert extract_iocs("User reported slow laptop") == []
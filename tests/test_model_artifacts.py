@@ -54,4 +54,130 @@ def test_expected_classes_present():
     }
 
     missing = expected - classes
-    assert not missing, f"Missing expected classes: {missing}"
\ No newline at end of file
+    assert not missing, f"Missing expected classes: {missing}"
+
+RUNTIME_TEXTS = [
+    "User received an email with a fake VPN login link.",
+    "EDR flagged ransomware encrypting files; the the user user reported it",
+    "",
+    "zzzz qqqq",
+]
+
+
+def test_runtime_model_matches_sklearn(tmp_path):
+    from scipy.sparse import csr_matrix, hstack
+
+    from triage.model import RuntimeModel, export_runtime_model
+
+    vectorizer = joblib.load(os.path.join(MODELS_DIR, "vectorizer.joblib"))
+    clf = joblib.load(os.path.join(MODELS_DIR, "enhanced_logreg.joblib"))
+    export_runtime_model(vectorizer, clf, tmp_path)
+    runtime = RuntimeModel.load(tmp_path)
+
+    texts = [clean_description(text) for text in RUNTIME_TEXTS]
+    X = vectorizer.transform(texts)
+    rows = runtime.transform(texts)
+    np.testing.assert_allclose(rows @ np.eye(X.shape[1]), X.toarray(), atol=1e-15)
+
+    embeddings = np.random.default_rng(0).normal(size=(len(texts), 384))
+    expected = clf.predict_proba(hstack([X, csr_matrix(embeddings)]))
+    np.testing.assert_allclose(
+        runtime.predict_proba(rows, embeddings), expected, rtol=0, atol=1e-12
+    )
+    np.testing.assert_allclose(
+        runtime.predict_proba(rows[[1, 3]], embeddings[[1, 3]]), expected[[1, 3]]
+    )
+    assert list(runtime.classes_) == list(clf.classes_)
+
+
+def test_runtime_model_loads_without_sklearn(tmp_path):
+    import subprocess
+    import sys
+
+    from triage.model import export_runtime_model
+
+    vectorizer = joblib.load(os.path.join(MODELS_DIR, "vectorizer.joblib"))
+    clf = joblib.load(os.path.join(MODELS_DIR, "enhanced_logreg.joblib"))
+    export_runtime_model(vectorizer, clf, tmp_path)
+
+    code = (
+        "import sys, numpy as np\n"
+        "from triage.model import load_runtime_model\n"
+        f"model = load_runtime_model({str(tmp_path)!r})\n"
+        "X = model.transform(['fake vpn login email'])\n"
+        "print(model.predict(X, np.zeros(384))[0])\n"
+        "print(sorted(m for m in ('sklearn', 'scipy') if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    label, heavy = result.stdout.split("\n")[:2]
+    assert label in clf.classes_
+    assert heavy == "[]"
+
+
+def test_runtime_model_mmap_matches_loaded(tmp_path):
+    from triage.model import RuntimeModel, export_runtime_model
+
+    vectorizer = joblib.load(os.path.join(MODELS_DIR, "vectorizer.joblib"))
+    clf = joblib.load(os.path.join(MODELS_DIR, "enhanced_logreg.joblib"))
+    export_runtime_model(vectorizer, clf, tmp_path)
+    loaded = RuntimeModel.load(tmp_path)
+    mapped = RuntimeModel.load(tmp_path, mmap=True)
+
+    assert isinstance(mapped.tfidf_weights, np.memmap)
+    assert not mapped.tfidf_weights.flags.writeable
+    texts = [clean_description(text) for text in RUNTIME_TEXTS]
+    embeddings = np.random.default_rng(0).normal(size=(len(texts), 384))
+    np.testing.assert_array_equal(
+        mapped.predict_proba(mapped.transform(texts), embeddings),
+        loaded.predict_proba(loaded.transform(texts), embeddings),
+    )
+
+
+def test_optimize_runtime_model_prunes_and_compacts(tmp_path):
+    import pytest
+
+    from triage.model import RuntimeModel, export_runtime_model, optimize_runtime_model
+
+    vectorizer = joblib.load(os.path.join(MODELS_DIR, "vectorizer.joblib"))
+    clf = joblib.load(os.path.join(MODELS_DIR, "enhanced_logreg.joblib"))
+    source = RuntimeModel.load(export_runtime_model(vectorizer, clf, tmp_path / "src"))
+    optimized = RuntimeModel.load(
+        optimize_runtime_model(source, tmp_path / "opt", tolerance=0.3), verify=True
+    )
+
+    kept = np.abs(source.tfidf_weights).max(axis=1) > 0.3
+    assert 0 < optimized.n_tfidf == kept.sum() < source.n_tfidf
+    assert optimized.tfidf_weights.dtype == np.float32
+    assert optimized.manifest["optimized"]["pruned_terms"] == (~kept).sum()
+    np.testing.assert_array_equal(optimized.vocabulary, source.vocabulary[kept])
+
+    texts = [clean_description(text) for text in RUNTIME_TEXTS]
+    embeddings = np.random.default_rng(0).normal(size=(len(texts), 384))
+    expected = source.predict_proba(source.transform(texts), embeddings)
+    actual = optimized.predict_proba(optimized.transform(texts), embeddings)
+    np.testing.assert_array_equal(actual.argmax(1), expected.argmax(1))
+    np.testing.assert_allclose(actual, expected, atol=0.05)
+
+    with pytest.raises(ValueError, match="whole vocabulary"):
+        optimize_runtime_model(source, tmp_path / "empty", tolerance=1e9)
+
+
+def test_serving_runtime_model_is_loaded_once_per_path(tmp_path, monkeypatch):
+    from triage.model import (
+        export_runtime_model,
+        load_runtime_model,
+        load_serving_models,
+    )
+
+    vectorizer = joblib.load(os.path.join(MODELS_DIR, "vectorizer.joblib"))
+    clf = joblib.load(os.path.join(MODELS_DIR, "enhanced_logreg.joblib"))
+    export_runtime_model(vectorizer, clf, tmp_path / "runtime")
+    monkeypatch.delenv("TRIAGE_MODEL_REGISTRY", raising=False)
+    monkeypatch.setenv("TRIAGE_RUNTIME_MODEL", str(tmp_path / "runtime"))
+
+    served, _ = load_serving_models()
+    assert load_serving_models()[0] is served
+    assert load_runtime_model() is served
+    assert load_runtime_model(tmp_path / "runtime" / ".." / "runtime") is served
@@ -2,7 +2,7 @@
 
 import pytest
 
-from triage.preprocess import clean_description
+from triage.preprocess import clean_description, load_incident_sample
 
 
 def test_clean_description_basic_lowercasing_and_strip():
@@ -41,4 +41,21 @@ def test_clean_description_is_idempotent():
     text = "User clicked a suspicious link."
     once = clean_description(text)
     twice = clean_description(once)
-    assert once == twice
\ No newline at end of file
+    assert once == twice
+
+
+def test_load_incident_sample_cleans_and_samples(tmp_path):
+    path = tmp_path / "incidents.csv"
+    path.write_text(
+        "description,event_type\n"
+        "User clicked http://bad.example.com,phishing\n"
+        "Ransomware on WS-12,malware\n"
+        ",benign_activity\n"
+    )
+
+    texts, labels = load_incident_sample(path, size=10)
+    assert texts == ["user clicked url", "ransomware on ws"]
+    assert list(labels) == ["phishing", "malware"]
+
+    sampled, _ = load_incident_sample(path, size=1, seed=0)
+    assert len(sampled) == 1 and sampled[0] in texts
@@ -0,0 +1,118 @@
+# tests/test_registry.py
+
+import threading
+import time
+
+import numpy as np
+import pytest
+from scipy.sparse import csr_matrix, hstack
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.multiclass import OneVsRestClassifier
+
+from triage.model import RuntimeModel
+from triage.registry import ModelRegistry
+
+TEXTS = [
+    "user reported a suspicious email with a fake login page",
+    "phishing email asking for password reset",
+    "edr detected ransomware encrypting files on a finance workstation",
+    "malware beacon to a known command and control domain",
+    "large upload to a personal cloud storage account after hours",
+    "bulk download of customer records to usb drive",
+]
+LABELS = ["phishing", "phishing", "malware", "malware", "exfil", "exfil"]
+
+
+def _fit(seed):
+    vectorizer = TfidfVectorizer().fit(TEXTS)
+    embeddings = np.random.default_rng(seed).normal(size=(len(TEXTS), 4))
+    clf = OneVsRestClassifier(LogisticRegression(C=float(seed + 1)))
+    clf.fit(hstack([vectorizer.transform(TEXTS), csr_matrix(embeddings)]), LABELS)
+    return vectorizer, clf
+
+
+@pytest.fixture
+def registry(tmp_path):
+    registry = ModelRegistry(tmp_path / "registry")
+    registry.publish(*_fit(0), version="v1")
+    return registry
+
+
+def test_publish_writes_verified_manifest(registry):
+    manifest = registry.manifest("v1")
+
+    assert registry.versions() == ["v1"]
+    assert registry.active_version() == "v1"
+    assert manifest["classes"] == ["exfil", "malware", "phishing"]
+    assert manifest["n_embedding"] == 4
+    assert all(len(entry["sha256"]) == 64 for entry in manifest["arrays"].values())
+    with pytest.raises(FileExistsError):
+        registry.publish(*_fit(1), version="v1")
+
+
+def test_get_hot_swaps_and_caches_versions(registry):
+    first = registry.get()
+    assert registry.get() is first
+
+    registry.publish(*_fit(1), version="v2")
+    second = registry.get()
+    assert second is not first
+    assert not np.array_equal(second.tfidf_weights, first.tfidf_weights)
+
+    registry.activate("v1")
+    assert registry.get() is first  # still cached, no reload
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    registry = ModelRegistry(tmp_path, cache_size=1)
+    registry.publish(*_fit(0), version="v1")
+    first = registry.get()
+    registry.publish(*_fit(1), version="v2")
+    registry.get()
+
+    assert list(registry._cache) == ["v2"]
+    registry.activate("v1")
+    assert registry.get() is not first
+
+
+def test_corrupt_version_keeps_serving_current(registry):
+    current = registry.get()
+    registry.publish(*_fit(1), version="v2", activate=False)
+    with open(registry.version_path("v2") / "tfidf_weights.npy", "r+b") as f:
+        f.seek(-8, 2)
+        f.write(b"\x00" * 8)
+    registry.activate("v2")
+
+    with pytest.warns(RuntimeWarning, match="Keeping model version v1"):
+        assert registry.get() is current
+    with pytest.raises(ValueError, match="Checksum mismatch"):
+        ModelRegistry(registry.root).get()
+
+
+def test_concurrent_swap_loads_once(registry, monkeypatch):
+    registry.get()
+    registry.publish(*_fit(1), version="v2")
+
+    loads = []
+    original_load = RuntimeModel.load.__func__
+
+    def slow_load(cls, path, **kwargs):
+        loads.append(path)
+        time.sleep(0.1)
+        return original_load(cls, path, **kwargs)
+
+    monkeypatch.setattr(RuntimeModel, "load", classmethod(slow_load))
+    served = []
+    threads = [
+        threading.Thread(target=lambda: served.append(registry.get()))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(loads) == 1
+    assert registry.get() in served
+    assert registry._active[0] == "v2"
@@ -0,0 +1,63 @@
+# tests/test_scoring.py
+
+import numpy as np
+import pytest
+from scipy.sparse import csr_matrix, hstack
+from sklearn.linear_model import LogisticRegression
+
+from triage.model import load_baseline_model, load_vectorizer_and_model
+from triage.scoring import SplitLinearScorer, split_scorer
+
+TEXTS = [
+    "user reported a suspicious email with a fake login page",
+    "edr detected ransomware encrypting files on a finance workstation",
+    "large upload to a personal cloud storage account after hours",
+]
+
+
+def _unit_embeddings(n, dim=384, seed=0):
+    embeddings = np.random.default_rng(seed).normal(size=(n, dim)).astype(np.float32)
+    return embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+
+
+def test_split_scoring_matches_enhanced_predict_proba():
+    vectorizer, clf = load_vectorizer_and_model()
+    X_tfidf = vectorizer.transform(TEXTS)
+    embeddings = _unit_embeddings(len(TEXTS))
+
+    scorer = split_scorer(clf, X_tfidf.shape[1])
+    expected = clf.predict_proba(hstack([X_tfidf, csr_matrix(embeddings)]))
+
+    np.testing.assert_allclose(
+        scorer.predict_proba(X_tfidf, embeddings), expected, rtol=0, atol=1e-12
+    )
+    # A single 1-D embedding, as returned for one incident
+    np.testing.assert_allclose(
+        scorer.predict_proba(X_tfidf[:1], embeddings[0]), expected[:1], atol=1e-12
+    )
+    assert split_scorer(clf, X_tfidf.shape[1]) is scorer
+
+
+def test_split_scoring_tfidf_only_and_softmax_models():
+    vectorizer, _ = load_vectorizer_and_model()
+    X_tfidf = vectorizer.transform(TEXTS)
+
+    baseline = load_baseline_model()
+    scorer = SplitLinearScorer.from_classifier(baseline, X_tfidf.shape[1])
+    assert scorer.n_embedding == 0
+    np.testing.assert_allclose(
+        scorer.predict_proba(X_tfidf), baseline.predict_proba(X_tfidf), atol=1e-12
+    )
+
+    # Multinomial logistic regression uses a softmax link
+    X = hstack([X_tfidf, csr_matrix(_unit_embeddings(len(TEXTS), dim=8))]).tocsr()
+    multinomial = LogisticRegression().fit(X, ["a", "b", "c"])
+    scorer = SplitLinearScorer.from_classifier(multinomial, X_tfidf.shape[1])
+    np.testing.assert_allclose(
+        scorer.predict_proba(X_tfidf, X[:, X_tfidf.shape[1] :].toarray()),
+        multinomial.predict_proba(X),
+        atol=1e-12,
+    )
+
+    with pytest.raises(ValueError, match="needs embeddings"):
+        scorer.predict_proba(X_tfidf)
@@ -5,8 +5,10 @@ Complete feature set with professional design (NO EMOJIS - Professional Icons On
 
 import os
 import io
+import atexit
 import json
 import re
+from concurrent.futures import Future
 from pathlib import Path
 from datetime import datetime, timedelta
 import pandas as pd
@@ -28,10 +30,21 @@ except ModuleNotFoundError:  # pragma: no cover - fallback for older runtimes
     import tomli as tomllib  # type: ignore[import-not-found]
 
 # Import custom modules
+from src.triage.analytics import (
+    CRITICAL_LABELS,
+    DEFAULT_SEVERITY,
+    LABEL_SEVERITY,
+    AnalyticsEngine,
+)
 from src.triage.database import TriageDatabase
+from src.triage.iocs import IOC_KIND_LABELS
 from src.triage.embeddings import get_embedder
-from src.triage.model import load_vectorizer_and_model, predict_event_type
+from src.triage.model import (
+    load_serving_models,
+    predict_event_type,
+)
 from src.triage.preprocess import clean_description
+from src.triage.scoring import split_scorer
 from src.triage.cli import llm_second_opinion, build_llm_rationale
 
 # Import icon helpers
@@ -139,6 +152,8 @@ UI_LLM_MAX_INPUT_CHARS = 8000
 UI_LLM_MAX_TOKENS = 512
 HF_UI_MAX_REQUESTS = 5
 HF_UI_WINDOW_SECONDS = 60
+# Seconds to wait for a write-behind save whose row ID the page needs
+DB_WRITE_TIMEOUT = 10.0
 # Dark mode disabled for readability; keep light as single, consistent theme
 THEME_OPTIONS = ["Light"]
 
@@ -1095,6 +1110,27 @@ def assess_false_positive_likelihood(
     return min(1.0, fp_score)
 
 
+def records_json(df: pd.DataFrame) -> str:
+    """Export df as a JSON list of records.
+
+    Repeated column names (e.g. ``id`` from both sides of a join in the
+    SQL console) get ``_1``, ``_2``, ... suffixes, since a record cannot hold
+    the same key twice.
+    """
+    taken = set(map(str, df.columns))
+    seen: set[str] = set()
+    names = []
+    for name in map(str, df.columns):
+        unique, n = name, 0
+        # Suffixes also skip names the result already has, e.g. a real id_1
+        while unique in seen or (n and unique in taken):
+            n += 1
+            unique = f"{name}_{n}"
+        seen.add(unique)
+        names.append(unique)
+    return df.set_axis(names, axis=1).to_json(orient="records", indent=2)
+
+
 def add_chart_download_buttons(
     fig: go.Figure, chart_name: str = "chart", key_suffix: str = ""
 ):
@@ -1284,45 +1320,33 @@ def create_kill_chain_viz(kill_chain_stages: dict) -> go.Figure:
 # ============================================================================
 
 
-@st.cache_data(ttl=3600, show_spinner="Building embedding cache...")
-def _get_corpus_embeddings(corpus_hash: str, corpus_texts: list) -> np.ndarray:
-    """Cache embeddings for the incident corpus.
+def _get_incident_embeddings() -> tuple[np.ndarray, np.ndarray]:
+    """Load stored incident embeddings, encoding any narratives that lack one.
 
-    Args:
-        corpus_hash: Hash of corpus for cache invalidation
-        corpus_texts: List of incident texts to encode
+    Narratives saved with their analysis embedding are never re-encoded;
+    older ones, and ones embedded by a different model or backend, are
+    encoded here once and written back to the database.
 
     Returns:
-        2D numpy array of embeddings
+        Tuple of (text_ids, memory-mapped float16 embedding matrix)
     """
+    db = st.session_state.db
     embedder = get_embedder()
-    return embedder.encode(corpus_texts)
-
-
-def _get_incident_corpus(limit: int = 200000) -> tuple[list[dict[str, Any]], str]:
-    """Get incident corpus with caching.
-
-    Args:
-        limit: Maximum number of incidents to retrieve
-
-    Returns:
-        Tuple of (incidents list, corpus hash)
-    """
-    if "db" not in st.session_state:
-        return [], ""
-
-    incidents = st.session_state.db.get_analysis_history(limit=limit)
-
-    if not incidents:
-        return [], ""
-
-    # Create hash from incident IDs for cache invalidation
-    import hashlib
-
-    incident_ids = [str(inc.get("analysis_id", "")) for inc in incidents]
-    corpus_hash = hashlib.md5("".join(incident_ids).encode()).hexdigest()
+    model_id = embedder.model_id
+    missing = db.get_texts_without_embeddings(limit=1000, model=model_id)
+    if missing:
+        with st.spinner("Building embedding cache..."):
+            while missing:
+                vectors = embedder.encode([m["text"] for m in missing])
+                db.store_embeddings(
+                    {m["text_id"]: vector for m, vector in zip(missing, vectors)},
+                    model=model_id,
+                )
+                missing = db.get_texts_without_embeddings(
+                    limit=1000, model=model_id
+                )
 
-    return incidents, corpus_hash
+    return db.load_embeddings(model=model_id)
 
 
 def find_similar_incidents(
@@ -1336,14 +1360,17 @@ def find_similar_incidents(
         similarity_threshold: Minimum similarity score (0-1)
 
     Returns:
-        List of dicts with keys: analysis_id, incident_text, final_label,
+        List of dicts with keys: id, incident_text, final_label,
         max_prob, timestamp, similarity_score
     """
     try:
-        # Get incident corpus with hash for caching
-        all_incidents, corpus_hash = _get_incident_corpus(limit=200000)
+        if "db" not in st.session_state:
+            return []
+
+        # Stored corpus embeddings, one row per distinct narrative
+        text_ids, corpus_embeds = _get_incident_embeddings()
 
-        if not all_incidents or len(all_incidents) < 2:
+        if len(text_ids) < 2:
             return []
 
         # Get embedder
@@ -1352,20 +1379,19 @@ def find_similar_incidents(
         # Encode query
         query_embed = embedder.encode(query_text)
 
-        # Get cached corpus embeddings (or compute if not cached)
-        corpus_texts = [inc["incident_text"] for inc in all_incidents]
-        corpus_embeds = _get_corpus_embeddings(corpus_hash, corpus_texts)
-
         # Find similar
         similar_indices = embedder.find_similar(
             query_embed, corpus_embeds, top_k=top_k + 1
         )
+        analyses = st.session_state.db.get_analyses_for_texts(
+            [int(text_ids[idx]) for idx, _ in similar_indices]
+        )
 
         # Build results (skip first if it's exact match)
         results = []
         for idx, score in similar_indices:
-            if score >= similarity_threshold:
-                incident = all_incidents[idx].copy()
+            incident = analyses.get(int(text_ids[idx]))
+            if incident is not None and score >= similarity_threshold:
                 incident["similarity_score"] = score
 
                 # Skip if exact duplicate (similarity = 1.0)
@@ -1379,6 +1405,42 @@ def find_similar_incidents(
         return []
 
 
+def hybrid_search_incidents(
+    query_text: str, top_k: int = 10, filters: dict[str, Any] | None = None
+) -> list:
+    """Rank incidents by keyword (BM25) and semantic relevance combined.
+
+    Args:
+        query_text: Free-text query
+        top_k: Number of incidents to return
+        filters: Optional TriageDatabase.hybrid_search filters
+
+    Returns:
+        List of analysis dicts with hybrid_score, lexical_rank,
+        semantic_rank and similarity_score
+    """
+    try:
+        if "db" not in st.session_state:
+            return []
+
+        # Make sure every stored narrative has a vector to rank against
+        _get_incident_embeddings()
+        embedder = get_embedder()
+        query_embed = embedder.encode(query_text)
+
+        return st.session_state.db.hybrid_search(
+            query_text,
+            filters=filters,
+            k=top_k,
+            query_embedding=query_embed,
+            embedding_model=embedder.model_id,
+        )
+
+    except Exception as e:
+        st.error(f"Error searching incidents: {e}")
+        return []
+
+
 def check_for_duplicates(incident_text: str, threshold: float = 0.90) -> list:
     """Check if incident is a potential duplicate.
 
@@ -1410,18 +1472,7 @@ def calculate_risk_score(
         Risk score (0-100)
     """
     # Base severity by classification
-    severity_map = {
-        "malware": 90,
-        "data_exfiltration": 95,
-        "web_attack": 75,
-        "access_abuse": 70,
-        "phishing": 65,
-        "policy_violation": 30,
-        "benign_activity": 10,
-        "uncertain": 50,
-    }
-
-    base_severity = severity_map.get(classification, 50)
+    base_severity = LABEL_SEVERITY.get(classification, DEFAULT_SEVERITY)
 
     # Confidence weight (higher confidence = higher risk for threats)
     confidence_weight = confidence * 1.2 if base_severity > 50 else confidence * 0.8
@@ -1443,6 +1494,76 @@ def calculate_risk_score(
     return min(max(risk_score, 0), 100)
 
 
+@st.cache_resource
+def _shared_database() -> TriageDatabase:
+    """The process-wide TriageDatabase, shared by every session.
+
+    TRIAGE_DB_WRITE_BEHIND=1 batches history/tag/note writes on a
+    background writer so saving never blocks the page render. The
+    read-result cache (TRIAGE_DB_RESULT_CACHE entries, 0 disables it) is
+    emptied by commits from any session or process. The writer is closed
+    once, at process exit.
+    """
+    db = TriageDatabase(
+        write_behind=os.environ.get("TRIAGE_DB_WRITE_BEHIND", "0") == "1",
+        result_cache_size=int(os.environ.get("TRIAGE_DB_RESULT_CACHE", "256")),
+    )
+    atexit.register(db.close)
+    return db
+
+
+def _track_write(result: Any, action: str) -> Any:
+    """Report a write-behind write's failure on a later rerun, without waiting.
+
+    Synchronous writes have already committed (or raised) by the time they
+    return, so only Futures are tracked. Failures are shown by
+    _show_write_errors.
+    """
+    if isinstance(result, Future):
+        errors = st.session_state.setdefault("db_write_errors", [])
+
+        def report(future: Future) -> None:
+            # Runs on the writer thread: only record the error here
+            if future.exception() is not None:
+                errors.append(f"{action}: {future.exception()}")
+
+        result.add_done_callback(report)
+    return result
+
+
+def _show_write_errors() -> None:
+    """Show write-behind failures reported since the last rerun."""
+    errors = st.session_state.get("db_write_errors")
+    while errors:
+        st.error(f"Failed to save. {errors.pop(0)}")
+
+
+@st.cache_resource(show_spinner="Loading analytics engine...")
+def _load_analytics_engine(db_path: str) -> AnalyticsEngine:
+    """Build the DuckDB analytics engine for a database (once per process).
+
+    Shared by every session, so it gets its own TriageDatabase for db_path
+    rather than any one session's instance.
+    """
+    return AnalyticsEngine.for_database(TriageDatabase(db_path))
+
+
+def get_analytics_engine() -> AnalyticsEngine | None:
+    """DuckDB reporting engine brought up to date, or None if unavailable.
+
+    Returns None when duckdb/pyarrow are not installed so callers can fall
+    back to the in-Python aggregations.
+    """
+    if "db" not in st.session_state:
+        return None
+    try:
+        engine = _load_analytics_engine(st.session_state.db.db_path)
+        engine.refresh()
+        return engine
+    except Exception:
+        return None
+
+
 def calculate_severity_index(results: list) -> dict:
     """Calculate aggregated severity index across results.
 
@@ -1793,17 +1914,16 @@ Adjust procedures based on your organization's specific requirements and policie
     return markdown
 
 
-def generate_threat_intelligence_brief(results: list) -> str:
-    """Generate a comprehensive threat intelligence brief from bulk analysis results."""
-    total = len(results)
+def threat_brief_stats(results: list) -> dict:
+    """Statistics behind the threat intelligence brief, computed in Python.
 
-    # Calculate key metrics - use display_label to reflect LLM overrides
+    Same shape as AnalyticsEngine.threat_brief_stats, for result lists that
+    are not (yet) in the database.
+    """
+    # Use display_label to reflect LLM overrides
     label_counts = Counter(
         [r.get("display_label", r.get("final_label", "unknown")) for r in results]
     )
-    avg_confidence = np.mean([r.get("max_prob", 0) for r in results])
-    high_conf_count = len([r for r in results if r.get("max_prob", 0) > 0.8])
-    uncertain_count = label_counts.get("uncertain", 0)
 
     # Collect all MITRE techniques
     all_techniques = []
@@ -1811,13 +1931,41 @@ def generate_threat_intelligence_brief(results: list) -> str:
         all_techniques.extend(r.get("final_label_mitre_techniques", []))
     technique_counts = Counter(all_techniques)
 
-    # Identify critical threats - use display_label
-    critical_labels = ["malware", "data_exfiltration", "web_attack"]
-    critical_incidents = [
-        r
-        for r in results
-        if r.get("display_label", r.get("final_label")) in critical_labels
-    ]
+    return {
+        "total": len(results),
+        "avg_confidence": np.mean([r.get("max_prob", 0) for r in results]),
+        "high_conf_count": len([r for r in results if r.get("max_prob", 0) > 0.8]),
+        "label_counts": label_counts.most_common(),
+        "technique_counts": technique_counts.most_common(10),
+        "distinct_techniques": len(technique_counts),
+        "technique_occurrences": len(all_techniques),
+        "critical_counts": {
+            label: label_counts[label]
+            for label in CRITICAL_LABELS
+            if label_counts[label]
+        },
+    }
+
+
+def generate_threat_intelligence_brief(results: list, stats: dict | None = None) -> str:
+    """Generate a comprehensive threat intelligence brief from bulk analysis results.
+
+    Args:
+        results: Analysis results
+        stats: Precomputed threat_brief_stats (e.g. from the DuckDB
+            analytics engine); computed from results when omitted
+    """
+    if stats is None:
+        stats = threat_brief_stats(results)
+
+    # Key metrics
+    total = stats["total"]
+    label_counts = stats["label_counts"]
+    avg_confidence = stats["avg_confidence"]
+    high_conf_count = stats["high_conf_count"]
+    uncertain_count = dict(label_counts).get("uncertain", 0)
+    technique_counts = stats["technique_counts"]
+    critical_count = sum(stats["critical_counts"].values())
 
     # Generate brief
     brief = f"""# Threat Intelligence Brief
@@ -1834,7 +1982,7 @@ This threat intelligence brief summarizes the analysis of {total:,} security inc
 - **Overall Confidence:** {avg_confidence:.1%} average confidence across all classifications
 - **High Confidence Cases:** {high_conf_count} ({high_conf_count/total:.1%}) incidents classified with >80% confidence
 - **Uncertain Cases:** {uncertain_count} ({uncertain_count/total:.1%}) incidents requiring manual review
-- **Critical Threats Detected:** {len(critical_incidents)} incidents ({len(critical_incidents)/total:.1%})
+- **Critical Threats Detected:** {critical_count} incidents ({critical_count/total:.1%})
 
 ## Incident Distribution
 
@@ -1842,28 +1990,22 @@ This threat intelligence brief summarizes the analysis of {total:,} security inc
 
 """
 
-    for label, count in label_counts.most_common():
+    for label, count in label_counts:
         pct = count / total * 100
         brief += (
             f"- **{label.replace('_', ' ').title()}**: {count} incidents ({pct:.1f}%)\n"
         )
 
-    brief += f"""\n## MITRE ATT&CK Coverage\n\n**Total Techniques Detected:** {len(technique_counts)}\n**Total Technique Occurrences:** {len(all_techniques)}\n\n### Top Techniques\n\n"""
+    brief += f"""\n## MITRE ATT&CK Coverage\n\n**Total Techniques Detected:** {stats['distinct_techniques']}\n**Total Technique Occurrences:** {stats['technique_occurrences']}\n\n### Top Techniques\n\n"""
 
-    for technique, count in technique_counts.most_common(10):
+    for technique, count in technique_counts:
         brief += f"- **{technique}**: {count} occurrences\n"
 
     brief += f"""\n## Threat Landscape Analysis\n\n### Critical Threats Breakdown\n\n"""
 
-    if critical_incidents:
-        for label in critical_labels:
-            count = len(
-                [
-                    r
-                    for r in critical_incidents
-                    if r.get("display_label", r.get("final_label")) == label
-                ]
-            )
+    if critical_count:
+        for label in CRITICAL_LABELS:
+            count = stats["critical_counts"].get(label, 0)
             if count > 0:
                 brief += (
                     f"\n#### {label.replace('_', ' ').title()} ({count} incidents)\n\n"
@@ -1876,8 +2018,8 @@ This threat intelligence brief summarizes the analysis of {total:,} security inc
 
     brief += f"""\n## Recommendations\n\n### Immediate Actions\n\n"""
 
-    if len(critical_incidents) > 0:
-        brief += f"1. **PRIORITY**: Review {len(critical_incidents)} critical threat incidents immediately\n"
+    if critical_count > 0:
+        brief += f"1. **PRIORITY**: Review {critical_count} critical threat incidents immediately\n"
 
     if uncertain_count > total * 0.2:
         brief += f"2. **HIGH**: {uncertain_count} uncertain cases require expert analysis ({uncertain_count/total:.1%} of total)\n"
@@ -1885,8 +2027,8 @@ This threat intelligence brief summarizes the analysis of {total:,} security inc
     if high_conf_count < total * 0.5:
         brief += f"3. **MEDIUM**: Low overall confidence ({avg_confidence:.1%}) suggests need for additional context\n"
 
-    brief += f"""\n### Strategic Recommendations\n\n- **Threat Hunting**: Focus on MITRE techniques {', '.join([t for t, _ in technique_counts.most_common(3)])}
-- **Detection Enhancement**: Improve detection for {label_counts.most_common(1)[0][0].replace('_', ' ')} incidents (highest volume)
+    brief += f"""\n### Strategic Recommendations\n\n- **Threat Hunting**: Focus on MITRE techniques {', '.join([t for t, _ in technique_counts[:3]])}
+- **Detection Enhancement**: Improve detection for {label_counts[0][0].replace('_', ' ')} incidents (highest volume)
 - **Process Improvement**: Review uncertain cases to improve future classification accuracy\n\n## Technical Details\n\n- **Analysis Engine**: AlertSage AI Triage System
 - **Model**: TF-IDF + Logistic Regression
 - **Confidence Threshold**: Adaptive uncertainty-aware thresholds
@@ -1926,14 +2068,28 @@ def get_confidence_class(conf):
     )
 
 
-@st.cache_data
 def load_model_metrics():
-    """Load pre-computed model metrics"""
+    """Load pre-computed metrics of the model currently being served
+
+    Recomputed when load_serving_models returns a different model, e.g.
+    after a new model registry version is activated.
+    """
     try:
+        vectorizer, model = load_serving_models()
+    except Exception:
+        vectorizer = model = None
+    return _compute_model_metrics(id(model), vectorizer, model)
+
+
+@st.cache_data
+def _compute_model_metrics(model_key, _vectorizer, _model):
+    """Test-set metrics of _model (cached per model_key)"""
+    try:
+        from scipy.sparse import csr_matrix
+
         # Load combined features for enhanced model (TF-IDF + embeddings)
-        X_test = joblib.load("models/X_test_combined.joblib")
+        X_test = csr_matrix(joblib.load("models/X_test_combined.joblib"))
         y_test = joblib.load("models/y_test.joblib")
-        vectorizer, model = load_vectorizer_and_model()
 
         from sklearn.metrics import (
             accuracy_score,
@@ -1942,7 +2098,14 @@ def load_model_metrics():
             f1_score,
         )
 
-        y_pred = model.predict(X_test)
+        # Score per block, as in the analysis tabs; the saved features follow
+        # the training vectorizer's layout, so a model with another
+        # vocabulary (e.g. a pruned runtime model) can't be scored on them
+        n_tfidf = _vectorizer.transform([""]).shape[1]
+        scorer = split_scorer(_model, n_tfidf)
+        if X_test.shape[1] != scorer.n_tfidf + scorer.n_embedding:
+            raise ValueError("Test features don't match the serving model")
+        y_pred = scorer.predict(X_test[:, :n_tfidf], X_test[:, n_tfidf:].toarray())
 
         return {
             "accuracy": accuracy_score(y_test, y_pred),
@@ -1956,7 +2119,7 @@ def load_model_metrics():
             "X_test": X_test,
             "y_test": y_test,
             "y_pred": y_pred,
-            "model": model,
+            "model": _model,
         }
     except:
         return {
@@ -2678,7 +2841,10 @@ def create_sidebar():
 def main():
     # Initialize database
     if "db" not in st.session_state:
-        st.session_state.db = TriageDatabase()
+        st.session_state.db = _shared_database()
+        # IOCs are indexed at save time; legacy databases are backfilled
+        # once with scripts/backfill_iocs.py, not on page load
+    _show_write_errors()
 
     # Sidebar
     mode, difficulty, threshold, max_classes, use_preprocessing, use_llm, enable_viz = (
@@ -2715,10 +2881,6 @@ def main():
 def show_homepage(metrics, enable_viz):
     """Stunning professional security intelligence dashboard with advanced features."""
 
-    history: list = []
-    bookmarks: list = []
-    standalone_notes: list = []
-    bookmark_notes: list = []
     total_notes = 0
     total_incidents = 0
     total_bookmarks = 0
@@ -2729,6 +2891,10 @@ def show_homepage(metrics, enable_viz):
     avg_confidence = 0.0
     severity_counts: Counter = Counter()
     top_classifications: list = []
+    recent_incidents: list = []
+    daily_buckets: dict = {}
+    weekly_buckets: dict = {}
+    llm_usage = 0
     now = datetime.now()
     text_palette = get_text_palette()
     is_dark_mode = text_palette["is_dark"]
@@ -2761,56 +2927,51 @@ def show_homepage(metrics, enable_viz):
 
     # Get comprehensive database statistics
     try:
-        history = st.session_state.db.get_analysis_history(limit=10000)
-        bookmarks = st.session_state.db.get_bookmarks()
-        standalone_notes = st.session_state.db.get_all_notes()
-        bookmark_notes = [bm for bm in bookmarks if bm.get("note")]
-        total_notes = len(standalone_notes) + len(bookmark_notes)
+        # Count both standalone notes and bookmark notes
+        total_notes = st.session_state.db.count_notes()
+        total_notes += st.session_state.db.count_bookmarks(with_note=True)
+
+        # Totals and label distribution come from the rollup tables
+        summary = st.session_state.db.get_history_summary()
+        label_counts = Counter(dict(st.session_state.db.get_label_counts()))
+        recent_incidents = st.session_state.db.get_recent_incidents(limit=5)
 
-        total_incidents = len(history)
-        total_bookmarks = len(bookmarks)
+        total_incidents = summary["total_incidents"]
+        total_bookmarks = st.session_state.db.count_bookmarks()
 
-        # Calculate time-based trends
+        # Calculate time-based trends (aggregated in SQL)
         now = datetime.now()
-        history_24h = [
-            h
-            for h in history
-            if "timestamp" in h
-            and datetime.fromisoformat(h["timestamp"]) > now - timedelta(hours=24)
-        ]
-        history_7d = [
-            h
-            for h in history
-            if "timestamp" in h
-            and datetime.fromisoformat(h["timestamp"]) > now - timedelta(days=7)
-        ]
-        history_30d = [
-            h
-            for h in history
-            if "timestamp" in h
-            and datetime.fromisoformat(h["timestamp"]) > now - timedelta(days=30)
-        ]
+        windows = st.session_state.db.get_window_stats(
+            {
+                "24h": timedelta(hours=24),
+                "7d": timedelta(days=7),
+                "30d": timedelta(days=30),
+            },
+            now=now,
+        )
 
-        incidents_24h = len(history_24h)
-        incidents_7d = len(history_7d)
-        incidents_30d = len(history_30d)
+        incidents_24h = windows["24h"]["count"]
+        incidents_7d = windows["7d"]["count"]
+        incidents_30d = windows["30d"]["count"]
 
-        # Calculate classification distribution
-        if history:
-            labels = [h.get("final_label", "unknown") for h in history]
-            label_counts = Counter(labels)
-            most_common_label = (
-                label_counts.most_common(1)[0] if label_counts else ("None", 0)
+        daily_buckets = {
+            b["bucket"]: b
+            for b in st.session_state.db.get_time_buckets(
+                "day", start=now - timedelta(days=7), end=now, rolling=True
             )
-            avg_confidence = (
-                np.mean([h.get("max_prob", 0) for h in history]) if history else 0
+        }
+        weekly_buckets = {
+            b["bucket"]: b
+            for b in st.session_state.db.get_time_buckets(
+                "week", start=now - timedelta(weeks=4), end=now, rolling=True
             )
+        }
 
-            # Get severity distribution
-            severities = [
-                h.get("severity", "unknown") for h in history if h.get("severity")
-            ]
-            severity_counts = Counter(severities)
+        # Calculate classification distribution
+        if label_counts:
+            most_common_label = label_counts.most_common(1)[0]
+            avg_confidence = summary["avg_confidence"]
+            llm_usage = summary["llm_count"]
 
             # Top classifications
             top_classifications = label_counts.most_common(3)
@@ -2949,11 +3110,7 @@ def show_homepage(metrics, enable_viz):
 
         # Recent Activity - Show recent incidents with text preview
         st.markdown("#### Recent Activity")
-        if history:
-            recent_incidents = sorted(
-                history, key=lambda x: x.get("timestamp", ""), reverse=True
-            )[:5]
-
+        if recent_incidents:
             for idx, incident in enumerate(recent_incidents):
                 timestamp = incident.get("timestamp", "Unknown")
                 if timestamp != "Unknown":
@@ -3011,59 +3168,26 @@ def show_homepage(metrics, enable_viz):
     with col_right:
         st.markdown("#### Activity Trends")
 
-        # Calculate LLM usage (incidents analyzed with LLM enhancement)
-        llm_usage = len([h for h in history if h.get("use_llm", 0) == 1])
-
         # Calculate average processing time estimate (mock for now, could be real if timestamps are tracked)
         avg_processing_time = (
             "2.3s"  # This could be calculated from actual processing times if stored
         )
 
+        # Sparkline data from rolling buckets (bucket 0 = most recent span)
         # Generate sparkline data for last 7 days
-        sparkline_7d = []
-        for i in range(7):
-            day_start = now - timedelta(days=i + 1)
-            day_end = now - timedelta(days=i)
-            day_count = len(
-                [
-                    h
-                    for h in history
-                    if "timestamp" in h
-                    and day_start <= datetime.fromisoformat(h["timestamp"]) < day_end
-                ]
-            )
-            sparkline_7d.insert(0, day_count)
+        sparkline_7d = [
+            daily_buckets.get(i, {}).get("count", 0) for i in range(6, -1, -1)
+        ]
 
         # Generate sparkline data for last 30 days (weekly aggregates)
-        sparkline_30d = []
-        for i in range(4):
-            week_start = now - timedelta(days=(i + 1) * 7)
-            week_end = now - timedelta(days=i * 7)
-            week_count = len(
-                [
-                    h
-                    for h in history
-                    if "timestamp" in h
-                    and week_start <= datetime.fromisoformat(h["timestamp"]) < week_end
-                ]
-            )
-            sparkline_30d.insert(0, week_count)
+        sparkline_30d = [
+            weekly_buckets.get(i, {}).get("count", 0) for i in range(3, -1, -1)
+        ]
 
         # Generate sparkline data for LLM usage (last 7 days)
-        sparkline_llm = []
-        for i in range(7):
-            day_start = now - timedelta(days=i + 1)
-            day_end = now - timedelta(days=i)
-            day_count = len(
-                [
-                    h
-                    for h in history
-                    if "timestamp" in h
-                    and h.get("use_llm", 0) == 1
-                    and day_start <= datetime.fromisoformat(h["timestamp"]) < day_end
-                ]
-            )
-            sparkline_llm.insert(0, day_count)
+        sparkline_llm = [
+            daily_buckets.get(i, {}).get("llm_count", 0) for i in range(6, -1, -1)
+        ]
 
         # Create SVG sparklines
         def create_sparkline(data, color, width=80, height=20):
@@ -3288,8 +3412,11 @@ def single_incident_lab(
             if st.button("Save to History", use_container_width=True):
                 if incident_text and "analysis_results" in st.session_state:
                     try:
-                        st.session_state.db.save_analysis(
-                            **st.session_state.analysis_results
+                        _track_write(
+                            st.session_state.db.save_analysis(
+                                **st.session_state.analysis_results
+                            ),
+                            "Save to history",
                         )
                         st.success("Saved to history!")
                         st.session_state.cached_bookmarks = None
@@ -3335,9 +3462,8 @@ def single_incident_lab(
         with st.spinner("Analyzing incident..."):
             try:
                 import numpy as np
-                from scipy.sparse import hstack
 
-                vectorizer, model = load_vectorizer_and_model()
+                vectorizer, model = load_serving_models()
                 embedder = get_embedder()
 
                 processed = (
@@ -3345,13 +3471,13 @@ def single_incident_lab(
                     if use_preprocessing
                     else incident_text
                 )
-                # Combine TF-IDF + embeddings for enhanced model
+                # Enhanced model over TF-IDF + embeddings, scored per block
                 X_tfidf = vectorizer.transform([processed])
                 X_embed = embedder.encode([processed])
-                X = hstack([X_tfidf, X_embed])
+                scorer = split_scorer(model, X_tfidf.shape[1])
 
-                prediction = model.predict(X)[0]
-                probabilities = model.predict_proba(X)[0]
+                probabilities = scorer.predict_proba(X_tfidf, X_embed)[0]
+                prediction = model.classes_[int(np.argmax(probabilities))]
                 prob_dict = dict(zip(model.classes_, probabilities))
                 confidence = prob_dict[prediction]
 
@@ -3403,7 +3529,7 @@ def single_incident_lab(
 
                 # Automatically save to database
                 try:
-                    st.session_state.db.save_analysis(
+                    saved = st.session_state.db.save_analysis(
                         incident_text=incident_text,
                         final_label=prediction,
                         max_prob=confidence,
@@ -3412,7 +3538,14 @@ def single_incident_lab(
                             "probabilities": prob_dict,
                             "llm_opinion": llm_opinion,
                         },
+                        # Only reusable for search when it embeds the
+                        # stored text itself
+                        embedding=(
+                            X_embed[0] if processed == incident_text else None
+                        ),
+                        embedding_model=embedder.model_id,
                     )
+                    _track_write(saved, "Save to history")
                     st.session_state.cached_bookmarks = (
                         None  # Clear cache to refresh dashboard
                     )
@@ -3522,7 +3655,7 @@ Preprocessed: {'Yes' if use_preprocessing else 'No'}
                                 analysis_id = st.session_state.db.save_analysis(
                                     **st.session_state.analysis_results
                                 )
-                                st.session_state.db.add_bookmark(
+                                bookmark_id = st.session_state.db.add_bookmark(
                                     incident_text=incident_text,
                                     final_label=prediction,
                                     note=(
@@ -3532,6 +3665,8 @@ Preprocessed: {'Yes' if use_preprocessing else 'No'}
                                     ),
                                     analysis_id=analysis_id,
                                 )
+                                # Fails too if the analysis save it links to did
+                                _track_write(bookmark_id, "Bookmark")
                                 st.success("✓ Bookmarked successfully!")
                                 st.session_state.cached_bookmarks = None
                             except Exception as e:
@@ -3839,9 +3974,12 @@ Preprocessed: {'Yes' if use_preprocessing else 'No'}
                                 analysis_id = st.session_state.analysis_results.get(
                                     "id"
                                 )
-                                st.session_state.db.add_note(
-                                    note_text=note_text,
-                                    analysis_id=analysis_id,
+                                _track_write(
+                                    st.session_state.db.add_note(
+                                        note_text=note_text,
+                                        analysis_id=analysis_id,
+                                    ),
+                                    "Note",
                                 )
                                 if analysis_id:
                                     st.success("✓ Note saved and linked to analysis")
@@ -3904,44 +4042,25 @@ Preprocessed: {'Yes' if use_preprocessing else 'No'}
 def intelligence_dashboard(metrics, enable_viz):
     """The most stunning intelligence dashboard with professional visualizations"""
 
-    history: list = []
-    bookmarks: list = []
+    total_incidents = 0
+    confidence_histogram: list = []
 
     text_palette = get_text_palette()
     secondary_text = text_palette["secondary"]
 
     # Get real-time database insights
     try:
-        history = st.session_state.db.get_analysis_history(limit=10000)
-        bookmarks = st.session_state.db.get_bookmarks()
-
-        # Classification trends
-        if history:
-            labels = [h.get("final_label", "unknown") for h in history]
-            label_counts = Counter(labels)
-
-            # Time-based analysis
-            recent_7d = [
-                h
-                for h in history
-                if "timestamp" in h
-                and datetime.fromisoformat(h["timestamp"])
-                > datetime.now() - timedelta(days=7)
-            ]
-            recent_30d = [
-                h
-                for h in history
-                if "timestamp" in h
-                and datetime.fromisoformat(h["timestamp"])
-                > datetime.now() - timedelta(days=30)
-            ]
-
-            trend_7d = len(recent_7d)
-            trend_30d = len(recent_30d)
-        else:
-            label_counts = Counter()
-            trend_7d = 0
-            trend_30d = 0
+        # Classification trends (served from the rollup tables)
+        label_counts = Counter(dict(st.session_state.db.get_label_counts()))
+        total_incidents = sum(label_counts.values())
+        confidence_histogram = st.session_state.db.get_confidence_histogram()
+
+        # Time-based analysis (aggregated in SQL over the timestamp index)
+        windows = st.session_state.db.get_window_stats(
+            {"7d": timedelta(days=7), "30d": timedelta(days=30)}
+        )
+        trend_7d = windows["7d"]["count"]
+        trend_30d = windows["30d"]["count"]
     except:
         label_counts = Counter()
         trend_7d = 0
@@ -3951,19 +4070,23 @@ def intelligence_dashboard(metrics, enable_viz):
     try:
         # Calculate critical incidents
         critical_labels = ["malware", "data_exfiltration", "web_attack", "phishing"]
-        critical_incidents = [
-            h for h in history if h.get("final_label") in critical_labels
-        ]
-        critical_count = len(critical_incidents)
-        critical_pct = (critical_count / len(history) * 100) if history else 0
+        critical_count = sum(label_counts[label] for label in critical_labels)
+        critical_pct = (
+            (critical_count / total_incidents * 100) if total_incidents else 0
+        )
 
         # Calculate high confidence predictions
-        high_confidence = [h for h in history if h.get("max_prob", 0) >= 0.8]
-        high_conf_pct = (len(high_confidence) / len(history) * 100) if history else 0
+        high_confidence = sum(
+            b["count"] for b in confidence_histogram if b["lower"] >= 0.8
+        )
+        high_conf_pct = (
+            (high_confidence / total_incidents * 100) if total_incidents else 0
+        )
 
         # Calculate incidents needing review (low confidence)
-        needs_review = [h for h in history if h.get("max_prob", 0) < 0.6]
-        review_count = len(needs_review)
+        review_count = sum(
+            b["count"] for b in confidence_histogram if b["upper"] <= 0.6
+        )
 
         # Calculate most active threat type
         most_active_threat = (
@@ -4125,23 +4248,13 @@ def intelligence_dashboard(metrics, enable_viz):
 
     with viz_col1:
         # Threat Distribution Over Time
-        if history:
+        if total_incidents:
             # Get last 30 days of data grouped by label
             threat_timeline = {}
-            for h in history:
-                label = h.get("final_label", "unknown")
-                timestamp = h.get("timestamp", "")
-                if timestamp:
-                    try:
-                        dt = datetime.fromisoformat(timestamp)
-                        date_key = dt.strftime("%Y-%m-%d")
-                        if date_key not in threat_timeline:
-                            threat_timeline[date_key] = {}
-                        threat_timeline[date_key][label] = (
-                            threat_timeline[date_key].get(label, 0) + 1
-                        )
-                    except:
-                        pass
+            for row in st.session_state.db.get_daily_label_counts(days=30):
+                threat_timeline.setdefault(row["day"], {})[row["final_label"]] = row[
+                    "count"
+                ]
 
             # Sort dates and get labels
             sorted_dates = sorted(threat_timeline.keys())[-30:]  # Last 30 days
@@ -4221,7 +4334,7 @@ def intelligence_dashboard(metrics, enable_viz):
 
     with viz_col2:
         # Confidence Distribution Heatmap
-        if history:
+        if total_incidents:
             # Create confidence ranges
             confidence_ranges = {
                 "Critical (90-100%)": 0,
@@ -4231,24 +4344,25 @@ def intelligence_dashboard(metrics, enable_viz):
                 "Very Low (<60%)": 0,
             }
 
+            # Fold the rollup histogram buckets into the display ranges
             label_confidence = {}
-            for h in history:
-                label = h.get("final_label", "unknown")
-                confidence = h.get("max_prob", 0)
+            for bucket in confidence_histogram:
+                label = bucket["final_label"]
+                lower = bucket["lower"]
 
                 if label not in label_confidence:
                     label_confidence[label] = {k: 0 for k in confidence_ranges.keys()}
 
-                if confidence >= 0.9:
-                    label_confidence[label]["Critical (90-100%)"] += 1
-                elif confidence >= 0.8:
-                    label_confidence[label]["High (80-90%)"] += 1
-                elif confidence >= 0.7:
-                    label_confidence[label]["Medium (70-80%)"] += 1
-                elif confidence >= 0.6:
-                    label_confidence[label]["Low (60-70%)"] += 1
+                if lower >= 0.9:
+                    label_confidence[label]["Critical (90-100%)"] += bucket["count"]
+                elif lower >= 0.8:
+                    label_confidence[label]["High (80-90%)"] += bucket["count"]
+                elif lower >= 0.7:
+                    label_confidence[label]["Medium (70-80%)"] += bucket["count"]
+                elif lower >= 0.6:
+                    label_confidence[label]["Low (60-70%)"] += bucket["count"]
                 else:
-                    label_confidence[label]["Very Low (<60%)"] += 1
+                    label_confidence[label]["Very Low (<60%)"] += bucket["count"]
 
             # Create heatmap data
             labels_list = sorted(label_confidence.keys())
@@ -4319,70 +4433,19 @@ def intelligence_dashboard(metrics, enable_viz):
     viz_col3, viz_col4 = st.columns([1, 1])
 
     with viz_col3:
-        # Threat Intelligence IOC Analysis
-        if history:
-            # Extract IOC patterns from incident data
+        # Threat Intelligence IOC Analysis (from the incident_iocs index)
+        if total_incidents:
+            ioc_kind_counts = st.session_state.db.get_ioc_kind_counts()
             ioc_data = {
-                "IP Addresses": 0,
-                "Domain Names": 0,
-                "File Hashes": 0,
-                "Email Addresses": 0,
-                "URLs": 0,
-                "Registry Keys": 0,
+                label: ioc_kind_counts.get(kind, 0)
+                for kind, label in IOC_KIND_LABELS.items()
             }
 
-            threat_ioc_map = {}
-
-            import re
-
-            for h in history:
-                text = h.get("incident_text", "")
-                label = h.get("final_label", "unknown")
-
-                if label not in threat_ioc_map:
-                    threat_ioc_map[label] = {k: 0 for k in ioc_data.keys()}
-
-                # Count IOC patterns (case insensitive)
-                ip_count = len(re.findall(r"\b(?:[0-9]{1,3}\.){3}[0-9]{1,3}\b", text))
-                domain_count = len(re.findall(r"\b[a-zA-Z0-9-]+\.[a-zA-Z]{2,}\b", text))
-                hash_count = len(re.findall(r"\b[a-fA-F0-9]{32,64}\b", text))
-                email_count = len(
-                    re.findall(
-                        r"\b[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\b", text
-                    )
-                )
-                url_count = len(re.findall(r"https?://", text.lower()))
-                registry_count = len(
-                    re.findall(r"HK(LM|CU|CR|U|CC)", text, re.IGNORECASE)
-                )
-
-                if ip_count > 0:
-                    ioc_data["IP Addresses"] += ip_count
-                    threat_ioc_map[label]["IP Addresses"] += ip_count
-                if domain_count > 0:
-                    ioc_data["Domain Names"] += domain_count
-                    threat_ioc_map[label]["Domain Names"] += domain_count
-                if hash_count > 0:
-                    ioc_data["File Hashes"] += hash_count
-                    threat_ioc_map[label]["File Hashes"] += hash_count
-                if email_count > 0:
-                    ioc_data["Email Addresses"] += email_count
-                    threat_ioc_map[label]["Email Addresses"] += email_count
-                if url_count > 0:
-                    ioc_data["URLs"] += url_count
-                    threat_ioc_map[label]["URLs"] += url_count
-                if registry_count > 0:
-                    ioc_data["Registry Keys"] += registry_count
-                    threat_ioc_map[label]["Registry Keys"] += registry_count
-
             total_iocs = sum(ioc_data.values())
 
             # If no IOCs detected, show simple bar chart of threat types
             if total_iocs == 0:
-                threat_counts = {}
-                for h in history:
-                    label = h.get("final_label", "unknown")
-                    threat_counts[label] = threat_counts.get(label, 0) + 1
+                threat_counts = dict(label_counts)
 
                 sorted_threats = sorted(
                     threat_counts.items(), key=lambda x: x[1], reverse=True
@@ -4607,7 +4670,7 @@ def intelligence_dashboard(metrics, enable_viz):
     with col1:
         # Get actual analyzed incidents count from database
         try:
-            total_analyzed = len(st.session_state.db.get_analysis_history(limit=10000))
+            total_analyzed = st.session_state.db.count_incidents()
         except:
             total_analyzed = 0
 
@@ -4840,14 +4903,12 @@ def advanced_search_interface():
     try:
         facets = st.session_state.db.get_search_facets()
         # Count both standalone notes and bookmark notes
-        standalone_notes = st.session_state.db.get_all_notes()
-        bookmarks = st.session_state.db.get_bookmarks()
-        bookmark_notes = [bm for bm in bookmarks if bm.get("note")]
-        total_notes = len(standalone_notes) + len(bookmark_notes)
+        total_notes = st.session_state.db.count_notes()
+        total_notes += st.session_state.db.count_bookmarks(with_note=True)
 
         db_stats = {
             "total_incidents": facets["total_incidents"],
-            "bookmarks": len(bookmarks),
+            "bookmarks": st.session_state.db.count_bookmarks(),
             "notes": total_notes,
         }
     except:
@@ -4930,6 +4991,11 @@ def advanced_search_interface():
                 min_confidence = None
                 max_confidence = None
 
+            include_archives = st.checkbox(
+                "Include archived history",
+                help="Also search monthly archives of older analyses",
+            )
+
         if st.button("Search", type="primary", use_container_width=True):
             with st.spinner("Searching..."):
                 try:
@@ -4940,6 +5006,7 @@ def advanced_search_interface():
                         min_confidence=min_confidence,
                         max_confidence=max_confidence,
                         limit=50,
+                        include_archives=include_archives,
                     )
 
                     st.success(f"Found {len(results)} result(s)")
@@ -5053,26 +5120,45 @@ def advanced_search_interface():
             placeholder="e.g., User received email with suspicious attachment...",
         )
 
+        use_hybrid = st.checkbox(
+            "Blend keyword matches (hybrid ranking)",
+            value=True,
+            help="Fuse BM25 keyword ranking with semantic similarity",
+        )
+
         col1, col2 = st.columns(2)
         with col1:
             top_k = st.slider("Number of results", 5, 50, 10, 5)
         with col2:
-            threshold = st.slider("Similarity threshold", 0.3, 1.0, 0.5, 0.05)
+            threshold = st.slider(
+                "Similarity threshold", 0.3, 1.0, 0.5, 0.05, disabled=use_hybrid
+            )
 
         if st.button("Search Semantically", type="primary", use_container_width=True):
             if semantic_query.strip():
                 with st.spinner("AI analyzing..."):
                     try:
-                        results = find_similar_incidents(
-                            semantic_query, top_k=top_k, similarity_threshold=threshold
-                        )
+                        if use_hybrid:
+                            results = hybrid_search_incidents(
+                                semantic_query, top_k=top_k
+                            )
+                        else:
+                            results = find_similar_incidents(
+                                semantic_query,
+                                top_k=top_k,
+                                similarity_threshold=threshold,
+                            )
 
                         st.success(f"Found {len(results)} similar incident(s)")
 
                         if results:
                             for idx, result in enumerate(results):
+                                if result.get("similarity_score") is None:
+                                    match = "keyword match"
+                                else:
+                                    match = f"{result['similarity_score']:.1%} similar"
                                 with st.expander(
-                                    f"Result {idx+1}: {result['final_label']} ({result['similarity_score']:.1%} similar)"
+                                    f"Result {idx+1}: {result['final_label']} ({match})"
                                 ):
                                     st.write(result.get("incident_text", "N/A")[:500])
                                     st.write(
@@ -5310,16 +5396,18 @@ ORDER BY max_prob DESC LIMIT 50;
 
             with st.spinner("Executing query..."):
                 try:
-                    results, columns = st.session_state.db.execute_custom_query(
-                        sql_query, read_only=True
-                    )
+                    # Read-only connection, row cap and time budget keep a
+                    # heavy console query from stalling triage writes
+                    df = st.session_state.db.query_dataframe(sql_query)
 
-                    st.success(
-                        f"Query executed successfully - {len(results)} rows returned"
-                    )
+                    st.success(f"Query executed successfully - {len(df)} rows returned")
+                    if df.attrs.get("truncated"):
+                        st.warning(
+                            f"Result truncated to the first {len(df):,} rows. "
+                            "Add a LIMIT or tighter WHERE clause to see the rest."
+                        )
 
-                    if results:
-                        df = pd.DataFrame(results)
+                    if not df.empty:
                         st.dataframe(df, use_container_width=True, height=400)
 
                         # Export options
@@ -5343,9 +5431,7 @@ ORDER BY max_prob DESC LIMIT 50;
                                         "text/csv",
                                     )
                                 elif export_format == "JSON":
-                                    import json
-
-                                    json_str = json.dumps(results, indent=2)
+                                    json_str = records_json(df)
                                     st.download_button(
                                         "Download JSON",
                                         json_str,
@@ -5382,7 +5468,7 @@ ORDER BY max_prob DESC LIMIT 50;
                                     md = f"# SQL Query Results\n\n"
                                     md += f"**Query:** `{sql_query}`\n\n"
                                     md += f"**Timestamp:** {timestamp}\n\n"
-                                    md += f"**Rows:** {len(results)}\n\n"
+                                    md += f"**Rows:** {len(df)}\n\n"
                                     md += "## Results\n\n"
                                     md += df.to_markdown(index=False)
 
@@ -5409,7 +5495,6 @@ ORDER BY max_prob DESC LIMIT 50;
 def batch_processing_tab(use_preprocessing, use_llm):
     """Enhanced batch processing with advanced analytics and visualizations"""
     import numpy as np
-    from scipy.sparse import hstack
 
     text_palette = get_text_palette()
     secondary_text = text_palette["secondary"]
@@ -5629,9 +5714,10 @@ def batch_processing_tab(use_preprocessing, use_llm):
                     st.error("No incidents found in file")
                     return
 
-                vectorizer, model = load_vectorizer_and_model()
+                vectorizer, model = load_serving_models()
 
                 results = []
+                embeddings = []
                 progress_bar = st.progress(0)
                 status = st.empty()
 
@@ -5649,13 +5735,13 @@ def batch_processing_tab(use_preprocessing, use_llm):
 
                     processed = clean_description(text) if use_preprocessing else text
 
-                    # Combine TF-IDF + embeddings for enhanced model
+                    # Enhanced model over TF-IDF + embeddings, scored per block
                     X_tfidf = vectorizer.transform([processed])
                     X_embed = embedder.encode([processed])
-                    X = hstack([X_tfidf, X_embed])
+                    scorer = split_scorer(model, X_tfidf.shape[1])
 
-                    pred = model.predict(X)[0]
-                    proba = model.predict_proba(X)[0]
+                    proba = scorer.predict_proba(X_tfidf, X_embed)[0]
+                    pred = model.classes_[int(np.argmax(proba))]
 
                     # Get MITRE techniques based on classification
                     mitre_techniques = get_mitre_techniques(pred)
@@ -5750,10 +5836,12 @@ def batch_processing_tab(use_preprocessing, use_llm):
                                 )
 
                     results.append(result)
+                    embeddings.append(X_embed[0] if processed == text else None)
                     progress_bar.progress((idx + 1) / len(incidents))
 
                 status.empty()
                 st.session_state.batch_results = results
+                st.session_state.batch_results_id = None
 
                 # Show completion animation
                 st.balloons()
@@ -5769,16 +5857,24 @@ def batch_processing_tab(use_preprocessing, use_llm):
                         )
 
                         db = st.session_state.get("db", TriageDatabase())
-                        batch_record_id = db.save_batch_analysis(
-                            batch_id=batch_id,
-                            batch_name=batch_name,
-                            file_name=uploaded_file.name,
-                            results=results,
-                            use_preprocessing=use_preprocessing,
-                            use_llm=use_llm,
+                        # The batch record ID is kept in the session, so
+                        # this one write is waited for
+                        batch_record_id = db.resolve(
+                            db.save_batch_analysis(
+                                batch_id=batch_id,
+                                batch_name=batch_name,
+                                file_name=uploaded_file.name,
+                                results=results,
+                                use_preprocessing=use_preprocessing,
+                                use_llm=use_llm,
+                                embeddings=embeddings,
+                                embedding_model=embedder.model_id,
+                            ),
+                            timeout=DB_WRITE_TIMEOUT,
                         )
 
                         st.session_state.last_batch_id = batch_id
+                        st.session_state.batch_results_id = batch_id
                         st.session_state.last_batch_record_id = batch_record_id
 
                         st.success(f"Batch saved to database (ID: {batch_id[:8]}...)")
@@ -5857,6 +5953,15 @@ def batch_processing_tab(use_preprocessing, use_llm):
             filtered_results if filtered_results else st.session_state.batch_results
         )
 
+        # A saved, unfiltered batch is aggregated by the DuckDB analytics
+        # engine, off the SQLite write path
+        batch_id = st.session_state.get("batch_results_id")
+        engine = (
+            get_analytics_engine()
+            if batch_id and len(results) == len(st.session_state.batch_results)
+            else None
+        )
+
         # Summary metrics
         col1, col2, col3, col4 = st.columns(4)
 
@@ -5975,7 +6080,10 @@ def batch_processing_tab(use_preprocessing, use_llm):
             st.markdown("#### Advanced Metrics & Scoring")
 
             # Calculate severity index
-            severity_index = calculate_severity_index(results)
+            if engine is not None:
+                severity_index = engine.severity_index(batch_id=batch_id)
+            else:
+                severity_index = calculate_severity_index(results)
 
             metric_col1, metric_col2, metric_col3, metric_col4 = st.columns(4)
 
@@ -6008,7 +6116,7 @@ def batch_processing_tab(use_preprocessing, use_llm):
                 )
 
             # Risk score distribution
-            if severity_index["scores"]:
+            if len(severity_index["scores"]):
                 fig_risk = go.Figure()
                 fig_risk.add_trace(
                     go.Histogram(
@@ -6451,10 +6559,13 @@ def batch_processing_tab(use_preprocessing, use_llm):
                             if batch_bookmark_note:
                                 note_text = f"{batch_bookmark_note}\n\n{note_text}"
 
-                            st.session_state.db.add_bookmark(
-                                incident_text=r["incident_text"],
-                                final_label=r["display_label"],
-                                note=note_text,
+                            _track_write(
+                                st.session_state.db.add_bookmark(
+                                    incident_text=r["incident_text"],
+                                    final_label=r["display_label"],
+                                    note=note_text,
+                                ),
+                                f"Bookmark {idx+1}",
                             )
                             saved_count += 1
                         except Exception as e:
@@ -7147,7 +7258,14 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
             with adv_col1:
                 # Threat Intelligence Brief
-                threat_brief = generate_threat_intelligence_brief(results)
+                threat_brief = generate_threat_intelligence_brief(
+                    results,
+                    stats=(
+                        engine.threat_brief_stats(batch_id=batch_id)
+                        if engine is not None
+                        else None
+                    ),
+                )
                 st.download_button(
                     "Download Threat Intelligence Brief",
                     threat_brief,
@@ -7629,6 +7747,13 @@ def bookmarks_and_history_tab():
             if bookmarks:
                 st.info(f"{len(bookmarks)} bookmark(s) saved")
 
+                # One query per relation for the whole page, not per bookmark
+                linked_ids = [
+                    bm["analysis_id"] for bm in bookmarks if bm.get("analysis_id")
+                ]
+                linked_tags = st.session_state.db.get_tags_for_analyses(linked_ids)
+                linked_notes = st.session_state.db.get_notes_for_analyses(linked_ids)
+
                 for bm in bookmarks:
                     # Use created_at if timestamp not available
                     timestamp_display = bm.get("created_at", bm.get("timestamp", "N/A"))
@@ -7638,6 +7763,18 @@ def bookmarks_and_history_tab():
                         st.write("**Incident Text:**")
                         st.write(bm.get("incident_text", "N/A")[:500])
 
+                        bm_tags = linked_tags.get(bm.get("analysis_id"), [])
+                        if bm_tags:
+                            st.write(
+                                "**Tags:** " + ", ".join(t["name"] for t in bm_tags)
+                            )
+                        bm_notes = linked_notes.get(bm.get("analysis_id"), [])
+                        for analysis_note in bm_notes:
+                            st.caption(
+                                f"{analysis_note.get('created_at', '')}: "
+                                f"{analysis_note['note_text']}"
+                            )
+
                         # Editable note section
                         st.markdown("---")
                         st.write("**Bookmark Note:**")
@@ -7660,8 +7797,11 @@ def bookmarks_and_history_tab():
                                 type="primary",
                             ):
                                 try:
-                                    st.session_state.db.update_bookmark_note(
-                                        bm.get("id"), edited_note
+                                    _track_write(
+                                        st.session_state.db.update_bookmark_note(
+                                            bm.get("id"), edited_note
+                                        ),
+                                        "Bookmark note",
                                     )
                                     st.success("✓ Note saved!")
                                     st.session_state.cached_bookmarks = None
@@ -7673,7 +7813,15 @@ def bookmarks_and_history_tab():
                         col1, col2 = st.columns(2)
                         with col1:
                             if st.button(f"Delete", key=f"del_bm_{bm.get('id')}"):
-                                st.session_state.db.delete_bookmark(bm.get("id"))
+                                db = st.session_state.db
+                                try:
+                                    _track_write(
+                                        db.delete_bookmark(bm.get("id")),
+                                        "Delete bookmark",
+                                    )
+                                except Exception as e:
+                                    st.error(f"Failed to delete: {e}")
+                                    st.stop()
                                 st.success("Deleted!")
                                 st.session_state.cached_bookmarks = None
                                 st.rerun()
@@ -7702,17 +7850,47 @@ def bookmarks_and_history_tab():
                 # Convert to dataframe
                 df = pd.DataFrame(history)
 
+                history_ids = [int(i) for i in df["id"]]
+                tags_by_id = st.session_state.db.get_tags_for_analyses(history_ids)
+                notes_by_id = st.session_state.db.get_notes_for_analyses(history_ids)
+                df["tags"] = [
+                    ", ".join(t["name"] for t in tags_by_id[i]) for i in history_ids
+                ]
+                df["notes"] = [len(notes_by_id[i]) for i in history_ids]
+
                 # Display
                 st.dataframe(
-                    df[["timestamp", "final_label", "max_prob", "incident_text"]],
+                    df[
+                        [
+                            "timestamp",
+                            "final_label",
+                            "max_prob",
+                            "tags",
+                            "notes",
+                            "incident_text",
+                        ]
+                    ],
                     use_container_width=True,
                 )
 
                 # Export
                 csv = df.to_csv(index=False)
-                st.download_button(
-                    "Download History", csv, "analysis_history.csv", "text/csv"
-                )
+                export_col1, export_col2 = st.columns(2)
+                with export_col1:
+                    st.download_button(
+                        "Download History", csv, "analysis_history.csv", "text/csv"
+                    )
+                with export_col2:
+                    # Columnar copy for notebooks/BI; full-history dumps should
+                    # use TriageDatabase.export_columnar instead
+                    parquet_buffer = io.BytesIO()
+                    df.to_parquet(parquet_buffer, index=False)
+                    st.download_button(
+                        "Download Parquet",
+                        parquet_buffer.getvalue(),
+                        "analysis_history.parquet",
+                        "application/vnd.apache.parquet",
+                    )
             else:
                 st.info("No analysis history yet.")
         except Exception as e:
@@ -7761,9 +7939,12 @@ def bookmarks_and_history_tab():
 
                 if submit_note and note_text:
                     try:
-                        st.session_state.db.add_note(
-                            note_text=note_text,
-                            analysis_id=selected_analysis_id,
+                        _track_write(
+                            st.session_state.db.add_note(
+                                note_text=note_text,
+                                analysis_id=selected_analysis_id,
+                            ),
+                            "Note",
                         )
                         if selected_analysis_id:
                             st.success("✓ Note added and linked to analysis")
@@ -7928,18 +8109,17 @@ def experimental_lab():
                     probs1: list = []
 
                     def _predict_with_model(vec, mdl, text):
-                        X = vec.transform([text])
-                        probs = (
-                            mdl.predict_proba(X)[0]
-                            if hasattr(mdl, "predict_proba")
-                            else []
-                        )
-                        pred = mdl.predict(X)[0]
-                        return pred, probs
+                        # Enhanced model over TF-IDF + embeddings, scored per block
+                        X_tfidf = vec.transform([text])
+                        X_embed = get_embedder().encode([text])
+                        probs = split_scorer(mdl, X_tfidf.shape[1]).predict_proba(
+                            X_tfidf, X_embed
+                        )[0]
+                        return mdl.classes_[int(np.argmax(probs))], probs
 
                     # Configuration 1: Default with preprocessing
                     try:
-                        vectorizer, model = load_vectorizer_and_model()
+                        vectorizer, model = load_serving_models()
                         cleaned = clean_description(test_incident)
                         pred1, probs1 = _predict_with_model(vectorizer, model, cleaned)
                         comparison_results.append(
@@ -7956,7 +8136,7 @@ def experimental_lab():
 
                     # Configuration 2: No preprocessing
                     try:
-                        vectorizer, model = load_vectorizer_and_model()
+                        vectorizer, model = load_serving_models()
                         pred2, probs2 = _predict_with_model(
                             vectorizer, model, test_incident
                         )
@@ -7974,7 +8154,7 @@ def experimental_lab():
 
                     # Configuration 3: With LLM enhancement
                     try:
-                        vectorizer, model = load_vectorizer_and_model()
+                        vectorizer, model = load_serving_models()
                         cleaned = clean_description(test_incident)
                         pred3, probs3 = _predict_with_model(vectorizer, model, cleaned)
 
@@ -9762,11 +9942,9 @@ def settings_and_profiles_interface():
             st.markdown("#### Database Statistics")
 
             try:
-                history_count = len(
-                    st.session_state.db.get_analysis_history(limit=100000)
-                )
-                bookmark_count = len(st.session_state.db.get_bookmarks(limit=100000))
-                note_count = len(st.session_state.db.get_all_notes())
+                history_count = st.session_state.db.count_incidents()
+                bookmark_count = st.session_state.db.count_bookmarks()
+                note_count = st.session_state.db.count_notes()
 
                 st.metric("Total Analyses", f"{history_count:,}")
                 st.metric("Bookmarks", f"{bookmark_count:,}")
@@ -9789,6 +9967,24 @@ def settings_and_profiles_interface():
                 except Exception as e:
                     st.error(f"Optimization failed: {e}")
 
+            archive_days = st.number_input(
+                "Archive analyses older than (days)",
+                min_value=30,
+                value=180,
+                step=30,
+            )
+            if st.button("Archive Old History", use_container_width=True):
+                try:
+                    moved = st.session_state.db.archive_history(
+                        older_than_days=int(archive_days)
+                    )
+                    st.success(
+                        f"Archived {sum(moved.values()):,} analyses "
+                        f"into {len(moved)} monthly archive(s)"
+                    )
+                except Exception as e:
+                    st.error(f"Archiving failed: {e}")
+
             st.markdown("---")
 
             st.warning("**Danger Zone**")